@@ -0,0 +1,47 @@
+"""create remnants table"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "remnants",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("warehouse_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("width", sa.Numeric(14, 2), nullable=False),
+        sa.Column("height", sa.Numeric(14, 2), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False, server_default=sa.text("'AVAILABLE'")),
+        sa.Column("production_job_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("created_at_utc", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="RESTRICT"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="RESTRICT"),
+        sa.ForeignKeyConstraint(["warehouse_id"], ["warehouses.id"], ondelete="RESTRICT"),
+        sa.ForeignKeyConstraint(["production_job_id"], ["production_jobs.id"], ondelete="SET NULL"),
+        sa.CheckConstraint("width >= height AND height > 0", name="chk_remnant_dims"),
+        sa.CheckConstraint(
+            "status IN ('AVAILABLE','RESERVED','CONSUMED')",
+            name="chk_remnant_status",
+        ),
+    )
+    op.create_index(
+        "ix_remnants_fit",
+        "remnants",
+        ["organization_id", "product_id", "width", "height"],
+        postgresql_where=sa.text("status = 'AVAILABLE'"),
+    )
+    op.create_index("ix_remnants_job", "remnants", ["production_job_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_remnants_job", table_name="remnants")
+    op.drop_index("ix_remnants_fit", table_name="remnants")
+    op.drop_table("remnants")
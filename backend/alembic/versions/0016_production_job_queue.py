@@ -0,0 +1,101 @@
+"""add queue columns to production jobs"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "production_jobs",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE production_jobs j
+        SET organization_id = o.organization_id
+        FROM order_items i JOIN orders o ON o.id = i.order_id
+        WHERE i.id = j.order_item_id
+        """
+    )
+    op.alter_column("production_jobs", "organization_id", nullable=False)
+    op.create_foreign_key(
+        "fk_production_jobs_org",
+        "production_jobs",
+        "organizations",
+        ["organization_id"],
+        ["id"],
+        ondelete="RESTRICT",
+    )
+    op.add_column(
+        "production_jobs",
+        sa.Column("status", sa.Text(), nullable=False, server_default=sa.text("'PENDING'")),
+    )
+    op.add_column(
+        "production_jobs",
+        sa.Column("priority", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    op.add_column("production_jobs", sa.Column("due_date", sa.Date(), nullable=True))
+    op.add_column("production_jobs", sa.Column("claimed_by", sa.Text(), nullable=True))
+    op.add_column(
+        "production_jobs",
+        sa.Column("claimed_at_utc", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "production_jobs",
+        sa.Column("finished_at_utc", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "production_jobs",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    op.add_column("production_jobs", sa.Column("last_error", sa.Text(), nullable=True))
+    op.execute(
+        """
+        UPDATE production_jobs j
+        SET due_date = o.delivery_date
+        FROM order_items i JOIN orders o ON o.id = i.order_id
+        WHERE i.id = j.order_item_id
+        """
+    )
+    op.create_check_constraint(
+        "chk_production_job_status",
+        "production_jobs",
+        "status IN ('PENDING','CLAIMED','DONE','FAILED')",
+    )
+    op.create_index(
+        "ix_production_jobs_queue",
+        "production_jobs",
+        ["organization_id", sa.text("priority DESC"), "due_date", "created_at_utc"],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.create_index(
+        "ix_production_jobs_finished",
+        "production_jobs",
+        ["organization_id", "finished_at_utc"],
+        postgresql_where=sa.text("status = 'DONE'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_production_jobs_finished", table_name="production_jobs")
+    op.drop_index("ix_production_jobs_queue", table_name="production_jobs")
+    op.drop_constraint("chk_production_job_status", "production_jobs", type_="check")
+    for column in (
+        "last_error",
+        "attempts",
+        "finished_at_utc",
+        "claimed_at_utc",
+        "claimed_by",
+        "due_date",
+        "priority",
+        "status",
+    ):
+        op.drop_column("production_jobs", column)
+    op.drop_constraint("fk_production_jobs_org", "production_jobs", type_="foreignkey")
+    op.drop_column("production_jobs", "organization_id")
@@ -0,0 +1,26 @@
+"""create daily sales rollup"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0017"
+down_revision = "0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_sales_rollup",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("total", sa.Numeric(16, 2), nullable=False, server_default=sa.text("0")),
+        sa.PrimaryKeyConstraint("organization_id", "day"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_sales_rollup")
@@ -0,0 +1,46 @@
+"""scope ar entries to organizations and add aging index"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0018"
+down_revision = "0017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ar_entries",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE ar_entries e
+        SET organization_id = p.organization_id
+        FROM partners p
+        WHERE p.id = e.partner_id
+        """
+    )
+    op.alter_column("ar_entries", "organization_id", nullable=False)
+    op.create_foreign_key(
+        "fk_ar_entries_org",
+        "ar_entries",
+        "organizations",
+        ["organization_id"],
+        ["id"],
+        ondelete="RESTRICT",
+    )
+    op.create_index(
+        "ix_ar_entries_aging",
+        "ar_entries",
+        ["organization_id", "partner_id", "entry_date", "id"],
+        postgresql_include=["type", "amount"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ar_entries_aging", table_name="ar_entries")
+    op.drop_constraint("fk_ar_entries_org", "ar_entries", type_="foreignkey")
+    op.drop_column("ar_entries", "organization_id")
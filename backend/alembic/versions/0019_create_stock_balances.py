@@ -0,0 +1,49 @@
+"""create stock balances"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0019"
+down_revision = "0018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stock_balances",
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("warehouse_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("quantity", sa.Numeric(14, 3), nullable=False, server_default=sa.text("0")),
+        sa.Column("restock_level", sa.Numeric(14, 3), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at_utc", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("product_id", "warehouse_id"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["warehouse_id"], ["warehouses.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+    )
+    op.create_index(
+        "ix_stock_balances_low",
+        "stock_balances",
+        ["organization_id", "product_id", "warehouse_id"],
+        postgresql_include=["quantity", "restock_level"],
+        postgresql_where=sa.text("quantity < restock_level"),
+    )
+    op.execute(
+        """
+        INSERT INTO stock_balances (product_id, warehouse_id, organization_id, quantity, restock_level)
+        SELECT m.product_id, m.warehouse_id, p.organization_id,
+               SUM(CASE WHEN m.direction = 'IN' THEN m.quantity ELSE -m.quantity END),
+               p.restock_level
+        FROM stock_movements m
+        JOIN products p ON p.id = m.product_id
+        GROUP BY m.product_id, m.warehouse_id, p.organization_id, p.restock_level
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_balances_low", table_name="stock_balances")
+    op.drop_table("stock_balances")
@@ -0,0 +1,67 @@
+"""create partner revenue rollups for the customer leaderboard"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0020"
+down_revision = "0019"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "partner_daily_revenue",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("partner_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("total", sa.Numeric(16, 2), nullable=False, server_default=sa.text("0")),
+        sa.PrimaryKeyConstraint("organization_id", "partner_id", "day"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["partner_id"], ["partners.id"], ondelete="CASCADE"),
+    )
+    op.create_table(
+        "customer_revenue_windows",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("window_days", sa.Integer(), nullable=False),
+        sa.Column("partner_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("revenue", sa.Numeric(16, 2), nullable=False, server_default=sa.text("0")),
+        sa.PrimaryKeyConstraint("organization_id", "window_days", "partner_id"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["partner_id"], ["partners.id"], ondelete="CASCADE"),
+    )
+    op.create_index(
+        "ix_customer_revenue_windows_rank",
+        "customer_revenue_windows",
+        ["organization_id", "window_days", sa.text("revenue DESC")],
+    )
+    op.execute(
+        """
+        INSERT INTO partner_daily_revenue (organization_id, partner_id, day, order_count, total)
+        SELECT organization_id, partner_id, (created_at_utc AT TIME ZONE 'UTC')::date,
+               count(*), coalesce(sum(grand_total), 0)
+        FROM orders
+        WHERE status = 'SIPARIS'
+        GROUP BY 1, 2, 3
+        """
+    )
+    for window in (30, 90, 365):
+        op.execute(
+            f"""
+            INSERT INTO customer_revenue_windows
+                (organization_id, window_days, partner_id, order_count, revenue)
+            SELECT organization_id, {window}, partner_id, sum(order_count), sum(total)
+            FROM partner_daily_revenue
+            WHERE day > current_date - {window}
+            GROUP BY organization_id, partner_id
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_customer_revenue_windows_rank", table_name="customer_revenue_windows")
+    op.drop_table("customer_revenue_windows")
+    op.drop_table("partner_daily_revenue")
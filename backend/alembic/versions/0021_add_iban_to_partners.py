@@ -0,0 +1,17 @@
+"""add iban to partners"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0021"
+down_revision = "0020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("partners", sa.Column("iban", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("partners", "iban")
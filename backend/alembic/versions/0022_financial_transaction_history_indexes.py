@@ -0,0 +1,39 @@
+"""financial transaction history indexes"""
+
+from alembic import op
+
+revision = "0022"
+down_revision = "0021"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_fin_tx_org_date",
+        "financial_transactions",
+        ["organization_id", "transaction_date", "id"],
+    )
+    op.create_index(
+        "ix_fin_tx_account_date",
+        "financial_transactions",
+        ["account_id", "transaction_date", "id"],
+    )
+    op.create_index(
+        "ix_fin_tx_partner_date",
+        "financial_transactions",
+        ["partner_id", "transaction_date", "id"],
+    )
+    op.create_index(
+        "ix_fin_tx_date_brin",
+        "financial_transactions",
+        ["transaction_date"],
+        postgresql_using="brin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_fin_tx_date_brin", table_name="financial_transactions")
+    op.drop_index("ix_fin_tx_partner_date", table_name="financial_transactions")
+    op.drop_index("ix_fin_tx_account_date", table_name="financial_transactions")
+    op.drop_index("ix_fin_tx_org_date", table_name="financial_transactions")
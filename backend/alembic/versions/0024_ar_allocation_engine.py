@@ -0,0 +1,29 @@
+"""ar allocation watermarks and indexes"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0024"
+down_revision = "0023"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ar_allocation_watermarks",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("allocated_through", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at_utc", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("organization_id"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_ar_allocations_entry", "ar_allocations", ["entry_id"])
+    op.create_index("ix_ar_entries_created", "ar_entries", ["organization_id", "created_at_utc"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ar_entries_created", table_name="ar_entries")
+    op.drop_index("ix_ar_allocations_entry", table_name="ar_allocations")
+    op.drop_table("ar_allocation_watermarks")
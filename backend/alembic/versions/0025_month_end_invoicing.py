@@ -0,0 +1,91 @@
+"""month-end invoicing: invoice org scope, document sequences, invoice runs"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0025"
+down_revision = "0024"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sales_invoices",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE sales_invoices i SET organization_id = p.organization_id
+        FROM partners p WHERE p.id = i.partner_id
+        """
+    )
+    op.alter_column("sales_invoices", "organization_id", nullable=False)
+    op.create_foreign_key(
+        "sales_invoices_organization_id_fkey",
+        "sales_invoices",
+        "organizations",
+        ["organization_id"],
+        ["id"],
+        ondelete="RESTRICT",
+    )
+    # Numbers come from per-org sequences now, so they are unique per org.
+    op.execute("ALTER TABLE sales_invoices DROP CONSTRAINT IF EXISTS sales_invoices_number_key")
+    op.create_unique_constraint(
+        "uq_sales_invoices_org_number", "sales_invoices", ["organization_id", "number"]
+    )
+    op.execute("ALTER TABLE sales_invoices DROP CONSTRAINT IF EXISTS sales_invoices_order_id_fkey")
+    op.create_foreign_key(
+        "sales_invoices_order_id_fkey",
+        "sales_invoices",
+        "orders",
+        ["order_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index(
+        "uq_sales_invoices_order",
+        "sales_invoices",
+        ["order_id"],
+        unique=True,
+        postgresql_where=sa.text("status <> 'CANCELLED'"),
+    )
+
+    op.create_table(
+        "document_sequences",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("name", sa.Text(), nullable=False),
+        sa.Column("next_value", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("organization_id", "name"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+    )
+    op.create_table(
+        "invoice_runs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("period_end", sa.Date(), nullable=False),
+        sa.Column("issue_date", sa.Date(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False, server_default="RUNNING"),
+        sa.Column("total_partners", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("done_partners", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("invoices_created", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("started_at_utc", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("finished_at_utc", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("organization_id", "period_start", "period_end", name="uq_invoice_runs_period"),
+        sa.CheckConstraint("status IN ('RUNNING','DONE','FAILED')", name="chk_invoice_run_status"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("invoice_runs")
+    op.drop_table("document_sequences")
+    op.drop_index("uq_sales_invoices_order", table_name="sales_invoices")
+    op.drop_constraint("sales_invoices_order_id_fkey", "sales_invoices", type_="foreignkey")
+    op.drop_constraint("uq_sales_invoices_org_number", "sales_invoices", type_="unique")
+    op.create_unique_constraint("sales_invoices_number_key", "sales_invoices", ["number"])
+    op.drop_constraint("sales_invoices_organization_id_fkey", "sales_invoices", type_="foreignkey")
+    op.drop_column("sales_invoices", "organization_id")
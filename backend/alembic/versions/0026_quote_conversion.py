@@ -0,0 +1,64 @@
+"""quote conversion: quote org scope, item dimensions, order back-link"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0026"
+down_revision = "0025"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "quotes",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE quotes q SET organization_id = p.organization_id
+        FROM partners p WHERE p.id = q.partner_id
+        """
+    )
+    op.alter_column("quotes", "organization_id", nullable=False)
+    op.create_foreign_key(
+        "quotes_organization_id_fkey",
+        "quotes",
+        "organizations",
+        ["organization_id"],
+        ["id"],
+        ondelete="RESTRICT",
+    )
+    # Existing lines were priced per unit; 1 m² keeps their totals unchanged.
+    op.add_column(
+        "quote_items",
+        sa.Column("width", sa.Numeric(14, 2), nullable=False, server_default="1000"),
+    )
+    op.add_column(
+        "quote_items",
+        sa.Column("height", sa.Numeric(14, 2), nullable=False, server_default="1000"),
+    )
+    op.add_column(
+        "orders",
+        sa.Column("quote_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_foreign_key(
+        "orders_quote_id_fkey",
+        "orders",
+        "quotes",
+        ["quote_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_unique_constraint("orders_quote_id_key", "orders", ["quote_id"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("orders_quote_id_key", "orders", type_="unique")
+    op.drop_constraint("orders_quote_id_fkey", "orders", type_="foreignkey")
+    op.drop_column("orders", "quote_id")
+    op.drop_column("quote_items", "height")
+    op.drop_column("quote_items", "width")
+    op.drop_constraint("quotes_organization_id_fkey", "quotes", type_="foreignkey")
+    op.drop_column("quotes", "organization_id")
@@ -0,0 +1,63 @@
+"""warehouses belong to an organization"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0027"
+down_revision = "0026"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "warehouses",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    # Warehouses holding stock go to the org that owns it; unused ones go to
+    # the oldest org, which is where the single-tenant data was moved.
+    op.execute(
+        """
+        UPDATE warehouses w SET organization_id = b.organization_id
+        FROM (
+            SELECT DISTINCT ON (warehouse_id) warehouse_id, organization_id
+            FROM stock_balances ORDER BY warehouse_id, quantity DESC
+        ) b
+        WHERE b.warehouse_id = w.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE warehouses SET organization_id = (
+            SELECT id FROM organizations ORDER BY created_at_utc LIMIT 1
+        )
+        WHERE organization_id IS NULL
+        """
+    )
+    op.alter_column("warehouses", "organization_id", nullable=False)
+    op.create_foreign_key(
+        "warehouses_organization_id_fkey",
+        "warehouses",
+        "organizations",
+        ["organization_id"],
+        ["id"],
+        ondelete="RESTRICT",
+    )
+    op.execute("ALTER TABLE warehouses DROP CONSTRAINT IF EXISTS warehouses_name_key")
+    op.execute("ALTER TABLE warehouses DROP CONSTRAINT IF EXISTS warehouses_code_key")
+    op.create_unique_constraint(
+        "uq_warehouses_org_name", "warehouses", ["organization_id", "name"]
+    )
+    op.create_unique_constraint(
+        "uq_warehouses_org_code", "warehouses", ["organization_id", "code"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_warehouses_org_code", "warehouses", type_="unique")
+    op.drop_constraint("uq_warehouses_org_name", "warehouses", type_="unique")
+    op.create_unique_constraint("warehouses_code_key", "warehouses", ["code"])
+    op.create_unique_constraint("warehouses_name_key", "warehouses", ["name"])
+    op.drop_constraint("warehouses_organization_id_fkey", "warehouses", type_="foreignkey")
+    op.drop_column("warehouses", "organization_id")
@@ -0,0 +1,42 @@
+"""create stock snapshots"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0028"
+down_revision = "0027"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled by: python -m app.jobs.snapshot_stock
+    op.create_table(
+        "stock_snapshots",
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("warehouse_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("snapshot_date", sa.Date(), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("quantity", sa.Numeric(14, 3), nullable=False),
+        sa.Column("updated_at_utc", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("product_id", "warehouse_id", "snapshot_date"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["warehouse_id"], ["warehouses.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+    )
+    op.create_index(
+        "ix_stock_snapshots_org_date", "stock_snapshots", ["organization_id", "snapshot_date"]
+    )
+    # Movements after a pair's snapshot are one range scan of this index.
+    op.create_index(
+        "ix_stock_movements_pair_created",
+        "stock_movements",
+        ["product_id", "warehouse_id", "created_at_utc"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_movements_pair_created", table_name="stock_movements")
+    op.drop_index("ix_stock_snapshots_org_date", table_name="stock_snapshots")
+    op.drop_table("stock_snapshots")
@@ -0,0 +1,50 @@
+"""stock reservations for confirmed orders"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0029"
+down_revision = "0028"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "stock_balances",
+        sa.Column("reserved_quantity", sa.Numeric(14, 3), nullable=False, server_default=sa.text("0")),
+    )
+    op.add_column(
+        "stock_balances",
+        sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    op.create_table(
+        "stock_reservations",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("order_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("order_item_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("warehouse_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("quantity", sa.Numeric(14, 3), nullable=False),
+        sa.Column("created_at_utc", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["order_item_id"], ["order_items.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["warehouse_id"], ["warehouses.id"], ondelete="CASCADE"),
+        sa.CheckConstraint("quantity > 0", name="chk_stock_reservation_quantity_positive"),
+    )
+    op.create_index("ix_stock_reservations_order", "stock_reservations", ["order_id"])
+    op.create_index(
+        "ix_stock_reservations_pair", "stock_reservations", ["product_id", "warehouse_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_reservations_pair", table_name="stock_reservations")
+    op.drop_index("ix_stock_reservations_order", table_name="stock_reservations")
+    op.drop_table("stock_reservations")
+    op.drop_column("stock_balances", "version")
+    op.drop_column("stock_balances", "reserved_quantity")
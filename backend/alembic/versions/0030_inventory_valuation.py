@@ -0,0 +1,54 @@
+"""inventory valuation: movement unit costs, FIFO cost layers, stock values"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0030"
+down_revision = "0029"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("stock_movements", sa.Column("unit_cost", sa.Numeric(14, 4), nullable=True))
+    op.add_column(
+        "stock_balances",
+        sa.Column("fifo_value", sa.Numeric(16, 4), nullable=False, server_default=sa.text("0")),
+    )
+    op.add_column(
+        "stock_balances",
+        sa.Column("average_value", sa.Numeric(16, 4), nullable=False, server_default=sa.text("0")),
+    )
+    # Filled for existing movements by: python -m app.jobs.recompute_valuation
+    op.create_table(
+        "stock_cost_layers",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("warehouse_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("movement_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("received_at_utc", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("sequence", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Numeric(14, 3), nullable=False),
+        sa.Column("remaining_quantity", sa.Numeric(14, 3), nullable=False),
+        sa.Column("unit_cost", sa.Numeric(14, 4), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["warehouse_id"], ["warehouses.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["movement_id"], ["stock_movements.id"], ondelete="CASCADE"),
+    )
+    op.create_index(
+        "ix_stock_cost_layers_open",
+        "stock_cost_layers",
+        ["product_id", "warehouse_id", "received_at_utc", "sequence"],
+        postgresql_where=sa.text("remaining_quantity > 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_cost_layers_open", table_name="stock_cost_layers")
+    op.drop_table("stock_cost_layers")
+    op.drop_column("stock_balances", "average_value")
+    op.drop_column("stock_balances", "fifo_value")
+    op.drop_column("stock_movements", "unit_cost")
@@ -0,0 +1,40 @@
+"""production capacity: lines with daily m² capacity and per-day order load"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0031"
+down_revision = "0030"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "production_lines",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("name", sa.Text(), nullable=False),
+        sa.Column("capacity_sqm_per_day", sa.Numeric(12, 3), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.text("true")),
+        sa.Column("created_at_utc", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="RESTRICT"),
+        sa.UniqueConstraint("organization_id", "name", name="uq_production_lines_org_name"),
+        sa.CheckConstraint("capacity_sqm_per_day > 0", name="chk_production_line_capacity_positive"),
+    )
+    # Filled for existing orders by: python -m app.jobs.rebuild_production_load
+    op.create_table(
+        "production_load",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("load_date", sa.Date(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("area", sa.Numeric(16, 3), nullable=False, server_default=sa.text("0")),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("organization_id", "load_date"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("production_load")
+    op.drop_table("production_lines")
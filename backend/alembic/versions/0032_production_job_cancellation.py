@@ -0,0 +1,44 @@
+"""production jobs: CANCELLED status; order priority copied onto jobs"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0032"
+down_revision = "0031"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_constraint("chk_production_job_status", "production_jobs", type_="check")
+    op.create_check_constraint(
+        "chk_production_job_status",
+        "production_jobs",
+        "status IN ('PENDING','CLAIMED','DONE','FAILED','CANCELLED')",
+    )
+    op.add_column(
+        "orders",
+        sa.Column("priority", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    # Jobs of orders cancelled before this release were never withdrawn.
+    op.execute(
+        """
+        UPDATE production_jobs j
+        SET status = 'CANCELLED', claimed_by = NULL, claimed_at_utc = NULL
+        FROM order_items i JOIN orders o ON o.id = i.order_id
+        WHERE i.id = j.order_item_id
+          AND o.status = 'IPTAL'
+          AND j.status IN ('PENDING', 'CLAIMED')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("orders", "priority")
+    op.execute("UPDATE production_jobs SET status = 'FAILED' WHERE status = 'CANCELLED'")
+    op.drop_constraint("chk_production_job_status", "production_jobs", type_="check")
+    op.create_check_constraint(
+        "chk_production_job_status",
+        "production_jobs",
+        "status IN ('PENDING','CLAIMED','DONE','FAILED')",
+    )
@@ -0,0 +1,47 @@
+"""ar allocation: per-partner pending marks replace the created_at watermark"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0033"
+down_revision = "0032"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ar_allocation_pending",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("partner_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default=sa.text("1")),
+        sa.Column("marked_at_utc", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("organization_id", "partner_id"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["partner_id"], ["partners.id"], ondelete="CASCADE"),
+    )
+    # Entries the old watermark may have skipped (it trailed by a fixed lag,
+    # so later commits of older rows were missed) get one more pass.
+    op.execute(
+        """
+        INSERT INTO ar_allocation_pending (organization_id, partner_id)
+        SELECT DISTINCT e.organization_id, e.partner_id
+        FROM ar_entries e
+        """
+    )
+    op.drop_index("ix_ar_entries_created", table_name="ar_entries")
+    op.drop_table("ar_allocation_watermarks")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "ar_allocation_watermarks",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("allocated_through", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at_utc", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("organization_id"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_ar_entries_created", "ar_entries", ["organization_id", "created_at_utc"])
+    op.drop_table("ar_allocation_pending")
@@ -0,0 +1,49 @@
+"""financial transactions: fingerprint imported statement lines"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0034"
+down_revision = "0033"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "financial_transactions", sa.Column("statement_fingerprint", sa.Text(), nullable=True)
+    )
+    # Same key as finance_service.statement_fingerprint; rows booked before
+    # this release have no bank reference, so their description stands in.
+    op.execute(
+        """
+        UPDATE financial_transactions t
+        SET statement_fingerprint = f.fingerprint
+        FROM (
+            SELECT id, encode(sha256(convert_to(concat_ws('|',
+                to_char((transaction_date AT TIME ZONE 'UTC')::date, 'YYYY-MM-DD'),
+                (CASE WHEN direction = 'OUT' THEN -amount ELSE amount END)::text,
+                coalesce(description, ''),
+                row_number() OVER (
+                    PARTITION BY account_id, transaction_date, direction, amount,
+                                 coalesce(description, '')
+                    ORDER BY id
+                )::text
+            ), 'UTF8')), 'hex') AS fingerprint
+            FROM financial_transactions
+            WHERE method = 'STATEMENT'
+        ) f
+        WHERE f.id = t.id
+        """
+    )
+    op.create_index(
+        "uq_fin_tx_statement_line",
+        "financial_transactions",
+        ["account_id", "statement_fingerprint"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_fin_tx_statement_line", table_name="financial_transactions")
+    op.drop_column("financial_transactions", "statement_fingerprint")
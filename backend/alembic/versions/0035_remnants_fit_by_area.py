@@ -0,0 +1,31 @@
+"""remnants: key ix_remnants_fit on area so fit lookups read it in order"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0035"
+down_revision = "0034"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # find_fitting_remnant and reserve_remnants_for_jobs order by
+    # (width * height, width); a (width, height) key cannot return that order.
+    op.drop_index("ix_remnants_fit", table_name="remnants")
+    op.create_index(
+        "ix_remnants_fit",
+        "remnants",
+        ["organization_id", "product_id", sa.text("(width * height)"), "width"],
+        postgresql_where=sa.text("status = 'AVAILABLE'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_remnants_fit", table_name="remnants")
+    op.create_index(
+        "ix_remnants_fit",
+        "remnants",
+        ["organization_id", "product_id", "width", "height"],
+        postgresql_where=sa.text("status = 'AVAILABLE'"),
+    )
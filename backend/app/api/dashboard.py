@@ -1,27 +1,32 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user, get_db
+from app.core.config import settings
+from app.core.deps import get_current_org, get_current_user_in_org, get_db
+from app.models.organization import Organization
 from app.models.user import User
-from app.services.dashboard_service import (
-    get_ar_summary,
-    get_low_stock,
-    get_sales_summary,
-    get_top_customers,
-)
+from app.services.dashboard_service import get_dashboard_summary
+from app.services.rollup_service import get_top_customers
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
 @router.get("/summary")
 def dashboard_summary(
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
 ):
-    return {
-        "sales": get_sales_summary(db),
-        "ar": get_ar_summary(db),
-        "stock": {"low": get_low_stock(db)},
-        "top_customers": get_top_customers(db),
-    }
+    return get_dashboard_summary(org.id)
+
 
+@router.get("/top-customers")
+def top_customers(
+    window: int = Query(30, description="window length in days"),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    if window not in settings.LEADERBOARD_WINDOWS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported window")
+    return {"window": window, "items": get_top_customers(db, org.id, window, limit)}
@@ -0,0 +1,45 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.deps import get_stream_org, get_stream_user_in_org
+from app.core.events import broker, format_sse
+from app.models.organization import Organization
+from app.models.user import User
+
+router = APIRouter(tags=["events"])
+
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    org: Organization = Depends(get_stream_org),
+    user: User = Depends(get_stream_user_in_org),
+):
+    """Server-Sent Events for the org: order status changes, new financial
+    transactions and ``dashboard`` notices naming the sections that changed."""
+    org_id = org.id
+
+    async def stream():
+        sub = broker.subscribe(org_id)
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    item = await asyncio.wait_for(
+                        sub.queue.get(), timeout=settings.EVENTS_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(item)
+        finally:
+            broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,19 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_org, get_current_user_in_org, get_db
+from app.core.deps import get_current_admin, get_current_org, get_current_user_in_org, get_db
+from app.core.pagination import InvalidCursor
 from app.models.organization import Organization
 from app.models.user import User
 from app.models.finance import Account
+from app.models.invoice import InvoiceRun
 from app.schemas.finance import (
+    AccountBalancesResponse,
     AccountPublic,
     FinancialTransactionCreate,
+    FinancialTransactionPage,
     FinancialTransactionPublic,
+    StatementImportResult,
 )
+from app.schemas.invoice import InvoiceRunPublic
+from app.services.account_balance_service import balances_as_of
+from app.services.ar_allocation_service import run_allocation
 from app.services.finance_service import (
     FinanceServiceError,
+    import_statement,
+    list_transactions,
     record_transaction,
 )
+from app.services.statement_parser import (
+    StatementParseError,
+    detect_format,
+    parse_statement,
+)
 
 router = APIRouter(prefix="/finance", tags=["finance"])
 
@@ -29,22 +48,67 @@ def create_transaction(
     org: Organization = Depends(get_current_org),
     user: User = Depends(get_current_user_in_org),
 ):
-    account = (
-        db.query(Account)
-        .filter(Account.id == data.account_id, Account.organization_id == org.id)
-        .first()
-    )
-    if not account:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="account_not_found")
     try:
-        tx = record_transaction(db, data, user)
-    except FinanceServiceError as e:
-        if str(e) == "forbidden":
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="forbidden")
+        tx = record_transaction(db, org.id, data)
+    except FinanceServiceError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="account_not_found")
     return tx
 
 
+@router.get("/transactions", response_model=FinancialTransactionPage)
+def list_transactions_endpoint(
+    account_id: UUID | None = None,
+    partner_id: UUID | None = None,
+    direction: Literal["IN", "OUT"] | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    try:
+        items, next_cursor = list_transactions(
+            db,
+            org.id,
+            account_id=account_id,
+            partner_id=partner_id,
+            direction=direction,
+            date_from=date_from,
+            date_to=date_to,
+            cursor=cursor,
+            limit=limit,
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.post("/statements/import", response_model=StatementImportResult)
+def import_bank_statement(
+    account_id: UUID = Form(...),
+    format: Literal["csv", "mt940"] | None = Form(None),
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    raw = file.file.read()
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = raw.decode("cp1254")
+    try:
+        lines = parse_statement(text, format or detect_format(file.filename, text))
+    except StatementParseError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"invalid_statement: {e}")
+    try:
+        return import_statement(db, org.id, account_id, lines)
+    except FinanceServiceError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="account_not_found")
+
+
 @router.get("/accounts", response_model=list[AccountPublic])
 def list_accounts(
     db: Session = Depends(get_db),
@@ -53,3 +117,50 @@ def list_accounts(
 ):
     accounts = db.query(Account).filter(Account.organization_id == org.id).all()
     return accounts
+
+
+@router.get("/accounts/balances", response_model=AccountBalancesResponse)
+def account_balances_as_of(
+    as_of: date,
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    balances = balances_as_of(db, org.id, as_of)
+    accounts = db.query(Account).filter(Account.organization_id == org.id).all()
+    return {
+        "as_of": as_of,
+        "items": [
+            {"id": a.id, "name": a.name, "type": a.type, "balance": balances[a.id]}
+            for a in accounts
+        ],
+    }
+
+
+@router.post("/ar/allocations/run")
+def run_ar_allocation(
+    full: bool = False,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+    org: Organization = Depends(get_current_org),
+    _: User = Depends(get_current_user_in_org),
+):
+    """Apply payments and refunds to open invoices, oldest first."""
+    return run_allocation(db, org.id, full)
+
+
+@router.get("/invoice-runs", response_model=list[InvoiceRunPublic])
+def list_invoice_runs(
+    limit: int = Query(12, ge=1, le=100),
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    """Month-end invoicing runs, newest period first, with their progress."""
+    return (
+        db.query(InvoiceRun)
+        .filter(InvoiceRun.organization_id == org.id)
+        .order_by(InvoiceRun.period_start.desc())
+        .limit(limit)
+        .all()
+    )
@@ -14,6 +14,8 @@ from app.core.deps import (
 from app.models.organization import Organization
 from app.models.user import User
 from app.schemas.order import (
+    OrderBulkStatusResult,
+    OrderBulkStatusUpdate,
     OrderCreate,
     OrderListResponse,
     OrderPublic,
@@ -21,6 +23,8 @@ from app.schemas.order import (
     OrderStatusUpdate,
 )
 from app.services.order_service import (
+    OrderServiceError,
+    bulk_update_order_status,
     create_order,
     delete_order,
     get_order,
@@ -83,6 +87,8 @@ def update_order_endpoint(
 ):
     try:
         order = update_order(db, org.id, order_id, data)
+    except OrderServiceError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except IntegrityError:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Order update conflict")
     if not order:
@@ -100,14 +106,40 @@ def update_order_status_endpoint(
     _: User = Depends(get_current_user_in_org),
 ):
     try:
-        order = update_order_status(db, order_id, data.status, admin)
+        order = update_order_status(db, org.id, order_id, data.status)
+    except OrderServiceError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except IntegrityError:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Order status conflict")
-    if not order or order.organization_id != org.id:
+    if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
     return order
 
 
+@router.post("/status", response_model=OrderBulkStatusResult)
+def bulk_update_order_status_endpoint(
+    data: OrderBulkStatusUpdate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+    org: Organization = Depends(get_current_org),
+    _: User = Depends(get_current_user_in_org),
+):
+    try:
+        updated, skipped, shortages = bulk_update_order_status(
+            db, org.id, data.order_ids, data.status
+        )
+    except OrderServiceError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Order status conflict")
+    return {
+        "status": data.status,
+        "updated": updated,
+        "skipped": skipped,
+        "shortages": shortages,
+    }
+
+
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_order_endpoint(
     order_id: UUID,
@@ -1,6 +1,9 @@
+from datetime import date
+from typing import Literal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -11,6 +14,7 @@ from app.core.deps import (
     get_db,
     get_pagination,
 )
+from app.db import session as db_session
 from app.models.organization import Organization
 from app.models.user import User
 from app.schemas.partner import (
@@ -19,6 +23,7 @@ from app.schemas.partner import (
     PartnerPublic,
     PartnerUpdate,
 )
+from app.services.ledger_service import iter_ledger, ledger_csv, ledger_json
 from app.services.partner_service import (
     create_partner,
     delete_partner,
@@ -57,6 +62,40 @@ def get_partner_endpoint(
     return partner
 
 
+@router.get("/{partner_id}/ledger")
+def partner_ledger_endpoint(
+    partner_id: UUID,
+    format: Literal["json", "csv"] = "json",
+    date_from: date | None = None,
+    date_to: date | None = None,
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    """Chronological statement with a running balance, streamed as JSON or CSV."""
+    if not get_partner(db, org.id, partner_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Partner not found")
+    org_id = org.id
+
+    def stream():
+        # The request session is closed before the body is sent, so the
+        # stream reads through its own.
+        with db_session.SessionLocal() as ledger_db:
+            rows = iter_ledger(ledger_db, org_id, partner_id, date_from, date_to)
+            if format == "csv":
+                yield from ledger_csv(rows)
+            else:
+                yield from ledger_json(partner_id, rows)
+
+    if format == "csv":
+        return StreamingResponse(
+            stream(),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="ledger-{partner_id}.csv"'},
+        )
+    return StreamingResponse(stream(), media_type="application/json")
+
+
 @router.post("", response_model=PartnerPublic, status_code=status.HTTP_201_CREATED)
 def create_partner_endpoint(
     data: PartnerCreate,
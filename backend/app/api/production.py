@@ -0,0 +1,232 @@
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_current_admin, get_current_org, get_current_user_in_org, get_db
+from app.models.organization import Organization
+from app.models.user import User
+from app.schemas.production import (
+    CapacityPlan,
+    CapacitySuggestion,
+    CuttingPlanPublic,
+    CuttingPlanRequest,
+    ProductionJobClaim,
+    ProductionJobComplete,
+    ProductionJobPublic,
+    ProductionLineCreate,
+    ProductionLinePublic,
+    ProductionLineUpdate,
+)
+from app.services.capacity_service import (
+    CapacityServiceError,
+    capacity_plan,
+    create_line,
+    daily_capacity,
+    earliest_feasible_date,
+    list_lines,
+    load_facts_for,
+    order_area,
+    update_line,
+)
+from app.services.cutting_service import CuttingPlan, Piece, plan_cutting
+from app.services.order_service import get_order
+from app.services.production_service import (
+    ProductionServiceError,
+    claim_jobs,
+    complete_job,
+    get_queue_stats,
+)
+
+router = APIRouter(prefix="/production", tags=["production"])
+
+
+def _piece_out(piece: Piece) -> dict:
+    return {
+        "job_id": piece.job_id,
+        "order_item_id": piece.order_item_id,
+        "width": piece.width,
+        "height": piece.height,
+    }
+
+
+def _plan_out(plan: CuttingPlan) -> dict:
+    sheet_area = plan.sheet_area
+    return {
+        "sheet_width": plan.sheet_width,
+        "sheet_height": plan.sheet_height,
+        "kerf": plan.kerf,
+        "edge_trim": plan.edge_trim,
+        "sheet_count": len(plan.sheets),
+        "piece_count": sum(len(sheet.placements) for sheet in plan.sheets),
+        "yield_pct": plan.yield_pct,
+        "sheets": [
+            {
+                "product_id": sheet.product_id,
+                "yield_pct": round(100 * sheet.used_area / sheet_area, 2),
+                "placements": [
+                    {
+                        "job_id": p.piece.job_id,
+                        "order_item_id": p.piece.order_item_id,
+                        "x": p.x,
+                        "y": p.y,
+                        "width": p.width,
+                        "height": p.height,
+                        "rotated": p.rotated,
+                    }
+                    for p in sheet.placements
+                ],
+            }
+            for sheet in plan.sheets
+        ],
+        "unplaced": [_piece_out(piece) for piece in plan.unplaced],
+    }
+
+
+@router.post("/cutting-plan", response_model=CuttingPlanPublic)
+def cutting_plan_endpoint(
+    data: CuttingPlanRequest,
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    plan = plan_cutting(db, org.id, **data.model_dump())
+    return _plan_out(plan)
+
+
+@router.post("/jobs/claim", response_model=list[ProductionJobPublic])
+def claim_jobs_endpoint(
+    data: ProductionJobClaim,
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    return claim_jobs(db, org.id, data.station, data.limit)
+
+
+@router.post("/jobs/{job_id}/complete", response_model=ProductionJobPublic)
+def complete_job_endpoint(
+    job_id: UUID,
+    data: ProductionJobComplete,
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    try:
+        job = complete_job(db, org.id, job_id, data.station, data.success, data.error)
+    except ProductionServiceError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/stats")
+def job_stats_endpoint(
+    window_minutes: int = Query(60, ge=1, le=1440),
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    return get_queue_stats(db, org.id, window_minutes)
+
+
+@router.get("/lines", response_model=list[ProductionLinePublic])
+def list_lines_endpoint(
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    return list_lines(db, org.id)
+
+
+@router.post("/lines", response_model=ProductionLinePublic, status_code=status.HTTP_201_CREATED)
+def create_line_endpoint(
+    data: ProductionLineCreate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+    org: Organization = Depends(get_current_org),
+    _: User = Depends(get_current_user_in_org),
+):
+    try:
+        return create_line(db, org.id, data)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Production line name already exists"
+        )
+
+
+@router.patch("/lines/{line_id}", response_model=ProductionLinePublic)
+def update_line_endpoint(
+    line_id: UUID,
+    data: ProductionLineUpdate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+    org: Organization = Depends(get_current_org),
+    _: User = Depends(get_current_user_in_org),
+):
+    try:
+        line = update_line(db, org.id, line_id, data)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Production line name already exists"
+        )
+    if not line:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Production line not found"
+        )
+    return line
+
+
+@router.get("/capacity", response_model=CapacityPlan)
+def capacity_plan_endpoint(
+    date_from: date,
+    date_to: date,
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    try:
+        days = capacity_plan(db, org.id, date_from, date_to)
+    except CapacityServiceError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {
+        "daily_capacity": daily_capacity(db, org.id),
+        "overbooked_days": [day["date"] for day in days if day["overbooked"]],
+        "days": days,
+    }
+
+
+@router.get("/capacity/earliest", response_model=CapacitySuggestion)
+def earliest_date_endpoint(
+    area: Decimal | None = Query(None, gt=0),
+    order_id: UUID | None = None,
+    not_before: date | None = None,
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    """Earliest delivery date with room for ``area`` m² or for an order's lines.
+
+    An order that is already booked is moved, not counted twice.
+    """
+    exclude = None
+    if order_id is not None:
+        order = get_order(db, org.id, order_id)
+        if not order:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+        exclude = load_facts_for(order)
+        if area is None:
+            area = order_area(order)
+    if not area:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="area or order_id is required"
+        )
+    try:
+        earliest = earliest_feasible_date(db, org.id, area, not_before, exclude)
+    except CapacityServiceError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return {"area": area, "earliest_date": earliest}
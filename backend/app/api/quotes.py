@@ -0,0 +1,33 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_current_admin, get_current_org, get_current_user_in_org, get_db
+from app.models.organization import Organization
+from app.models.user import User
+from app.schemas.order import OrderPublic
+from app.services.quote_service import QuoteServiceError, convert_quote
+
+router = APIRouter(prefix="/quotes", tags=["quotes"])
+
+
+@router.post(
+    "/{quote_id}/convert", response_model=OrderPublic, status_code=status.HTTP_201_CREATED
+)
+def convert_quote_endpoint(
+    quote_id: UUID,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+    org: Organization = Depends(get_current_org),
+    _: User = Depends(get_current_user_in_org),
+):
+    try:
+        return convert_quote(db, org.id, quote_id)
+    except QuoteServiceError as e:
+        if str(e) == "quote_not_found":
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quote not found")
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Order number conflict")
@@ -0,0 +1,71 @@
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.deps import (
+    get_current_admin,
+    get_current_org,
+    get_current_user_in_org,
+    get_db,
+    get_pagination,
+)
+from app.models.organization import Organization
+from app.models.user import User
+from app.schemas.remnant import RemnantCreate, RemnantListResponse, RemnantPublic
+from app.services.remnant_service import (
+    RemnantServiceError,
+    create_remnant,
+    find_fitting_remnant,
+    list_remnants,
+)
+
+router = APIRouter(prefix="/remnants", tags=["remnants"])
+
+
+@router.get("", response_model=RemnantListResponse)
+def list_remnants_endpoint(
+    pagination: tuple[int, int] = Depends(get_pagination),
+    product_id: UUID | None = None,
+    status: str | None = None,
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    page, page_size = pagination
+    items, total = list_remnants(db, org.id, page, page_size, product_id, status)
+    return {"items": items, "total": total, "page": page, "page_size": page_size}
+
+
+@router.get("/fit", response_model=RemnantPublic)
+def fit_remnant_endpoint(
+    product_id: UUID,
+    width: Decimal = Query(..., gt=0),
+    height: Decimal = Query(..., gt=0),
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    remnant = find_fitting_remnant(db, org.id, product_id, width, height)
+    if not remnant:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No fitting remnant")
+    return remnant
+
+
+@router.post("", response_model=RemnantPublic, status_code=status.HTTP_201_CREATED)
+def create_remnant_endpoint(
+    data: RemnantCreate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+    org: Organization = Depends(get_current_org),
+    _: User = Depends(get_current_user_in_org),
+):
+    try:
+        remnant = create_remnant(db, org.id, data)
+    except RemnantServiceError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Remnant conflict")
+    return remnant
@@ -0,0 +1,122 @@
+from datetime import date
+from decimal import Decimal
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_current_admin, get_current_org, get_current_user_in_org, get_db
+from app.models.organization import Organization
+from app.models.user import User
+from app.schemas.stock import (
+    MrpResponse,
+    ProductStockResponse,
+    StockAsOfResponse,
+    StockAvailabilityPublic,
+    StockMovementBatch,
+    StockMovementBatchResult,
+    StockMovementCreate,
+    ValuationReport,
+)
+from app.services.stock_service import (
+    InsufficientStock,
+    StockServiceError,
+    get_product_stock,
+    post_movements,
+)
+from app.services.mrp_service import get_projection
+from app.services.reservation_service import available_to_promise
+from app.services.stock_snapshot_service import stock_as_of
+from app.services.valuation_service import valuation_report
+
+router = APIRouter(tags=["stock"])
+
+
+@router.post(
+    "/stock-movements",
+    response_model=StockMovementBatchResult,
+    status_code=status.HTTP_201_CREATED,
+)
+def post_movements_endpoint(
+    data: StockMovementBatch | StockMovementCreate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+    org: Organization = Depends(get_current_org),
+    _: User = Depends(get_current_user_in_org),
+):
+    movements = data.movements if isinstance(data, StockMovementBatch) else [data]
+    try:
+        return post_movements(db, org.id, [m.model_dump() for m in movements])
+    except InsufficientStock as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=jsonable_encoder({"code": str(e), "shortages": e.shortages}),
+        )
+    except StockServiceError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get("/stock/product/{product_id}", response_model=ProductStockResponse)
+def product_stock_endpoint(
+    product_id: UUID,
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    rows = get_product_stock(db, org.id, product_id)
+    return {
+        "product_id": product_id,
+        "total": sum((row.quantity for row in rows), Decimal("0")),
+        "warehouses": rows,
+    }
+
+
+@router.get("/stock/as-of", response_model=StockAsOfResponse)
+def stock_as_of_endpoint(
+    as_of: date,
+    product_id: UUID | None = None,
+    warehouse_id: UUID | None = None,
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    items = stock_as_of(db, org.id, as_of, product_id, warehouse_id)
+    return {"as_of": as_of, "items": items}
+
+
+@router.get("/stock/available", response_model=list[StockAvailabilityPublic])
+def available_stock_endpoint(
+    product_id: UUID | None = None,
+    warehouse_id: UUID | None = None,
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    return available_to_promise(db, org.id, product_id, warehouse_id)
+
+
+@router.get("/stock/valuation", response_model=ValuationReport)
+def stock_valuation_endpoint(
+    method: Literal["fifo", "average"] = "fifo",
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    admin: User = Depends(get_current_admin),
+    _: User = Depends(get_current_user_in_org),
+):
+    items = valuation_report(db, org.id, method)
+    return {
+        "method": method,
+        "total": sum((Decimal(row.value) for row in items), Decimal("0")),
+        "items": items,
+    }
+
+
+@router.get("/stock/mrp", response_model=MrpResponse)
+def mrp_endpoint(
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    return {"items": get_projection(db, org.id)}
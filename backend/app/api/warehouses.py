@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.deps import (
+    get_current_admin,
+    get_current_org,
+    get_current_user_in_org,
+    get_db,
+    get_pagination,
+)
+from app.models.organization import Organization
+from app.models.user import User
+from app.schemas.stock import WarehouseCreate, WarehouseListResponse, WarehousePublic
+from app.services.warehouse_service import create_warehouse, list_warehouses
+
+router = APIRouter(prefix="/warehouses", tags=["warehouses"])
+
+
+@router.get("", response_model=WarehouseListResponse)
+def list_warehouses_endpoint(
+    pagination: tuple[int, int] = Depends(get_pagination),
+    db: Session = Depends(get_db),
+    org: Organization = Depends(get_current_org),
+    user: User = Depends(get_current_user_in_org),
+):
+    page, page_size = pagination
+    items, total = list_warehouses(db, org.id, page, page_size)
+    return {"items": items, "total": total, "page": page, "page_size": page_size}
+
+
+@router.post("", response_model=WarehousePublic, status_code=status.HTTP_201_CREATED)
+def create_warehouse_endpoint(
+    data: WarehouseCreate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+    org: Organization = Depends(get_current_org),
+    _: User = Depends(get_current_user_in_org),
+):
+    try:
+        warehouse = create_warehouse(db, org.id, data)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Warehouse name or code already exists"
+        )
+    return warehouse
@@ -0,0 +1,171 @@
+"""Small in-process TTL cache for expensive read models.
+
+Entries are keyed by hashable values such as an org id and are dropped
+either when their TTL runs out or when a write invalidates them. Services
+announce writes with :func:`notify_on_commit`; caches that depend on the
+data :func:`subscribe` to the topic and are invalidated once the writing
+transaction commits.
+
+Each process holds its own entries, so on PostgreSQL the changes are also
+sent with ``pg_notify`` on :data:`CHANNEL` inside the writing transaction.
+The event listener in :mod:`app.core.events` hands them to
+:func:`apply_remote_change`, which lets other API workers drop their
+entries too, including after writes made by CLI jobs.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Hashable
+from uuid import UUID
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class TTLCache:
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._flights: dict[Hashable, _Flight] = {}
+        # Bumped on invalidation so a load that started earlier is not stored.
+        self._generations: dict[Hashable, int] = defaultdict(int)
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            return self._get_locked(key)
+
+    def _get_locked(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value or load it, single-flight.
+
+        Concurrent misses for the same key wait for the first caller's load
+        instead of running ``loader`` again.
+        """
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not None:
+                return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                generation = self._generations[key]
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None and self._generations[key] == generation:
+                    self._entries[key] = (time.monotonic() + self.ttl_seconds, flight.value)
+            flight.done.set()
+        return flight.value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for key in self._generations:
+                self._generations[key] += 1
+
+
+CHANNEL = "cache_changes"
+
+_subscribers: dict[str, list[Callable[[UUID | None], None]]] = defaultdict(list)
+
+
+def subscribe(topic: str, callback: Callable[[UUID | None], None]) -> None:
+    """Call ``callback(org_id)`` after commits that touched ``topic``.
+
+    ``org_id`` is ``None`` when a write spanned every org.
+    """
+    _subscribers[topic].append(callback)
+
+
+def notify_on_commit(session: Session, topic: str, org_id: UUID | None) -> None:
+    """Record that this transaction changed ``topic`` data for ``org_id``."""
+    if not session.in_transaction():
+        # Begin now so a rollback before the first statement still discards this.
+        session.begin()
+    session.info.setdefault("changed_topics", set()).add((topic, org_id))
+
+
+def _run_subscribers(topic: str, org_id: UUID | None) -> None:
+    for callback in _subscribers.get(topic, ()):
+        callback(org_id)
+
+
+def apply_remote_change(payload: str) -> None:
+    """Invalidate for a change another process announced on :data:`CHANNEL`."""
+    change = json.loads(payload)
+    org_id = change["org_id"]
+    _run_subscribers(change["topic"], UUID(org_id) if org_id else None)
+
+
+def invalidate_all() -> None:
+    """Drop every subscribed cache, e.g. after missing remote changes."""
+    for topic in list(_subscribers):
+        _run_subscribers(topic, None)
+
+
+@event.listens_for(Session, "before_commit")
+def _broadcast_changes(session: Session) -> None:
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    # Flush first: ORM writes announce themselves during flush.
+    session.flush()
+    for topic, org_id in session.info.get("changed_topics", ()):
+        payload = json.dumps({"topic": topic, "org_id": str(org_id) if org_id else None})
+        session.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_changes(session: Session) -> None:
+    # Runs only once the write is visible, so a concurrent reader cannot
+    # cache the pre-commit state again.
+    for topic, org_id in session.info.pop("changed_topics", ()):
+        _run_subscribers(topic, org_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop("changed_topics", None)
@@ -17,6 +17,30 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ADMIN_EMAIL: str
     ADMIN_PASSWORD: str
+    CUTTING_SHEET_WIDTH: float = 6000
+    CUTTING_SHEET_HEIGHT: float = 3210
+    CUTTING_KERF: float = 2
+    CUTTING_EDGE_TRIM: float = 15
+    CUTTING_CHUNK_SIZE: int = 2000
+    PRODUCTION_WORKER_MODE: str = "thread"
+    PRODUCTION_WORKER_CONCURRENCY: int = 4
+    PRODUCTION_CLAIM_BATCH: int = 10
+    PRODUCTION_CLAIM_TIMEOUT_SECONDS: int = 900
+    PRODUCTION_JOB_MAX_ATTEMPTS: int = 3
+    PRODUCTION_WORKDAYS: list[int] = [0, 1, 2, 3, 4, 5]
+    PRODUCTION_PLANNING_HORIZON_DAYS: int = 180
+    AR_SUMMARY_CACHE_TTL_SECONDS: int = 300
+    LEADERBOARD_WINDOWS: list[int] = [30, 90, 365]
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30
+    DASHBOARD_WORKERS: int = 4
+    EVENTS_KEEPALIVE_SECONDS: int = 15
+    AR_ALLOCATION_BATCH_SIZE: int = 200
+    INVOICE_NUMBER_PREFIX: str = "FTR"
+    INVOICE_RUN_WORKERS: int = 4
+    STOCK_SNAPSHOT_KEEP_DAILY_DAYS: int = 90
+    STOCK_RESERVATION_MAX_ATTEMPTS: int = 5
+    VALUATION_CHUNK_SIZE: int = 5000
+    MRP_CACHE_TTL_SECONDS: int = 300
 
     @model_validator(mode="after")
     def _ensure_postgres(self) -> "Settings":
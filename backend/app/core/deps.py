@@ -65,26 +65,19 @@ def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
-def get_current_org(
-    x_org_slug: str | None = Header(None), db: Session = Depends(get_db)
-) -> Organization:
-    slug = x_org_slug or "default"
-    org = db.query(Organization).filter(Organization.slug == slug).first()
+def _org_by_slug(db: Session, slug: str | None) -> Organization:
+    org = db.query(Organization).filter(Organization.slug == (slug or "default")).first()
     if not org:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="org_not_found")
     return org
 
 
-def get_current_user_in_org(
-    current_user: User = Depends(get_current_user),
-    current_org: Organization = Depends(get_current_org),
-    db: Session = Depends(get_db),
-) -> User:
+def _require_membership(db: Session, user: User, org: Organization) -> User:
     membership = (
         db.query(UserOrganization)
         .filter(
-            UserOrganization.user_id == current_user.id,
-            UserOrganization.org_id == current_org.id,
+            UserOrganization.user_id == user.id,
+            UserOrganization.org_id == org.id,
         )
         .first()
     )
@@ -92,7 +85,37 @@ def get_current_user_in_org(
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
         )
-    return current_user
+    return user
+
+
+def get_current_org(
+    x_org_slug: str | None = Header(None), db: Session = Depends(get_db)
+) -> Organization:
+    return _org_by_slug(db, x_org_slug)
+
+
+def get_current_user_in_org(
+    current_user: User = Depends(get_current_user),
+    current_org: Organization = Depends(get_current_org),
+    db: Session = Depends(get_db),
+) -> User:
+    return _require_membership(db, current_user, current_org)
+
+
+def get_stream_org(
+    org: str | None = Query(None), db: Session = Depends(get_db)
+) -> Organization:
+    return _org_by_slug(db, org)
+
+
+def get_stream_user_in_org(
+    token: str = Query(...),
+    current_org: Organization = Depends(get_stream_org),
+    db: Session = Depends(get_db),
+) -> User:
+    """Like :func:`get_current_user_in_org` for ``EventSource`` clients, which
+    cannot set headers and pass ``?token=...&org=...`` instead."""
+    return _require_membership(db, get_current_user(token, db), current_org)
 
 
 def get_pagination(
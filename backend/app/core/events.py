@@ -0,0 +1,191 @@
+"""Per-org live events for the ``/events`` Server-Sent Events stream.
+
+Services call :func:`publish` inside their write transaction. On PostgreSQL
+the events go out with ``pg_notify`` as part of that transaction, so they
+are delivered only if it commits. Each process then runs one ``LISTEN``
+connection that relays them to its own SSE subscribers, no matter how many
+uvicorn workers are running. Other dialects (the SQLite test database)
+deliver in-process after commit.
+
+The same connection also listens for cache changes (see
+:mod:`app.core.cache`), so API processes start it at startup rather than on
+the first SSE subscriber.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core import cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "app_events"
+
+# Cache topics (see app.core.cache) mapped to the dashboard sections they change.
+DASHBOARD_SECTIONS = {
+    "orders": ("sales", "top_customers"),
+    "ar": ("ar",),
+    "stock": ("stock",),
+}
+
+
+@dataclass(eq=False)
+class Subscription:
+    org_id: str
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=100))
+
+
+def _put(queue: asyncio.Queue, item: dict) -> None:
+    if queue.full():
+        # A slow client loses its oldest event rather than stalling the others.
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+
+class EventBroker:
+    """Fans events out to this process's subscribers, keyed by org."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._listener: threading.Thread | None = None
+
+    def subscribe(self, org_id: UUID, loop: asyncio.AbstractEventLoop | None = None) -> Subscription:
+        sub = Subscription(str(org_id), loop or asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(sub.org_id, set()).add(sub)
+        self._ensure_listener()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.org_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.org_id]
+
+    def dispatch(self, item: dict) -> None:
+        """Hand ``item`` to every subscriber of its org; safe from any thread."""
+        with self._lock:
+            subs = list(self._subscribers.get(item["org_id"], ()))
+        for sub in subs:
+            sub.loop.call_soon_threadsafe(_put, sub.queue, item)
+
+    def start_listener(self) -> None:
+        """Start relaying notifications now instead of on the first subscriber."""
+        self._ensure_listener()
+
+    def _ensure_listener(self) -> None:
+        if make_url(settings.DATABASE_URL).get_backend_name() != "postgresql":
+            return
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._listener = threading.Thread(
+                target=self._listen, name="event-listener", daemon=True
+            )
+        self._listener.start()
+
+    def _listen(self) -> None:
+        import psycopg
+
+        url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+        conninfo = url.render_as_string(hide_password=False)
+        try:
+            while True:
+                try:
+                    with psycopg.connect(conninfo, autocommit=True) as conn:
+                        conn.execute(f"LISTEN {CHANNEL}")
+                        conn.execute(f"LISTEN {cache.CHANNEL}")
+                        # Changes made while disconnected were never heard.
+                        cache.invalidate_all()
+                        for notify in conn.notifies():
+                            try:
+                                if notify.channel == cache.CHANNEL:
+                                    cache.apply_remote_change(notify.payload)
+                                else:
+                                    self.dispatch(json.loads(notify.payload))
+                            except Exception:
+                                # One bad payload or subscriber must not end the relay.
+                                logger.exception("dropping event %r", notify.payload)
+                except psycopg.Error:
+                    logger.exception("event listener lost its connection; reconnecting")
+                    time.sleep(1)
+        except Exception:
+            logger.exception("event listener stopped")
+            raise
+        finally:
+            # Let the next subscriber start a fresh listener.
+            with self._lock:
+                self._listener = None
+
+
+broker = EventBroker()
+
+
+def publish(session: Session, org_id: UUID, type: str, data: dict[str, Any]) -> None:
+    """Queue an event for ``org_id`` to go out when ``session`` commits.
+
+    Keep ``data`` small: NOTIFY payloads are capped at 8000 bytes.
+    """
+    if not session.in_transaction():
+        session.begin()
+    session.info.setdefault("events", []).append(
+        {"org_id": str(org_id), "type": type, "data": data}
+    )
+
+
+def _dashboard_events(session: Session) -> list[dict]:
+    sections: dict[str, set[str]] = {}
+    for topic, org_id in session.info.get("changed_topics", ()):
+        if org_id is not None and topic in DASHBOARD_SECTIONS:
+            sections.setdefault(str(org_id), set()).update(DASHBOARD_SECTIONS[topic])
+    return [
+        {"org_id": org_id, "type": "dashboard", "data": {"sections": sorted(names)}}
+        for org_id, names in sections.items()
+    ]
+
+
+@event.listens_for(Session, "before_commit")
+def _send_events(session: Session) -> None:
+    # before_commit runs ahead of the final flush; flush now so ORM writes
+    # that announce themselves during flush are included.
+    session.flush()
+    events = session.info.pop("events", []) + _dashboard_events(session)
+    if not events:
+        return
+    if session.get_bind().dialect.name == "postgresql":
+        for item in events:
+            session.execute(select(func.pg_notify(CHANNEL, json.dumps(item, default=str))))
+    else:
+        session.info["events_after_commit"] = events
+
+
+@event.listens_for(Session, "after_commit")
+def _deliver_local_events(session: Session) -> None:
+    for item in session.info.pop("events_after_commit", ()):
+        broker.dispatch(json.loads(json.dumps(item, default=str)))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_events(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop("events", None)
+        session.info.pop("events_after_commit", None)
+
+
+def format_sse(item: dict) -> str:
+    return f"event: {item['type']}\ndata: {json.dumps(item['data'], default=str)}\n\n"
@@ -0,0 +1,28 @@
+"""Opaque cursors for keyset-paginated list endpoints.
+
+A cursor is the sort key of the last row on a page, base64-encoded so
+clients treat it as a token rather than something to build by hand.
+"""
+
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    raw = json.dumps([sort_value.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor(cursor) from exc
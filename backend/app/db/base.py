@@ -8,8 +8,18 @@ from app.models import (
     product,
     partner,
     order,
+    quote,
     user,
     organization,
     user_org,
     finance,
+    production_job,
+    production_line,
+    warehouse,
+    remnant,
+    rollup,
+    invoice,
+    ar,
+    stock,
+    sequence,
 )  # noqa: E402,F401
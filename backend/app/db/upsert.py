@@ -0,0 +1,10 @@
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def upsert(db: Session, table: Table):
+    """``INSERT`` construct with ``on_conflict_do_*`` for the session's dialect."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
@@ -0,0 +1,37 @@
+"""Apply AR payments and refunds to open invoices; schedule every few minutes.
+
+    python -m app.jobs.allocate_ar_payments [--org default] [--full]
+
+Safe to run while another instance is running.
+"""
+
+import argparse
+
+from app.db import session as db_session
+from app.models.organization import Organization
+from app.services.ar_allocation_service import run_allocation
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Allocate AR payments to invoices.")
+    parser.add_argument("--org", help="organization slug; all orgs when omitted")
+    parser.add_argument("--full", action="store_true", help="revisit every partner")
+    args = parser.parse_args()
+
+    with db_session.SessionLocal() as db:
+        orgs = db.query(Organization)
+        if args.org:
+            orgs = orgs.filter(Organization.slug == args.org)
+        orgs = orgs.all()
+        if args.org and not orgs:
+            raise SystemExit(f"organization {args.org!r} not found")
+        for org in orgs:
+            result = run_allocation(db, org.id, args.full)
+            print(
+                f"{org.slug}: {result['allocations']} allocations, {result['amount']} "
+                f"across {result['partners']} partners"
+            )
+
+
+if __name__ == "__main__":
+    main()
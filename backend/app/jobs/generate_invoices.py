@@ -0,0 +1,54 @@
+"""Invoice the confirmed orders of a month; schedule on the 1st of each month.
+
+    python -m app.jobs.generate_invoices --org default [--period 2026-09] [--issue-date 2026-09-30] [--workers 4] [--force]
+
+``--period`` defaults to last month. Run it again for the same period to
+resume after a crash; already invoiced orders are skipped. A run whose
+process was killed stays ``RUNNING``; resume it with ``--force``.
+"""
+
+import argparse
+from datetime import date, datetime, timedelta, timezone
+
+from app.db import session as db_session
+from app.models.organization import Organization
+from app.services.invoice_service import InvoiceServiceError, generate_invoices
+
+
+def _month(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate month-end invoices.")
+    parser.add_argument("--org", required=True, help="organization slug")
+    parser.add_argument("--period", type=_month, help="month as YYYY-MM (default: last month)")
+    parser.add_argument("--issue-date", type=date.fromisoformat, help="default: period end")
+    parser.add_argument("--workers", type=int, help="worker processes")
+    parser.add_argument(
+        "--force", action="store_true", help="take over a run left RUNNING by a dead process"
+    )
+    args = parser.parse_args()
+
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    period_start = args.period or (this_month - timedelta(days=1)).replace(day=1)
+    period_end = (period_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+    with db_session.SessionLocal() as db:
+        org = db.query(Organization).filter(Organization.slug == args.org).first()
+        if not org:
+            raise SystemExit(f"organization {args.org!r} not found")
+        try:
+            run = generate_invoices(
+                db, org.id, period_start, period_end, args.issue_date, args.workers, args.force
+            )
+        except InvoiceServiceError as exc:
+            raise SystemExit(f"{period_start:%Y-%m}: {exc}") from None
+    print(
+        f"{period_start:%Y-%m}: {run.status}, {run.invoices_created} invoices for "
+        f"{run.done_partners}/{run.total_partners} partners"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Rebuild the per-day production load from confirmed orders.
+
+    python -m app.jobs.rebuild_production_load [--org default]
+"""
+
+import argparse
+
+from app.db import session as db_session
+from app.models.organization import Organization
+from app.services.capacity_service import rebuild_production_load
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the production load table.")
+    parser.add_argument("--org", help="organization slug; all orgs when omitted")
+    args = parser.parse_args()
+
+    with db_session.SessionLocal() as db:
+        org_id = None
+        if args.org:
+            org = db.query(Organization).filter(Organization.slug == args.org).first()
+            if not org:
+                raise SystemExit(f"organization {args.org!r} not found")
+            org_id = org.id
+        rows = rebuild_production_load(db, org_id)
+    print(f"rebuilt {rows} load rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Rebuild the daily sales rollups and revenue windows from ``orders``.
+
+    python -m app.jobs.rebuild_sales_rollup [--org default] [--since 2024-01-01]
+"""
+
+import argparse
+from datetime import date
+
+from app.db import session as db_session
+from app.models.organization import Organization
+from app.services.rollup_service import rebuild_sales_rollup
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild daily sales rollups.")
+    parser.add_argument("--org", help="organization slug; all orgs when omitted")
+    parser.add_argument("--since", type=date.fromisoformat, help="first day to rebuild")
+    args = parser.parse_args()
+
+    with db_session.SessionLocal() as db:
+        org_id = None
+        if args.org:
+            org = db.query(Organization).filter(Organization.slug == args.org).first()
+            if not org:
+                raise SystemExit(f"organization {args.org!r} not found")
+            org_id = org.id
+        rows = rebuild_sales_rollup(db, org_id, args.since)
+    print(f"rebuilt {rows} rollup rows")
+
+
+if __name__ == "__main__":
+    main()
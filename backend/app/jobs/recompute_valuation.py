@@ -0,0 +1,33 @@
+"""Rebuild FIFO cost layers and stock values from the movement history.
+
+    python -m app.jobs.recompute_valuation [--org default] [--chunk-size 5000]
+
+Run once after migrating to backfill existing stock, or to repair values.
+"""
+
+import argparse
+
+from app.db import session as db_session
+from app.models.organization import Organization
+from app.services.valuation_service import recompute_valuation
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute inventory valuation.")
+    parser.add_argument("--org", help="organization slug; all orgs when omitted")
+    parser.add_argument("--chunk-size", type=int, help="movements read per chunk")
+    args = parser.parse_args()
+
+    with db_session.SessionLocal() as db:
+        org_id = None
+        if args.org:
+            org = db.query(Organization).filter(Organization.slug == args.org).first()
+            if not org:
+                raise SystemExit(f"organization {args.org!r} not found")
+            org_id = org.id
+        replayed = recompute_valuation(db, org_id, args.chunk_size)
+    print(f"replayed {replayed} movements")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Check balance snapshots and current balances against the transactions.
+
+    python -m app.jobs.reconcile_account_balances [--org default] [--dry-run]
+
+Snapshot drift is repaired by rebuilding the snapshots; a ``current_balance``
+that disagrees with the transactions is only reported, since it needs a
+person to decide which side is wrong.
+"""
+
+import argparse
+
+from app.db import session as db_session
+from app.models.organization import Organization
+from app.services.account_balance_service import find_snapshot_drift, rebuild_snapshots
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconcile account balances.")
+    parser.add_argument("--org", help="organization slug; all orgs when omitted")
+    parser.add_argument("--dry-run", action="store_true", help="report drift only")
+    args = parser.parse_args()
+
+    with db_session.SessionLocal() as db:
+        org_id = None
+        if args.org:
+            org = db.query(Organization).filter(Organization.slug == args.org).first()
+            if not org:
+                raise SystemExit(f"organization {args.org!r} not found")
+            org_id = org.id
+        drift = find_snapshot_drift(db, org_id)
+        for row in drift:
+            where = row["snapshot_date"] or "current_balance"
+            print(
+                f"drift account={row['account_id']} at={where} "
+                f"stored={row['stored']} expected={row['expected']}"
+            )
+        if any(row["snapshot_date"] for row in drift) and not args.dry_run:
+            rows = rebuild_snapshots(db, org_id)
+            print(f"rebuilt {rows} snapshot rows")
+        elif not drift:
+            print("balances match transactions")
+
+
+if __name__ == "__main__":
+    main()
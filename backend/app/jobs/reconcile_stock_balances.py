@@ -0,0 +1,40 @@
+"""Check ``stock_balances`` against ``stock_movements`` and rebuild on drift.
+
+    python -m app.jobs.reconcile_stock_balances [--org default] [--dry-run]
+"""
+
+import argparse
+
+from app.db import session as db_session
+from app.models.organization import Organization
+from app.services.stock_service import find_balance_drift, rebuild_stock_balances
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconcile stock balances.")
+    parser.add_argument("--org", help="organization slug; all orgs when omitted")
+    parser.add_argument("--dry-run", action="store_true", help="report drift only")
+    args = parser.parse_args()
+
+    with db_session.SessionLocal() as db:
+        org_id = None
+        if args.org:
+            org = db.query(Organization).filter(Organization.slug == args.org).first()
+            if not org:
+                raise SystemExit(f"organization {args.org!r} not found")
+            org_id = org.id
+        drift = find_balance_drift(db, org_id)
+        for row in drift:
+            print(
+                f"drift product={row['product_id']} warehouse={row['warehouse_id']} "
+                f"stored={row['stored']} expected={row['expected']}"
+            )
+        if drift and not args.dry_run:
+            rows = rebuild_stock_balances(db, org_id)
+            print(f"rebuilt {rows} balance rows")
+        elif not drift:
+            print("balances match movements")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Slide the customer revenue windows forward; schedule once a day.
+
+    python -m app.jobs.refresh_leaderboards [--org default]
+"""
+
+import argparse
+
+from app.db import session as db_session
+from app.models.organization import Organization
+from app.services.rollup_service import refresh_revenue_windows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh customer revenue windows.")
+    parser.add_argument("--org", help="organization slug; all orgs when omitted")
+    args = parser.parse_args()
+
+    with db_session.SessionLocal() as db:
+        org_id = None
+        if args.org:
+            org = db.query(Organization).filter(Organization.slug == args.org).first()
+            if not org:
+                raise SystemExit(f"organization {args.org!r} not found")
+            org_id = org.id
+        rows = refresh_revenue_windows(db, org_id)
+    print(f"refreshed {rows} revenue window rows")
+
+
+if __name__ == "__main__":
+    main()
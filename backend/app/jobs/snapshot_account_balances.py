@@ -0,0 +1,39 @@
+"""Write month-end account balance snapshots; schedule on the 1st of each month.
+
+    python -m app.jobs.snapshot_account_balances [--org default] [--through 2026-09-30] [--rebuild]
+
+The first run backfills every account's history. ``--rebuild`` drops the
+existing snapshots and recomputes them from the transactions.
+"""
+
+import argparse
+from datetime import date
+
+from app.db import session as db_session
+from app.models.organization import Organization
+from app.services.account_balance_service import rebuild_snapshots, take_snapshots
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Snapshot account balances.")
+    parser.add_argument("--org", help="organization slug; all orgs when omitted")
+    parser.add_argument(
+        "--through", type=date.fromisoformat, help="last day to cover (default: last month end)"
+    )
+    parser.add_argument("--rebuild", action="store_true", help="recompute all snapshots")
+    args = parser.parse_args()
+
+    with db_session.SessionLocal() as db:
+        org_id = None
+        if args.org:
+            org = db.query(Organization).filter(Organization.slug == args.org).first()
+            if not org:
+                raise SystemExit(f"organization {args.org!r} not found")
+            org_id = org.id
+        write = rebuild_snapshots if args.rebuild else take_snapshots
+        rows = write(db, org_id, args.through)
+    print(f"wrote {rows} snapshot rows")
+
+
+if __name__ == "__main__":
+    main()
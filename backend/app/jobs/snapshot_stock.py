@@ -0,0 +1,44 @@
+"""Snapshot stock on hand per product and warehouse; schedule daily after midnight UTC.
+
+    python -m app.jobs.snapshot_stock [--org default] [--through 2026-10-18] [--compact]
+
+The first run backfills every pair's history. ``--compact`` then thins
+snapshots older than ``STOCK_SNAPSHOT_KEEP_DAILY_DAYS`` to one per month.
+"""
+
+import argparse
+from datetime import date
+
+from app.db import session as db_session
+from app.models.organization import Organization
+from app.services.stock_snapshot_service import compact_stock_snapshots, take_stock_snapshots
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Snapshot stock on hand.")
+    parser.add_argument("--org", help="organization slug; all orgs when omitted")
+    parser.add_argument(
+        "--through", type=date.fromisoformat, help="last day to cover (default: yesterday)"
+    )
+    parser.add_argument("--compact", action="store_true", help="also compact old snapshots")
+    parser.add_argument(
+        "--keep-days", type=int, help="days of daily snapshots to keep when compacting"
+    )
+    args = parser.parse_args()
+
+    with db_session.SessionLocal() as db:
+        org_id = None
+        if args.org:
+            org = db.query(Organization).filter(Organization.slug == args.org).first()
+            if not org:
+                raise SystemExit(f"organization {args.org!r} not found")
+            org_id = org.id
+        rows = take_stock_snapshots(db, org_id, args.through)
+        print(f"wrote {rows} snapshot rows")
+        if args.compact:
+            removed = compact_stock_snapshots(db, org_id, args.keep_days)
+            print(f"compacted {removed} snapshot rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,17 @@ from app.api.products import router as products_router
 from app.api.categories import router as categories_router
 from app.api.partners import router as partners_router
 from app.api.orders import router as orders_router
+from app.api.quotes import router as quotes_router
 from app.api.dashboard import router as dashboard_router
+from app.api.events import router as events_router
 from app.api.finance import router as finance_router
+from app.api.production import router as production_router
+from app.api.remnants import router as remnants_router
+from app.api.stock import router as stock_router
+from app.api.warehouses import router as warehouses_router
 from app.core.security import hash_password
 from app.core.config import settings
+from app.core.events import broker
 from app.db.session import SessionLocal
 from app.models.user import User
 from app.models.organization import Organization
@@ -63,6 +70,8 @@ def startup_event():
         )
         db.commit()
 
+    broker.start_listener()
+
 
 app.include_router(auth_router)
 app.include_router(health_router)
@@ -71,5 +80,11 @@ app.include_router(products_router)
 app.include_router(categories_router)
 app.include_router(partners_router)
 app.include_router(orders_router)
+app.include_router(quotes_router)
 app.include_router(dashboard_router)
+app.include_router(events_router)
 app.include_router(finance_router)
+app.include_router(production_router)
+app.include_router(remnants_router)
+app.include_router(warehouses_router)
+app.include_router(stock_router)
@@ -0,0 +1,93 @@
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Numeric,
+    Text,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class ArEntry(Base):
+    __tablename__ = "ar_entries"
+    __table_args__ = (
+        Index("ix_ar_entries_partner", "partner_id"),
+        # Covers the aging query: partition/order columns plus the summed values.
+        Index(
+            "ix_ar_entries_aging",
+            "organization_id",
+            "partner_id",
+            "entry_date",
+            "id",
+            postgresql_include=["type", "amount"],
+        ),
+        CheckConstraint(
+            "type IN ('INVOICE','PAYMENT','REFUND','ADJUSTMENT')", name="chk_ar_entry_type"
+        ),
+        CheckConstraint("amount >= 0", name="chk_ar_entry_amount_nonneg"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="RESTRICT"), nullable=False
+    )
+    partner_id = Column(
+        UUID(as_uuid=True), ForeignKey("partners.id", ondelete="RESTRICT"), nullable=False
+    )
+    invoice_id = Column(
+        UUID(as_uuid=True), ForeignKey("sales_invoices.id", ondelete="SET NULL"), nullable=True
+    )
+    entry_date = Column(Date, nullable=False, server_default=func.current_date())
+    type = Column(Text, nullable=False)
+    amount = Column(Numeric(14, 2), nullable=False)
+    currency = Column(Text, nullable=False, server_default=text("'TRY'"))
+    note = Column(Text, nullable=True)
+    created_at_utc = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class ArAllocation(Base):
+    __tablename__ = "ar_allocations"
+    __table_args__ = (
+        Index("ix_ar_allocations_invoice", "invoice_id"),
+        Index("ix_ar_allocations_entry", "entry_id"),
+        CheckConstraint("amount > 0", name="chk_ar_allocation_amount_positive"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    entry_id = Column(
+        UUID(as_uuid=True), ForeignKey("ar_entries.id", ondelete="CASCADE"), nullable=False
+    )
+    invoice_id = Column(
+        UUID(as_uuid=True), ForeignKey("sales_invoices.id", ondelete="CASCADE"), nullable=False
+    )
+    amount = Column(Numeric(14, 2), nullable=False)
+
+
+class ArAllocationPending(Base):
+    """Partner with AR entries written since its last allocation.
+
+    Marked in the transaction that writes the entries, so it becomes visible
+    exactly when they do. ``version`` grows on every re-mark; a run only
+    clears the mark it read, so entries committed mid-run keep theirs.
+    """
+
+    __tablename__ = "ar_allocation_pending"
+
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True
+    )
+    partner_id = Column(
+        UUID(as_uuid=True), ForeignKey("partners.id", ondelete="CASCADE"), primary_key=True
+    )
+    version = Column(BigInteger, nullable=False, server_default=text("1"))
+    marked_at_utc = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,4 +1,15 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Numeric, Text, CheckConstraint, text
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Numeric,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.db.base import Base
@@ -23,6 +34,17 @@ class FinancialTransaction(Base):
     __tablename__ = "financial_transactions"
     __table_args__ = (
         CheckConstraint("direction IN ('IN','OUT')", name="chk_fin_tx_direction"),
+        # Keyset paging walks (transaction_date, id) within an org, account or partner.
+        Index("ix_fin_tx_org_date", "organization_id", "transaction_date", "id"),
+        Index("ix_fin_tx_account_date", "account_id", "transaction_date", "id"),
+        Index("ix_fin_tx_partner_date", "partner_id", "transaction_date", "id"),
+        # Rows arrive roughly in date order, so a BRIN index keeps wide date
+        # range scans cheap at a fraction of a B-tree's size.
+        Index("ix_fin_tx_date_brin", "transaction_date", postgresql_using="brin"),
+        # One row per imported statement line; re-imports skip what is booked.
+        Index(
+            "uq_fin_tx_statement_line", "account_id", "statement_fingerprint", unique=True
+        ),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
@@ -43,3 +65,20 @@ class FinancialTransaction(Base):
     transaction_date = Column(DateTime(timezone=True), nullable=False)
     description = Column(Text, nullable=True)
     method = Column(Text, nullable=False)
+    statement_fingerprint = Column(Text, nullable=True)
+
+
+class AccountBalanceSnapshot(Base):
+    """An account's balance at the end of ``snapshot_date`` (a UTC month end)."""
+
+    __tablename__ = "account_balance_snapshots"
+
+    account_id = Column(
+        UUID(as_uuid=True), ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True
+    )
+    snapshot_date = Column(Date, primary_key=True)
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
+    )
+    balance = Column(Numeric(14, 2), nullable=False)
+    updated_at_utc = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,123 @@
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class SalesInvoice(Base):
+    __tablename__ = "sales_invoices"
+    __table_args__ = (
+        Index("ix_sales_invoices_partner", "partner_id"),
+        UniqueConstraint("organization_id", "number", name="uq_sales_invoices_org_number"),
+        # An order is billed at most once; cancelling the invoice frees it.
+        Index(
+            "uq_sales_invoices_order",
+            "order_id",
+            unique=True,
+            postgresql_where=text("status <> 'CANCELLED'"),
+        ),
+        CheckConstraint(
+            "status IN ('DRAFT','ISSUED','PAID','CANCELLED')",
+            name="chk_sales_invoice_status",
+        ),
+        CheckConstraint(
+            "discount_rate >= 0 AND discount_rate <= 100",
+            name="chk_sales_invoice_discount_rate",
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="RESTRICT"), nullable=False
+    )
+    number = Column(Text, nullable=False)
+    partner_id = Column(
+        UUID(as_uuid=True), ForeignKey("partners.id", ondelete="RESTRICT"), nullable=False
+    )
+    order_id = Column(
+        UUID(as_uuid=True), ForeignKey("orders.id", ondelete="SET NULL"), nullable=True
+    )
+    currency = Column(Text, nullable=False, server_default=text("'TRY'"))
+    status = Column(Text, nullable=False, server_default=text("'DRAFT'"))
+    issue_date = Column(Date, nullable=False, server_default=func.current_date())
+    notes = Column(Text, nullable=True)
+    discount_rate = Column(Numeric(5, 2), nullable=False, server_default=text("0"))
+    subtotal = Column(Numeric(14, 2), nullable=False, server_default=text("0"))
+    tax_total = Column(Numeric(14, 2), nullable=False, server_default=text("0"))
+    grand_total = Column(Numeric(14, 2), nullable=False, server_default=text("0"))
+    created_at_utc = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class SalesInvoiceItem(Base):
+    __tablename__ = "sales_invoice_items"
+    __table_args__ = (
+        Index("ix_sales_invoice_items_invoice", "invoice_id"),
+        CheckConstraint("quantity > 0", name="chk_sales_invoice_item_quantity_positive"),
+        CheckConstraint("unit_price >= 0", name="chk_sales_invoice_item_unit_price_nonneg"),
+        CheckConstraint(
+            "line_discount_rate >= 0 AND line_discount_rate <= 100",
+            name="chk_sales_invoice_item_discount_rate",
+        ),
+        CheckConstraint(
+            "tax_rate >= 0 AND tax_rate <= 100",
+            name="chk_sales_invoice_item_tax_rate",
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    invoice_id = Column(
+        UUID(as_uuid=True), ForeignKey("sales_invoices.id", ondelete="CASCADE"), nullable=False
+    )
+    product_id = Column(
+        UUID(as_uuid=True), ForeignKey("products.id", ondelete="RESTRICT"), nullable=False
+    )
+    description = Column(Text, nullable=True)
+    quantity = Column(Numeric(14, 3), nullable=False)
+    unit_price = Column(Numeric(14, 2), nullable=False)
+    line_discount_rate = Column(Numeric(5, 2), nullable=False, server_default=text("0"))
+    tax_rate = Column(Numeric(5, 2), nullable=False, server_default=text("20"))
+    line_subtotal = Column(Numeric(14, 2), nullable=False, server_default=text("0"))
+    line_tax = Column(Numeric(14, 2), nullable=False, server_default=text("0"))
+    line_total = Column(Numeric(14, 2), nullable=False, server_default=text("0"))
+
+
+class InvoiceRun(Base):
+    """Progress of one org's month-end invoicing for a period."""
+
+    __tablename__ = "invoice_runs"
+    __table_args__ = (
+        UniqueConstraint(
+            "organization_id", "period_start", "period_end", name="uq_invoice_runs_period"
+        ),
+        CheckConstraint("status IN ('RUNNING','DONE','FAILED')", name="chk_invoice_run_status"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
+    )
+    period_start = Column(Date, nullable=False)
+    period_end = Column(Date, nullable=False)
+    issue_date = Column(Date, nullable=False)
+    status = Column(Text, nullable=False, server_default=text("'RUNNING'"))
+    total_partners = Column(Integer, nullable=False, server_default=text("0"))
+    done_partners = Column(Integer, nullable=False, server_default=text("0"))
+    invoices_created = Column(Integer, nullable=False, server_default=text("0"))
+    error = Column(Text, nullable=True)
+    started_at_utc = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    finished_at_utc = Column(DateTime(timezone=True), nullable=True)
@@ -5,6 +5,7 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Index,
+    Integer,
     Numeric,
     Text,
     func,
@@ -37,11 +38,19 @@ class Order(Base):
     project_name = Column(Text, nullable=True)
     delivery_date = Column(Date, nullable=True)
     status = Column(Text, nullable=False, server_default=text("'TEKLIF'"))
+    # Copied onto the order's production jobs; higher is claimed first.
+    priority = Column(Integer, nullable=False, server_default=text("0"))
     discount_rate = Column(Numeric(5, 2), nullable=False, server_default=text("0"))
     subtotal = Column(Numeric(14, 2), nullable=False, server_default=text("0"))
     tax_total = Column(Numeric(14, 2), nullable=False, server_default=text("0"))
     grand_total = Column(Numeric(14, 2), nullable=False, server_default=text("0"))
     notes = Column(Text, nullable=True)
+    quote_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("quotes.id", ondelete="SET NULL"),
+        nullable=True,
+        unique=True,
+    )
     created_at_utc = Column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -26,3 +26,4 @@ class Partner(Base):
     email = Column(CITEXT(), nullable=True)
     address = Column(Text, nullable=True)
     tax_number = Column(Text, nullable=True)
+    iban = Column(Text, nullable=True)
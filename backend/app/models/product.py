@@ -17,3 +17,4 @@ class Product(Base):
         UUID(as_uuid=True), ForeignKey("categories.id", ondelete="RESTRICT"), nullable=False
     )
     base_price_sqm = Column(Numeric(12, 2), nullable=False, server_default=text("0"))
+    restock_level = Column(Numeric(14, 3), nullable=False, server_default=text("0"))
@@ -1,4 +1,16 @@
-from sqlalchemy import CheckConstraint, Column, DateTime, ForeignKey, Numeric, func, text
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -9,13 +21,44 @@ class ProductionJob(Base):
     __tablename__ = "production_jobs"
     __table_args__ = (
         CheckConstraint("quantity_required > 0", name="chk_production_job_qty_positive"),
+        CheckConstraint(
+            "status IN ('PENDING','CLAIMED','DONE','FAILED','CANCELLED')",
+            name="chk_production_job_status",
+        ),
+        Index(
+            "ix_production_jobs_queue",
+            "organization_id",
+            text("priority DESC"),
+            "due_date",
+            "created_at_utc",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+        Index(
+            "ix_production_jobs_finished",
+            "organization_id",
+            "finished_at_utc",
+            postgresql_where=text("status = 'DONE'"),
+            sqlite_where=text("status = 'DONE'"),
+        ),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="RESTRICT"), nullable=False
+    )
     order_item_id = Column(
         UUID(as_uuid=True), ForeignKey("order_items.id", ondelete="CASCADE"), nullable=False
     )
     quantity_required = Column(Numeric(14, 3), nullable=False)
+    status = Column(Text, nullable=False, server_default=text("'PENDING'"))
+    priority = Column(Integer, nullable=False, server_default=text("0"))
+    due_date = Column(Date, nullable=True)
+    claimed_by = Column(Text, nullable=True)
+    claimed_at_utc = Column(DateTime(timezone=True), nullable=True)
+    finished_at_utc = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, server_default=text("0"))
+    last_error = Column(Text, nullable=True)
     created_at_utc = Column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -0,0 +1,53 @@
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Integer,
+    Numeric,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class ProductionLine(Base):
+    """A line on the plant floor and the glass area (m²) it finishes per day."""
+
+    __tablename__ = "production_lines"
+    __table_args__ = (
+        UniqueConstraint("organization_id", "name", name="uq_production_lines_org_name"),
+        CheckConstraint("capacity_sqm_per_day > 0", name="chk_production_line_capacity_positive"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="RESTRICT"), nullable=False
+    )
+    name = Column(Text, nullable=False)
+    capacity_sqm_per_day = Column(Numeric(12, 3), nullable=False)
+    is_active = Column(Boolean, nullable=False, server_default=text("true"))
+    created_at_utc = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class ProductionLoad(Base):
+    """Confirmed order area per org and delivery date, maintained on every order write."""
+
+    __tablename__ = "production_load"
+
+    organization_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    load_date = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, server_default=text("0"))
+    area = Column(Numeric(16, 3), nullable=False, server_default=text("0"))
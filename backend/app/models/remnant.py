@@ -0,0 +1,61 @@
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Numeric,
+    Text,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class Remnant(Base):
+    """Reusable offcut of a glass sheet.
+
+    ``width`` is always the long side and ``height`` the short side, so a
+    pane fits when ``width >= long side`` and ``height >= short side``.
+    """
+
+    __tablename__ = "remnants"
+    __table_args__ = (
+        CheckConstraint("width >= height AND height > 0", name="chk_remnant_dims"),
+        CheckConstraint(
+            "status IN ('AVAILABLE','RESERVED','CONSUMED')",
+            name="chk_remnant_status",
+        ),
+        Index(
+            "ix_remnants_fit",
+            "organization_id",
+            "product_id",
+            text("(width * height)"),
+            "width",
+            postgresql_where=text("status = 'AVAILABLE'"),
+            sqlite_where=text("status = 'AVAILABLE'"),
+        ),
+        Index("ix_remnants_job", "production_job_id"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="RESTRICT"), nullable=False
+    )
+    product_id = Column(
+        UUID(as_uuid=True), ForeignKey("products.id", ondelete="RESTRICT"), nullable=False
+    )
+    warehouse_id = Column(
+        UUID(as_uuid=True), ForeignKey("warehouses.id", ondelete="RESTRICT"), nullable=False
+    )
+    width = Column(Numeric(14, 2), nullable=False)
+    height = Column(Numeric(14, 2), nullable=False)
+    status = Column(Text, nullable=False, server_default=text("'AVAILABLE'"))
+    production_job_id = Column(
+        UUID(as_uuid=True), ForeignKey("production_jobs.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at_utc = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, Numeric, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class DailySalesRollup(Base):
+    """Confirmed sales per org and order day, maintained on every order write."""
+
+    __tablename__ = "daily_sales_rollup"
+
+    organization_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, server_default=text("0"))
+    total = Column(Numeric(16, 2), nullable=False, server_default=text("0"))
+
+
+class PartnerDailyRevenue(Base):
+    """Confirmed sales per partner and order day; the source for leaderboards."""
+
+    __tablename__ = "partner_daily_revenue"
+
+    organization_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    partner_id = Column(
+        UUID(as_uuid=True), ForeignKey("partners.id", ondelete="CASCADE"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, server_default=text("0"))
+    total = Column(Numeric(16, 2), nullable=False, server_default=text("0"))
+
+
+class CustomerRevenueWindow(Base):
+    """Partner revenue over the last ``window_days`` days, ranked by its index."""
+
+    __tablename__ = "customer_revenue_windows"
+    __table_args__ = (
+        Index(
+            "ix_customer_revenue_windows_rank",
+            "organization_id",
+            "window_days",
+            text("revenue DESC"),
+        ),
+    )
+
+    organization_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    window_days = Column(Integer, primary_key=True)
+    partner_id = Column(
+        UUID(as_uuid=True), ForeignKey("partners.id", ondelete="CASCADE"), primary_key=True
+    )
+    order_count = Column(Integer, nullable=False, server_default=text("0"))
+    revenue = Column(Numeric(16, 2), nullable=False, server_default=text("0"))
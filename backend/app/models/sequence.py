@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, Column, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class DocumentSequence(Base):
+    """Per-org document number counter, e.g. ``invoice:2026``."""
+
+    __tablename__ = "document_sequences"
+
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True
+    )
+    name = Column(Text, primary_key=True)
+    # The next number to hand out.
+    next_value = Column(BigInteger, nullable=False)
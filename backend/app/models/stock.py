@@ -0,0 +1,183 @@
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    Text,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class StockMovement(Base):
+    __tablename__ = "stock_movements"
+    __table_args__ = (
+        Index("ix_stock_movements_prod", "product_id"),
+        Index("ix_stock_movements_wh", "warehouse_id"),
+        Index("ix_stock_movements_pair_created", "product_id", "warehouse_id", "created_at_utc"),
+        CheckConstraint("direction IN ('IN','OUT')", name="chk_direction"),
+        CheckConstraint("quantity > 0", name="chk_quantity_positive"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    product_id = Column(
+        UUID(as_uuid=True), ForeignKey("products.id", ondelete="RESTRICT"), nullable=False
+    )
+    warehouse_id = Column(
+        UUID(as_uuid=True), ForeignKey("warehouses.id", ondelete="RESTRICT"), nullable=False
+    )
+    direction = Column(Text, nullable=False)
+    quantity = Column(Numeric(14, 3), nullable=False)
+    # Purchase cost per unit of an IN; OUTs are costed by the valuation engine.
+    unit_cost = Column(Numeric(14, 4), nullable=True)
+    reason = Column(Text, nullable=True)
+    document_no = Column(Text, nullable=True)
+    created_at_utc = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class StockBalance(Base):
+    """On-hand quantity per product and warehouse, kept in step with movements.
+
+    ``restock_level`` is copied from the product so the low-stock partial
+    index can answer alerts without touching ``products``.
+    ``reserved_quantity`` is held by confirmed orders; every write bumps
+    ``version`` so reservations can update the row optimistically.
+    ``fifo_value`` and ``average_value`` are the stock's value under each
+    costing method, kept by the valuation engine.
+    """
+
+    __tablename__ = "stock_balances"
+    __table_args__ = (
+        Index(
+            "ix_stock_balances_low",
+            "organization_id",
+            "product_id",
+            "warehouse_id",
+            postgresql_include=["quantity", "restock_level"],
+            postgresql_where=text("quantity < restock_level"),
+            sqlite_where=text("quantity < restock_level"),
+        ),
+    )
+
+    product_id = Column(
+        UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    warehouse_id = Column(
+        UUID(as_uuid=True), ForeignKey("warehouses.id", ondelete="CASCADE"), primary_key=True
+    )
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
+    )
+    quantity = Column(Numeric(14, 3), nullable=False, server_default=text("0"))
+    restock_level = Column(Numeric(14, 3), nullable=False, server_default=text("0"))
+    reserved_quantity = Column(Numeric(14, 3), nullable=False, server_default=text("0"))
+    version = Column(Integer, nullable=False, server_default=text("0"))
+    fifo_value = Column(Numeric(16, 4), nullable=False, server_default=text("0"))
+    average_value = Column(Numeric(16, 4), nullable=False, server_default=text("0"))
+    updated_at_utc = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class StockSnapshot(Base):
+    """On-hand quantity of a product in a warehouse at the end of ``snapshot_date`` (UTC).
+
+    Written for every day a pair moved; older days are compacted to the last
+    snapshot of each month.
+    """
+
+    __tablename__ = "stock_snapshots"
+    __table_args__ = (Index("ix_stock_snapshots_org_date", "organization_id", "snapshot_date"),)
+
+    product_id = Column(
+        UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    warehouse_id = Column(
+        UUID(as_uuid=True), ForeignKey("warehouses.id", ondelete="CASCADE"), primary_key=True
+    )
+    snapshot_date = Column(Date, primary_key=True)
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
+    )
+    quantity = Column(Numeric(14, 3), nullable=False)
+    updated_at_utc = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class StockReservation(Base):
+    """Stock (m²) held in one warehouse for a confirmed order line."""
+
+    __tablename__ = "stock_reservations"
+    __table_args__ = (
+        Index("ix_stock_reservations_order", "order_id"),
+        Index("ix_stock_reservations_pair", "product_id", "warehouse_id"),
+        CheckConstraint("quantity > 0", name="chk_stock_reservation_quantity_positive"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
+    )
+    order_id = Column(
+        UUID(as_uuid=True), ForeignKey("orders.id", ondelete="CASCADE"), nullable=False
+    )
+    order_item_id = Column(
+        UUID(as_uuid=True), ForeignKey("order_items.id", ondelete="CASCADE"), nullable=False
+    )
+    product_id = Column(
+        UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False
+    )
+    warehouse_id = Column(
+        UUID(as_uuid=True), ForeignKey("warehouses.id", ondelete="CASCADE"), nullable=False
+    )
+    quantity = Column(Numeric(14, 3), nullable=False)
+    created_at_utc = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class StockCostLayer(Base):
+    """A receipt's quantity still unsold under FIFO, at its unit cost.
+
+    Layers are consumed oldest first, by ``(received_at_utc, sequence)``.
+    """
+
+    __tablename__ = "stock_cost_layers"
+    __table_args__ = (
+        Index(
+            "ix_stock_cost_layers_open",
+            "product_id",
+            "warehouse_id",
+            "received_at_utc",
+            "sequence",
+            postgresql_where=text("remaining_quantity > 0"),
+            sqlite_where=text("remaining_quantity > 0"),
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    organization_id = Column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
+    )
+    product_id = Column(
+        UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False
+    )
+    warehouse_id = Column(
+        UUID(as_uuid=True), ForeignKey("warehouses.id", ondelete="CASCADE"), nullable=False
+    )
+    movement_id = Column(
+        UUID(as_uuid=True), ForeignKey("stock_movements.id", ondelete="CASCADE"), nullable=False
+    )
+    received_at_utc = Column(DateTime(timezone=True), nullable=False)
+    sequence = Column(Integer, nullable=False)
+    quantity = Column(Numeric(14, 3), nullable=False)
+    remaining_quantity = Column(Numeric(14, 3), nullable=False)
+    unit_cost = Column(Numeric(14, 4), nullable=False)
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Literal
 from uuid import UUID
@@ -43,3 +43,41 @@ class FinancialTransactionPublic(FinancialTransactionBase):
     organization_id: UUID
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class StatementLinePublic(BaseModel):
+    line: int
+    transaction_date: date
+    amount: Decimal
+    description: str
+    counterparty_name: str | None
+    counterparty_iban: str | None
+    counterparty_tax_number: str | None
+    reference: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StatementImportResult(BaseModel):
+    account_id: UUID
+    imported: int
+    matched_orders: int
+    net_amount: Decimal
+    balance: Decimal
+    unmatched: list[StatementLinePublic]
+    duplicates: list[StatementLinePublic] = []
+
+
+class FinancialTransactionPage(BaseModel):
+    items: list[FinancialTransactionPublic]
+    next_cursor: str | None
+
+
+class AccountBalanceAsOf(AccountBase):
+    id: UUID
+    balance: Decimal
+
+
+class AccountBalancesResponse(BaseModel):
+    as_of: date
+    items: list[AccountBalanceAsOf]
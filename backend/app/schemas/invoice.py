@@ -0,0 +1,20 @@
+from datetime import date, datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class InvoiceRunPublic(BaseModel):
+    id: UUID
+    period_start: date
+    period_end: date
+    issue_date: date
+    status: str
+    total_partners: int
+    done_partners: int
+    invoices_created: int
+    error: str | None
+    started_at_utc: datetime
+    finished_at_utc: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
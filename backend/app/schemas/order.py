@@ -1,11 +1,14 @@
 from datetime import date, datetime
 from decimal import Decimal
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas.common import PageMeta
 
+OrderStatus = Literal["TEKLIF", "SIPARIS", "IPTAL"]
+
 
 class OrderItemBase(BaseModel):
     product_id: UUID
@@ -22,11 +25,16 @@ class OrderItemCreate(OrderItemBase):
     pass
 
 
+class OrderItemUpdate(OrderItemBase):
+    id: UUID | None = None
+
+
 class OrderBase(BaseModel):
     partner_id: UUID
     project_name: str | None = None
     delivery_date: date | None = None
     status: str | None = "TEKLIF"
+    priority: int = Field(0, ge=0, le=100)
     discount_rate: Decimal = Field(0, ge=0, le=100)
     notes: str | None = None
     items: list[OrderItemCreate]
@@ -39,14 +47,32 @@ class OrderCreate(OrderBase):
 class OrderUpdate(BaseModel):
     project_name: str | None = None
     delivery_date: date | None = None
-    status: str | None = None
+    priority: int | None = Field(None, ge=0, le=100)
     discount_rate: Decimal | None = Field(None, ge=0, le=100)
     notes: str | None = None
-    items: list[OrderItemCreate] | None = None
+    items: list[OrderItemUpdate] | None = None
 
 
 class OrderStatusUpdate(BaseModel):
-    status: str
+    status: OrderStatus
+
+
+class OrderBulkStatusUpdate(BaseModel):
+    order_ids: list[UUID] = Field(..., min_length=1, max_length=1000)
+    status: OrderStatus
+
+
+class StockShortage(BaseModel):
+    order_item_id: UUID
+    product_id: UUID
+    missing: Decimal
+
+
+class OrderBulkStatusResult(BaseModel):
+    status: OrderStatus
+    updated: list[UUID]
+    skipped: list[UUID]
+    shortages: list[StockShortage] = []
 
 
 class OrderItemPublic(BaseModel):
@@ -74,11 +100,13 @@ class OrderPublic(BaseModel):
     project_name: str | None
     delivery_date: date | None
     status: str
+    priority: int = 0
     discount_rate: Decimal
     subtotal: Decimal
     tax_total: Decimal
     grand_total: Decimal
     notes: str | None
+    quote_id: UUID | None = None
     created_at_utc: datetime
     items: list[OrderItemPublic]
 
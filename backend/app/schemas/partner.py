@@ -14,6 +14,7 @@ class PartnerBase(BaseModel):
     email: EmailStr | None = None
     address: str | None = None
     tax_number: str | None = None
+    iban: str | None = Field(None, max_length=34)
 
 
 class PartnerCreate(PartnerBase):
@@ -28,6 +29,7 @@ class PartnerUpdate(BaseModel):
     email: EmailStr | None = None
     address: str | None = None
     tax_number: str | None = None
+    iban: str | None = Field(None, max_length=34)
 
 
 class PartnerPublic(BaseModel):
@@ -40,6 +42,7 @@ class PartnerPublic(BaseModel):
     email: EmailStr | None
     address: str | None
     tax_number: str | None
+    iban: str | None
 
     model_config = ConfigDict(from_attributes=True)
 
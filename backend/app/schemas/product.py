@@ -11,6 +11,7 @@ class ProductBase(BaseModel):
     sku: str = Field(..., pattern=r"^[A-Za-z0-9_-]{3,40}$")
     category_id: UUID
     base_price_sqm: Decimal = Field(..., ge=0)
+    restock_level: Decimal = Field(Decimal("0"), ge=0)
 
 
 class ProductCreate(ProductBase):
@@ -22,6 +23,7 @@ class ProductUpdate(BaseModel):
     sku: str | None = Field(None, pattern=r"^[A-Za-z0-9_-]{3,40}$")
     category_id: UUID | None = None
     base_price_sqm: Decimal | None = Field(None, ge=0)
+    restock_level: Decimal | None = Field(None, ge=0)
 
 
 class ProductPublic(BaseModel):
@@ -31,6 +33,7 @@ class ProductPublic(BaseModel):
     sku: str
     category_id: UUID
     base_price_sqm: Decimal
+    restock_level: Decimal
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -0,0 +1,116 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class CuttingPlanRequest(BaseModel):
+    product_id: UUID | None = None
+    sheet_width: float | None = Field(None, gt=0)
+    sheet_height: float | None = Field(None, gt=0)
+    kerf: float | None = Field(None, ge=0)
+    edge_trim: float | None = Field(None, ge=0)
+    allow_rotation: bool = True
+
+
+class CutPiece(BaseModel):
+    job_id: UUID
+    order_item_id: UUID
+    width: float
+    height: float
+
+
+class CutPlacement(CutPiece):
+    x: float
+    y: float
+    rotated: bool
+
+
+class CutSheet(BaseModel):
+    product_id: UUID
+    yield_pct: float
+    placements: list[CutPlacement]
+
+
+class CuttingPlanPublic(BaseModel):
+    sheet_width: float
+    sheet_height: float
+    kerf: float
+    edge_trim: float
+    sheet_count: int
+    piece_count: int
+    yield_pct: float
+    sheets: list[CutSheet]
+    unplaced: list[CutPiece]
+
+
+class ProductionJobClaim(BaseModel):
+    station: str = Field(..., min_length=1, max_length=80)
+    limit: int = Field(1, ge=1, le=100)
+
+
+class ProductionJobComplete(BaseModel):
+    station: str = Field(..., min_length=1, max_length=80)
+    success: bool = True
+    error: str | None = None
+
+
+class ProductionJobPublic(BaseModel):
+    id: UUID
+    order_item_id: UUID
+    quantity_required: Decimal
+    status: Literal["PENDING", "CLAIMED", "DONE", "FAILED", "CANCELLED"]
+    priority: int
+    due_date: date | None
+    claimed_by: str | None
+    claimed_at_utc: datetime | None
+    finished_at_utc: datetime | None
+    attempts: int
+    last_error: str | None
+    created_at_utc: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductionLineCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=80)
+    capacity_sqm_per_day: Decimal = Field(..., gt=0)
+    is_active: bool = True
+
+
+class ProductionLineUpdate(BaseModel):
+    name: str | None = Field(None, min_length=1, max_length=80)
+    capacity_sqm_per_day: Decimal | None = Field(None, gt=0)
+    is_active: bool | None = None
+
+
+class ProductionLinePublic(BaseModel):
+    id: UUID
+    name: str
+    capacity_sqm_per_day: Decimal
+    is_active: bool
+    created_at_utc: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CapacityDay(BaseModel):
+    date: date
+    capacity: Decimal
+    booked: Decimal
+    order_count: int
+    free: Decimal
+    overbooked: bool
+
+
+class CapacityPlan(BaseModel):
+    daily_capacity: Decimal
+    overbooked_days: list[date]
+    days: list[CapacityDay]
+
+
+class CapacitySuggestion(BaseModel):
+    area: Decimal
+    earliest_date: date
@@ -0,0 +1,33 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.common import PageMeta
+
+
+class RemnantCreate(BaseModel):
+    product_id: UUID
+    warehouse_id: UUID
+    width: Decimal = Field(..., gt=0)
+    height: Decimal = Field(..., gt=0)
+
+
+class RemnantPublic(BaseModel):
+    id: UUID
+    organization_id: UUID
+    product_id: UUID
+    warehouse_id: UUID
+    width: Decimal
+    height: Decimal
+    status: Literal["AVAILABLE", "RESERVED", "CONSUMED"]
+    production_job_id: UUID | None
+    created_at_utc: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RemnantListResponse(PageMeta):
+    items: list[RemnantPublic]
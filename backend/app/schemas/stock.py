@@ -0,0 +1,110 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.common import PageMeta
+
+
+class WarehouseCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=80)
+    code: str | None = Field(None, pattern=r"^[A-Za-z0-9_-]{2,20}$")
+
+
+class WarehousePublic(BaseModel):
+    id: UUID
+    organization_id: UUID
+    name: str
+    code: str | None
+    is_active: bool
+    created_at_utc: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WarehouseListResponse(PageMeta):
+    items: list[WarehousePublic]
+
+
+class StockMovementCreate(BaseModel):
+    product_id: UUID
+    warehouse_id: UUID
+    direction: Literal["IN", "OUT"]
+    quantity: Decimal = Field(..., gt=0)
+    unit_cost: Decimal | None = Field(None, ge=0)
+    reason: str | None = None
+    document_no: str | None = None
+
+
+class StockMovementBatch(BaseModel):
+    movements: list[StockMovementCreate] = Field(..., min_length=1, max_length=5000)
+
+
+class StockBalancePublic(BaseModel):
+    product_id: UUID
+    warehouse_id: UUID
+    quantity: Decimal
+
+
+class StockMovementBatchResult(BaseModel):
+    recorded: int
+    balances: list[StockBalancePublic]
+
+
+class ProductStockResponse(BaseModel):
+    product_id: UUID
+    total: Decimal
+    warehouses: list[StockBalancePublic]
+
+
+class StockAsOfResponse(BaseModel):
+    as_of: date
+    items: list[StockBalancePublic]
+
+
+class StockAvailabilityPublic(BaseModel):
+    product_id: UUID
+    warehouse_id: UUID
+    quantity: Decimal
+    reserved_quantity: Decimal
+    available: Decimal
+
+
+class ValuationLine(BaseModel):
+    warehouse_id: UUID
+    category_id: UUID
+    quantity: Decimal
+    value: Decimal
+
+
+class ValuationReport(BaseModel):
+    method: Literal["fifo", "average"]
+    total: Decimal
+    items: list[ValuationLine]
+
+
+class MrpWeek(BaseModel):
+    week_start: date | None
+    confirmed: Decimal
+    unreserved: Decimal
+    quoted: Decimal
+    projected_available: Decimal
+    projected_with_quotes: Decimal
+
+
+class MrpProduct(BaseModel):
+    product_id: UUID
+    sku: str
+    name: str
+    on_hand: Decimal
+    reserved: Decimal
+    available: Decimal
+    shortage: bool
+    shortage_week: date | None
+    weeks: list[MrpWeek]
+
+
+class MrpResponse(BaseModel):
+    items: list[MrpProduct]
@@ -0,0 +1,306 @@
+"""Historical account balances from month-end snapshots.
+
+``Account.current_balance`` only holds the balance now. Snapshots record
+each account's balance at the end of every UTC month, so the balance on any
+day is the nearest earlier snapshot plus at most one month of that
+account's transactions.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import bindparam, case, delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.finance import Account, AccountBalanceSnapshot, FinancialTransaction
+from app.services.rollup_service import utc_day_expr
+
+# Rows per multi-row upsert when writing snapshots.
+SNAPSHOT_CHUNK_SIZE = 1000
+
+
+def month_end(day: date) -> date:
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def last_closed_month_end(day: date) -> date:
+    """``day`` if it is a month end, otherwise the end of the previous month."""
+    return day if month_end(day) == day else day.replace(day=1) - timedelta(days=1)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _signed_amount():
+    return case(
+        (FinancialTransaction.direction == "IN", FinancialTransaction.amount),
+        else_=-FinancialTransaction.amount,
+    )
+
+
+def _daily_sums(
+    db: Session,
+    account_ids: Iterable[UUID],
+    through: date | None = None,
+    since: date | None = None,
+) -> dict[UUID, list[tuple[date, Decimal]]]:
+    """Net movement per account and UTC day, in day order."""
+    day = utc_day_expr(db, FinancialTransaction.transaction_date)
+    stmt = (
+        select(FinancialTransaction.account_id, day.label("day"), func.sum(_signed_amount()))
+        .where(FinancialTransaction.account_id.in_(list(account_ids)))
+        .group_by(FinancialTransaction.account_id, day)
+        .order_by(day)
+    )
+    if through is not None:
+        stmt = stmt.where(
+            FinancialTransaction.transaction_date < _day_start(through + timedelta(days=1))
+        )
+    if since is not None:
+        stmt = stmt.where(FinancialTransaction.transaction_date >= _day_start(since))
+    sums: dict[UUID, list[tuple[date, Decimal]]] = defaultdict(list)
+    for account_id, tx_day, amount in db.execute(stmt):
+        sums[account_id].append((tx_day, Decimal(amount)))
+    return sums
+
+
+def _month_ends(
+    days: list[tuple[date, Decimal]], opening: Decimal, first: date, through: date
+) -> list[tuple[date, Decimal]]:
+    """Running balance at every month end from ``first`` to ``through``."""
+    snapshots = []
+    balance, index = opening, 0
+    end = month_end(first)
+    while end <= through:
+        while index < len(days) and days[index][0] <= end:
+            balance += days[index][1]
+            index += 1
+        snapshots.append((end, balance))
+        end = month_end(end + timedelta(days=1))
+    return snapshots
+
+
+def _latest_snapshots(
+    db: Session, account_ids: list[UUID], on_or_before: date | None = None
+) -> dict[UUID, tuple[date, Decimal]]:
+    latest = select(
+        AccountBalanceSnapshot.account_id,
+        func.max(AccountBalanceSnapshot.snapshot_date).label("snapshot_date"),
+    ).where(AccountBalanceSnapshot.account_id.in_(account_ids))
+    if on_or_before is not None:
+        latest = latest.where(AccountBalanceSnapshot.snapshot_date <= on_or_before)
+    latest = latest.group_by(AccountBalanceSnapshot.account_id).subquery()
+    rows = db.execute(
+        select(
+            AccountBalanceSnapshot.account_id,
+            AccountBalanceSnapshot.snapshot_date,
+            AccountBalanceSnapshot.balance,
+        ).join(
+            latest,
+            (AccountBalanceSnapshot.account_id == latest.c.account_id)
+            & (AccountBalanceSnapshot.snapshot_date == latest.c.snapshot_date),
+        )
+    )
+    return {row.account_id: (row.snapshot_date, Decimal(row.balance)) for row in rows}
+
+
+def _accounts(db: Session, org_id: UUID | None, lock: bool = False) -> dict[UUID, UUID]:
+    stmt = select(Account.id, Account.organization_id).order_by(Account.id)
+    if org_id is not None:
+        stmt = stmt.where(Account.organization_id == org_id)
+    if lock:
+        # Postings update the account row first, so holding these locks means
+        # no posting is in flight while the sums are read.
+        stmt = stmt.with_for_update()
+    return {row.id: row.organization_id for row in db.execute(stmt)}
+
+
+def take_snapshots(
+    db: Session, org_id: UUID | None = None, through: date | None = None
+) -> int:
+    """Write month-end snapshots up to ``through`` and return how many.
+
+    Each account continues from its latest snapshot, so a scheduled run only
+    reads the transactions since then; an account without snapshots is
+    backfilled from its first transaction. ``through`` defaults to the end
+    of last month. Commits.
+    """
+    through = last_closed_month_end(through or datetime.now(timezone.utc).date())
+    accounts = _accounts(db, org_id, lock=True)
+    if not accounts:
+        db.commit()
+        return 0
+    latest = _latest_snapshots(db, list(accounts))
+    since = None
+    if len(latest) == len(accounts):
+        since = min(snapshot_date for snapshot_date, _ in latest.values()) + timedelta(days=1)
+    sums = _daily_sums(db, accounts, through, since)
+
+    rows = []
+    for account_id, account_org in accounts.items():
+        if account_id in latest:
+            last_date, opening = latest[account_id]
+            first = last_date + timedelta(days=1)
+        elif sums.get(account_id):
+            opening, first = Decimal("0"), sums[account_id][0][0]
+        else:
+            continue
+        days = [(day, amount) for day, amount in sums.get(account_id, ()) if day >= first]
+        rows.extend(
+            {
+                "account_id": account_id,
+                "snapshot_date": end,
+                "organization_id": account_org,
+                "balance": balance,
+            }
+            for end, balance in _month_ends(days, opening, first, through)
+        )
+
+    for start in range(0, len(rows), SNAPSHOT_CHUNK_SIZE):
+        stmt = upsert(db, AccountBalanceSnapshot.__table__)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["account_id", "snapshot_date"],
+                set_={"balance": stmt.excluded.balance, "updated_at_utc": func.now()},
+            ),
+            rows[start : start + SNAPSHOT_CHUNK_SIZE],
+        )
+    db.commit()
+    return len(rows)
+
+
+def rebuild_snapshots(
+    db: Session, org_id: UUID | None = None, through: date | None = None
+) -> int:
+    """Drop and recompute every snapshot from the transactions. Commits."""
+    scope = []
+    if org_id is not None:
+        scope.append(AccountBalanceSnapshot.organization_id == org_id)
+    db.execute(delete(AccountBalanceSnapshot).where(*scope))
+    return take_snapshots(db, org_id, through)
+
+
+def shift_snapshots(db: Session, account_id: UUID, deltas: dict[date, Decimal]) -> None:
+    """Carry postings (net amount per UTC day) into snapshots taken since.
+
+    Only backdated postings find snapshots to change; otherwise this is a
+    single primary-key probe.
+    """
+    if not deltas:
+        return
+    affected = db.scalars(
+        select(AccountBalanceSnapshot.snapshot_date).where(
+            AccountBalanceSnapshot.account_id == account_id,
+            AccountBalanceSnapshot.snapshot_date >= min(deltas),
+        )
+    ).all()
+    if not affected:
+        return
+    params = [
+        {
+            "day": snapshot_date,
+            "delta": sum(
+                (amount for day, amount in deltas.items() if day <= snapshot_date), Decimal("0")
+            ),
+        }
+        for snapshot_date in affected
+    ]
+    table = AccountBalanceSnapshot.__table__
+    db.execute(
+        update(table)
+        .where(table.c.account_id == account_id, table.c.snapshot_date == bindparam("day"))
+        .values(balance=table.c.balance + bindparam("delta")),
+        params,
+    )
+
+
+def balances_as_of(db: Session, org_id: UUID, day: date) -> dict[UUID, Decimal]:
+    """Every org account's balance at the end of ``day`` (UTC)."""
+    accounts = list(_accounts(db, org_id))
+    if not accounts:
+        return {}
+    snapshots = _latest_snapshots(db, accounts, on_or_before=day)
+    balances = {
+        account_id: snapshots.get(account_id, (None, Decimal("0")))[1] for account_id in accounts
+    }
+    # Accounts share snapshot dates, so this is usually a single delta scan.
+    groups: dict[date | None, list[UUID]] = defaultdict(list)
+    for account_id in accounts:
+        groups[snapshots.get(account_id, (None,))[0]].append(account_id)
+    for snapshot_date, account_ids in groups.items():
+        stmt = (
+            select(FinancialTransaction.account_id, func.sum(_signed_amount()))
+            .where(
+                FinancialTransaction.account_id.in_(account_ids),
+                FinancialTransaction.transaction_date < _day_start(day + timedelta(days=1)),
+            )
+            .group_by(FinancialTransaction.account_id)
+        )
+        if snapshot_date is not None:
+            stmt = stmt.where(
+                FinancialTransaction.transaction_date
+                >= _day_start(snapshot_date + timedelta(days=1))
+            )
+        for account_id, amount in db.execute(stmt):
+            balances[account_id] += Decimal(amount)
+    return balances
+
+
+def find_snapshot_drift(db: Session, org_id: UUID | None = None) -> list[dict]:
+    """Snapshots and current balances that disagree with the transactions.
+
+    ``snapshot_date`` is ``None`` for a mismatched ``current_balance``.
+    """
+    accounts = _accounts(db, org_id)
+    if not accounts:
+        return []
+    sums = _daily_sums(db, accounts)
+    stored: dict[UUID, dict[date, Decimal]] = defaultdict(dict)
+    for row in db.execute(
+        select(
+            AccountBalanceSnapshot.account_id,
+            AccountBalanceSnapshot.snapshot_date,
+            AccountBalanceSnapshot.balance,
+        ).where(AccountBalanceSnapshot.account_id.in_(list(accounts)))
+    ):
+        stored[row.account_id][row.snapshot_date] = Decimal(row.balance)
+    current = dict(
+        db.execute(
+            select(Account.id, Account.current_balance).where(Account.id.in_(list(accounts)))
+        ).all()
+    )
+
+    drift = []
+    for account_id in accounts:
+        days = sums.get(account_id, [])
+        running, index = Decimal("0"), 0
+        for snapshot_date, balance in sorted(stored.get(account_id, {}).items()):
+            while index < len(days) and days[index][0] <= snapshot_date:
+                running += days[index][1]
+                index += 1
+            if running != balance:
+                drift.append(
+                    {
+                        "account_id": account_id,
+                        "snapshot_date": snapshot_date,
+                        "expected": running,
+                        "stored": balance,
+                    }
+                )
+        total = sum((amount for _, amount in days), Decimal("0"))
+        if total != Decimal(current[account_id]):
+            drift.append(
+                {
+                    "account_id": account_id,
+                    "snapshot_date": None,
+                    "expected": total,
+                    "stored": Decimal(current[account_id]),
+                }
+            )
+    return drift
@@ -0,0 +1,196 @@
+"""FIFO allocation of AR payments and refunds to open invoices.
+
+Credits (``PAYMENT``/``REFUND`` entries) are applied to a partner's open
+invoices oldest first, one ``ar_allocations`` row per credit/invoice pair.
+Runs are incremental: writing an AR entry marks its partner in
+``ar_allocation_pending`` in the same transaction, and a run only revisits
+marked partners. What is left to allocate is always derived from the
+existing allocations, so revisiting a partner is harmless.
+Partners are processed in batches, each batch in one transaction holding
+per-partner advisory locks on PostgreSQL so concurrent runs never apply the
+same credit twice.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import delete, event, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.cache import notify_on_commit
+from app.core.config import settings
+from app.db.upsert import upsert
+from app.models.ar import ArAllocation, ArAllocationPending, ArEntry
+from app.models.invoice import SalesInvoice
+from app.services.ar_service import AR_CREDIT_TYPES, AR_DEBIT_TYPES
+
+# Rows per multi-row INSERT into ar_allocations.
+ALLOCATION_CHUNK_SIZE = 1000
+
+
+def _partner_lock_key(partner_id: UUID) -> int:
+    # pg_advisory_xact_lock takes a signed 64-bit key.
+    return int.from_bytes(partner_id.bytes[:8], "big", signed=True)
+
+
+def mark_partners_pending(db: Session, org_id: UUID, partner_ids: Iterable[UUID]) -> None:
+    """Queue ``partner_ids`` for the next allocation run.
+
+    Call in the transaction that writes their AR entries; ORM-added entries
+    are marked automatically on flush.
+    """
+    rows = [{"organization_id": org_id, "partner_id": id} for id in sorted(set(partner_ids))]
+    if not rows:
+        return
+    table = ArAllocationPending.__table__
+    stmt = upsert(db, table).values(rows)
+    db.connection().execute(
+        stmt.on_conflict_do_update(
+            index_elements=["organization_id", "partner_id"],
+            set_={"version": table.c.version + 1, "marked_at_utc": func.now()},
+        )
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_new_entries(session: Session, flush_context) -> None:
+    partners: dict[UUID, set[UUID]] = defaultdict(set)
+    for obj in session.new:
+        if isinstance(obj, ArEntry):
+            partners[obj.organization_id].add(obj.partner_id)
+    for org_id, partner_ids in partners.items():
+        mark_partners_pending(session, org_id, partner_ids)
+
+
+def _applied(column):
+    """Amount already allocated against ``column`` (an invoice or entry id)."""
+    return func.coalesce(
+        select(func.sum(ArAllocation.amount)).where(column).scalar_subquery(), 0
+    )
+
+
+def allocate_partners(db: Session, org_id: UUID, partner_ids) -> tuple[int, Decimal]:
+    """Allocate open credits for ``partner_ids``; returns (rows, amount).
+
+    Runs in the caller's transaction, which must commit to release the locks.
+    """
+    partner_ids = sorted(set(partner_ids))
+    if not partner_ids:
+        return 0, Decimal("0")
+    if db.get_bind().dialect.name == "postgresql":
+        # Sorted, so two runs with overlapping batches cannot deadlock.
+        for partner_id in partner_ids:
+            db.execute(select(func.pg_advisory_xact_lock(_partner_lock_key(partner_id))))
+
+    debits = (
+        select(
+            ArEntry.partner_id,
+            ArEntry.invoice_id,
+            func.min(ArEntry.entry_date).label("entry_date"),
+            func.sum(ArEntry.amount).label("amount"),
+        )
+        .where(
+            ArEntry.organization_id == org_id,
+            ArEntry.partner_id.in_(partner_ids),
+            ArEntry.type.in_(AR_DEBIT_TYPES),
+            ArEntry.invoice_id.is_not(None),
+        )
+        .group_by(ArEntry.partner_id, ArEntry.invoice_id)
+        .subquery()
+    )
+    invoices = db.execute(
+        select(
+            debits.c.partner_id,
+            debits.c.invoice_id,
+            (debits.c.amount - _applied(ArAllocation.invoice_id == debits.c.invoice_id)).label(
+                "open"
+            ),
+        )
+        .join(SalesInvoice, SalesInvoice.id == debits.c.invoice_id)
+        .where(SalesInvoice.status != "CANCELLED")
+        .order_by(debits.c.entry_date, debits.c.invoice_id)
+    ).all()
+    credits = db.execute(
+        select(
+            ArEntry.id,
+            ArEntry.partner_id,
+            (ArEntry.amount - _applied(ArAllocation.entry_id == ArEntry.id)).label("open"),
+        )
+        .where(
+            ArEntry.organization_id == org_id,
+            ArEntry.partner_id.in_(partner_ids),
+            ArEntry.type.in_(AR_CREDIT_TYPES),
+        )
+        .order_by(ArEntry.entry_date, ArEntry.id)
+    ).all()
+
+    open_invoices: dict[UUID, list[list]] = {}
+    for row in invoices:
+        if Decimal(row.open) > 0:
+            open_invoices.setdefault(row.partner_id, []).append([row.invoice_id, Decimal(row.open)])
+
+    rows = []
+    total = Decimal("0")
+    for credit in credits:
+        remaining = Decimal(credit.open)
+        queue = open_invoices.get(credit.partner_id)
+        while remaining > 0 and queue:
+            invoice = queue[0]
+            amount = min(remaining, invoice[1])
+            rows.append({"entry_id": credit.id, "invoice_id": invoice[0], "amount": amount})
+            total += amount
+            remaining -= amount
+            invoice[1] -= amount
+            if invoice[1] == 0:
+                queue.pop(0)
+
+    for start in range(0, len(rows), ALLOCATION_CHUNK_SIZE):
+        db.execute(insert(ArAllocation), rows[start : start + ALLOCATION_CHUNK_SIZE])
+    if rows:
+        notify_on_commit(db, "ar", org_id)
+    return len(rows), total
+
+
+def run_allocation(db: Session, org_id: UUID, full: bool = False) -> dict:
+    """Allocate for every partner marked pending since it was last allocated.
+
+    ``full`` revisits every partner with AR entries. Each batch clears the
+    marks it read in the same transaction as its allocations, so a partner
+    re-marked by a write that commits during the run is picked up next time.
+    Commits per batch.
+    """
+    marks = dict(
+        db.execute(
+            select(ArAllocationPending.partner_id, ArAllocationPending.version).where(
+                ArAllocationPending.organization_id == org_id
+            )
+        ).all()
+    )
+    if full:
+        partner_ids = sorted(
+            db.scalars(
+                select(ArEntry.partner_id).where(ArEntry.organization_id == org_id).distinct()
+            )
+        )
+    else:
+        partner_ids = sorted(marks)
+
+    allocations, amount = 0, Decimal("0")
+    batch_size = settings.AR_ALLOCATION_BATCH_SIZE
+    for start in range(0, len(partner_ids), batch_size):
+        batch = partner_ids[start : start + batch_size]
+        rows, total = allocate_partners(db, org_id, batch)
+        read = [(id, marks[id]) for id in batch if id in marks]
+        if read:
+            db.execute(
+                delete(ArAllocationPending).where(
+                    ArAllocationPending.organization_id == org_id,
+                    tuple_(ArAllocationPending.partner_id, ArAllocationPending.version).in_(read),
+                )
+            )
+        db.commit()
+        allocations += rows
+        amount += total
+    return {"partners": len(partner_ids), "allocations": allocations, "amount": amount}
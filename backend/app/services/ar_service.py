@@ -0,0 +1,139 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import case, event, func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache, notify_on_commit, subscribe
+from app.core.config import settings
+from app.models.ar import ArAllocation, ArEntry
+
+# Entry types that raise the receivable; every other type settles it.
+AR_DEBIT_TYPES = ("INVOICE", "ADJUSTMENT")
+AR_CREDIT_TYPES = ("PAYMENT", "REFUND")
+
+AGING_BUCKETS = ("0_30", "31_60", "61_90", "90_plus")
+
+_CENT = Decimal("0.01")
+
+ar_summary_cache = TTLCache(settings.AR_SUMMARY_CACHE_TTL_SECONDS)
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(_CENT)
+
+
+def compute_ar_summary(db: Session, org_id: UUID, today: date) -> dict:
+    """Open balance and aging for one org in a single windowed pass over ``ar_entries``.
+
+    Credits settle a partner's oldest debits first, so what is still open is
+    made of the newest debits: walking them newest first, a debit is open for
+    whatever part of the partner balance the newer debits have not used up.
+    Each open amount is then bucketed by the age of its entry date.
+
+    ``open_total`` is the sum of the open amounts, so it always equals the
+    sum of the aging buckets. Partners who have paid more than they owe hold
+    no open debits; their net credit is reported apart as ``credit_total``.
+    """
+    debit = case((ArEntry.type.in_(AR_DEBIT_TYPES), ArEntry.amount), else_=0)
+    signed = case((ArEntry.type.in_(AR_DEBIT_TYPES), ArEntry.amount), else_=-ArEntry.amount)
+    entries = (
+        select(
+            ArEntry.entry_date,
+            signed.label("signed"),
+            debit.label("debit"),
+            func.sum(signed).over(partition_by=ArEntry.partner_id).label("balance"),
+            func.sum(debit)
+            .over(
+                partition_by=ArEntry.partner_id,
+                order_by=(ArEntry.entry_date.desc(), ArEntry.id.desc()),
+                rows=(None, 0),
+            )
+            .label("newer_debits"),
+        )
+        .where(ArEntry.organization_id == org_id)
+        .subquery()
+    )
+    remaining = entries.c.balance - entries.c.newer_debits + entries.c.debit
+    open_amount = case(
+        (remaining <= 0, 0),
+        (remaining >= entries.c.debit, entries.c.debit),
+        else_=remaining,
+    )
+    d30, d60, d90 = (today - timedelta(days=days) for days in (30, 60, 90))
+    age = entries.c.entry_date
+    row = db.execute(
+        select(
+            func.sum(open_amount).label("open_total"),
+            func.sum(case((entries.c.balance < 0, -entries.c.signed), else_=0)).label(
+                "credit_total"
+            ),
+            func.sum(case((age >= d30, open_amount), else_=0)).label("0_30"),
+            func.sum(case(((age < d30) & (age >= d60), open_amount), else_=0)).label("31_60"),
+            func.sum(case(((age < d60) & (age >= d90), open_amount), else_=0)).label("61_90"),
+            func.sum(case((age < d90, open_amount), else_=0)).label("90_plus"),
+        )
+    ).one()
+    return {
+        "as_of": today,
+        "open_total": _money(row.open_total),
+        "credit_total": _money(row.credit_total),
+        "aging": {bucket: _money(row._mapping[bucket]) for bucket in AGING_BUCKETS},
+    }
+
+
+def get_ar_summary(db: Session, org_id: UUID, today: date | None = None) -> dict:
+    """Cached :func:`compute_ar_summary`; AR writes invalidate the org's entry.
+
+    Concurrent misses share one computation, as on the dashboard.
+    """
+    today = today or datetime.utcnow().date()
+
+    def load() -> dict:
+        return compute_ar_summary(db, org_id, today)
+
+    summary = ar_summary_cache.get_or_set(org_id, load)
+    if summary["as_of"] != today:
+        # Computed for another day: aging has moved on.
+        ar_summary_cache.invalidate(org_id)
+        summary = ar_summary_cache.get_or_set(org_id, load)
+    return summary
+
+
+def invalidate_ar_summary(org_id: UUID) -> None:
+    """Drop one org's cached summary.
+
+    Writes should prefer ``notify_on_commit(db, "ar", org_id)``, which calls
+    this once the transaction commits; ORM writes to AR rows do so already.
+    """
+    ar_summary_cache.invalidate(org_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_ar_writes(session: Session, flush_context) -> None:
+    orgs: set[UUID] = set()
+    entry_ids: set[UUID] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, ArEntry):
+            orgs.add(obj.organization_id)
+        elif isinstance(obj, ArAllocation):
+            entry_ids.add(obj.entry_id)
+    if entry_ids:
+        orgs.update(
+            session.connection().execute(
+                select(ArEntry.organization_id).where(ArEntry.id.in_(entry_ids))
+            ).scalars()
+        )
+    for org_id in orgs:
+        notify_on_commit(session, "ar", org_id)
+
+
+def _on_ar_change(org_id: UUID | None) -> None:
+    if org_id is None:
+        ar_summary_cache.clear()
+    else:
+        invalidate_ar_summary(org_id)
+
+
+subscribe("ar", _on_ar_change)
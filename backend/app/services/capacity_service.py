@@ -0,0 +1,262 @@
+"""Plant capacity against confirmed order load per delivery date.
+
+Each production line finishes a fixed glass area per working day; the
+plant's capacity on a day is the sum over its active lines. The area
+booked on a day lives in ``production_load``, which order writes keep
+current the way the sales rollups are kept: the writer passes the load an
+order had before and after the change and the difference is upserted in
+the same transaction. Planning reads the table and never scans
+``order_items``; :func:`rebuild_production_load` repairs drift.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Iterable, NamedTuple, Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.order import Order, OrderItem
+from app.models.production_line import ProductionLine, ProductionLoad
+from app.schemas.production import ProductionLineCreate, ProductionLineUpdate
+from app.services.pricing import line_area, line_area_sql
+from app.services.rollup_service import SALES_STATUSES, upsert_counts
+
+
+class CapacityServiceError(Exception):
+    pass
+
+
+class LoadFacts(NamedTuple):
+    """The area an order books on its delivery date."""
+
+    organization_id: UUID
+    load_date: date
+    area: Decimal
+
+
+def order_area(order: Order) -> Decimal:
+    return sum(
+        (line_area(item.width, item.height, item.quantity) for item in order.items),
+        Decimal("0"),
+    )
+
+
+def load_facts_for(order: Order) -> LoadFacts | None:
+    """Load of a confirmed order with a delivery date, else ``None``."""
+    if order.status not in SALES_STATUSES or order.delivery_date is None:
+        return None
+    return LoadFacts(order.organization_id, order.delivery_date, order_area(order))
+
+
+def _line_area_sql():
+    # Rounded per line like :func:`line_area`, so both paths book equal areas.
+    return func.round(line_area_sql(OrderItem.width, OrderItem.height, OrderItem.quantity), 3)
+
+
+def order_loads(db: Session, order_ids: Sequence[UUID]) -> dict[UUID, LoadFacts]:
+    """Load of each order in ``order_ids`` that has a delivery date, in one query.
+
+    The orders' status is not checked; callers know which side of a status
+    change the load belongs to.
+    """
+    if not order_ids:
+        return {}
+    rows = db.execute(
+        select(
+            Order.id,
+            Order.organization_id,
+            Order.delivery_date,
+            func.coalesce(func.sum(_line_area_sql()), 0).label("area"),
+        )
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .where(Order.id.in_(list(order_ids)), Order.delivery_date.is_not(None))
+        .group_by(Order.id, Order.organization_id, Order.delivery_date)
+    )
+    return {
+        row.id: LoadFacts(row.organization_id, row.delivery_date, Decimal(row.area))
+        for row in rows
+    }
+
+
+def apply_load_changes(
+    db: Session, changes: Iterable[tuple[LoadFacts | None, LoadFacts | None]]
+) -> None:
+    """Fold ``(before, after)`` order loads into ``production_load``.
+
+    Call inside the transaction that writes the orders. Deltas are summed per
+    day first, so a bulk change is one multi-row upsert.
+    """
+    deltas: dict[tuple, list] = defaultdict(lambda: [0, Decimal("0")])
+    for before, after in changes:
+        if before == after:
+            continue
+        for facts, sign in ((before, -1), (after, 1)):
+            if facts is not None:
+                row = deltas[(facts.organization_id, facts.load_date)]
+                row[0] += sign
+                row[1] += sign * facts.area
+    upsert_counts(
+        db,
+        ProductionLoad.__table__,
+        ["organization_id", "load_date"],
+        "order_count",
+        "area",
+        deltas,
+    )
+
+
+def rebuild_production_load(db: Session, org_id: UUID | None = None) -> int:
+    """Recompute ``production_load`` from confirmed orders and return the row count."""
+    scope = [Order.status.in_(SALES_STATUSES), Order.delivery_date.is_not(None)]
+    if org_id is not None:
+        scope.append(Order.organization_id == org_id)
+        db.execute(delete(ProductionLoad).where(ProductionLoad.organization_id == org_id))
+    else:
+        db.execute(delete(ProductionLoad))
+    result = db.execute(
+        insert(ProductionLoad).from_select(
+            ["organization_id", "load_date", "order_count", "area"],
+            select(
+                Order.organization_id,
+                Order.delivery_date,
+                func.count(func.distinct(Order.id)),
+                func.coalesce(func.sum(_line_area_sql()), 0),
+            )
+            .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+            .where(*scope)
+            .group_by(Order.organization_id, Order.delivery_date),
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def create_line(db: Session, org_id: UUID, data: ProductionLineCreate) -> ProductionLine:
+    line = ProductionLine(organization_id=org_id, **data.model_dump())
+    db.add(line)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
+    db.refresh(line)
+    return line
+
+
+def list_lines(db: Session, org_id: UUID) -> list[ProductionLine]:
+    return list(
+        db.scalars(
+            select(ProductionLine)
+            .where(ProductionLine.organization_id == org_id)
+            .order_by(ProductionLine.name)
+        )
+    )
+
+
+def update_line(
+    db: Session, org_id: UUID, id: UUID, data: ProductionLineUpdate
+) -> ProductionLine | None:
+    line = db.scalars(
+        select(ProductionLine).where(
+            ProductionLine.id == id, ProductionLine.organization_id == org_id
+        )
+    ).first()
+    if line is None:
+        return None
+    for field, value in data.model_dump(exclude_unset=True).items():
+        setattr(line, field, value)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
+    db.refresh(line)
+    return line
+
+
+def daily_capacity(db: Session, org_id: UUID) -> Decimal:
+    """m² the org's active lines finish on one working day."""
+    return Decimal(
+        db.scalar(
+            select(func.coalesce(func.sum(ProductionLine.capacity_sqm_per_day), 0)).where(
+                ProductionLine.organization_id == org_id, ProductionLine.is_active.is_(True)
+            )
+        )
+    )
+
+
+def _booked(db: Session, org_id: UUID, date_from: date, date_to: date) -> dict[date, tuple]:
+    return {
+        row.load_date: (row.order_count, Decimal(row.area))
+        for row in db.execute(
+            select(ProductionLoad.load_date, ProductionLoad.order_count, ProductionLoad.area).where(
+                ProductionLoad.organization_id == org_id,
+                ProductionLoad.load_date >= date_from,
+                ProductionLoad.load_date <= date_to,
+            )
+        )
+    }
+
+
+def _capacity_on(day: date, capacity: Decimal) -> Decimal:
+    return capacity if day.weekday() in settings.PRODUCTION_WORKDAYS else Decimal("0")
+
+
+def capacity_plan(db: Session, org_id: UUID, date_from: date, date_to: date) -> list[dict]:
+    """Capacity, booked area and headroom for every day in ``date_from..date_to``."""
+    if date_to < date_from:
+        raise CapacityServiceError("invalid_range")
+    if (date_to - date_from).days >= settings.PRODUCTION_PLANNING_HORIZON_DAYS:
+        raise CapacityServiceError("range_too_long")
+    capacity = daily_capacity(db, org_id)
+    booked = _booked(db, org_id, date_from, date_to)
+    days = []
+    for offset in range((date_to - date_from).days + 1):
+        day = date_from + timedelta(days=offset)
+        order_count, area = booked.get(day, (0, Decimal("0")))
+        available = _capacity_on(day, capacity)
+        days.append(
+            {
+                "date": day,
+                "capacity": available,
+                "booked": area,
+                "order_count": order_count,
+                "free": available - area,
+                "overbooked": area > available,
+            }
+        )
+    return days
+
+
+def earliest_feasible_date(
+    db: Session,
+    org_id: UUID,
+    area: Decimal,
+    not_before: date | None = None,
+    exclude: LoadFacts | None = None,
+) -> date:
+    """First working day on or after ``not_before`` with room for ``area`` m².
+
+    ``exclude`` is a load already booked (an order being rescheduled), which
+    is taken off its day before searching. Looks ``PRODUCTION_PLANNING_HORIZON_DAYS``
+    ahead and raises ``CapacityServiceError`` when no day fits.
+    """
+    not_before = not_before or datetime.now(timezone.utc).date()
+    capacity = daily_capacity(db, org_id)
+    if area > capacity:
+        raise CapacityServiceError("exceeds_daily_capacity")
+    last = not_before + timedelta(days=settings.PRODUCTION_PLANNING_HORIZON_DAYS - 1)
+    booked = _booked(db, org_id, not_before, last)
+    for offset in range(settings.PRODUCTION_PLANNING_HORIZON_DAYS):
+        day = not_before + timedelta(days=offset)
+        used = booked.get(day, (0, Decimal("0")))[1]
+        if exclude is not None and exclude.load_date == day:
+            used -= exclude.area
+        if used + area <= _capacity_on(day, capacity):
+            return day
+    raise CapacityServiceError("no_feasible_date")
@@ -1,22 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from decimal import Decimal
-from datetime import date
+from typing import Callable
+from uuid import UUID
+
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache, subscribe
+from app.core.config import settings
+from app.db import session as db_session
+from app.services.ar_service import get_ar_summary
+from app.services.rollup_service import get_daily_sales, get_top_customers
+from app.services.stock_service import get_low_stock
+
+dashboard_cache = TTLCache(settings.DASHBOARD_CACHE_TTL_SECONDS)
 
-def get_sales_summary(db: Session, today: date | None = None) -> dict:
-    return {"today": Decimal("0"), "month": Decimal("0")}
+_executor = ThreadPoolExecutor(
+    max_workers=settings.DASHBOARD_WORKERS, thread_name_prefix="dashboard"
+)
 
 
-def get_ar_summary(db: Session) -> dict:
+def get_sales_summary(db: Session, org_id: UUID, today: date | None = None) -> dict:
+    today = today or datetime.utcnow().date()
+    daily = get_daily_sales(db, org_id, today.replace(day=1), today)
     return {
-        "open_total": Decimal("0"),
-        "aging": {"0_30": Decimal("0"), "31_60": Decimal("0"), "61_90": Decimal("0"), "90_plus": Decimal("0")},
+        "today": daily.get(today, Decimal("0")),
+        "month": sum(daily.values(), Decimal("0")),
+    }
+
+
+def _in_own_session(section: Callable[[Session], object]) -> object:
+    # Sessions are not thread-safe, so every section gets its own.
+    with db_session.SessionLocal() as db:
+        return section(db)
+
+
+def compute_dashboard_summary(org_id: UUID) -> dict:
+    """Build the four dashboard sections concurrently."""
+    sections = {
+        "sales": lambda db: get_sales_summary(db, org_id),
+        "ar": lambda db: get_ar_summary(db, org_id),
+        "stock": lambda db: {"low": get_low_stock(db, org_id)},
+        "top_customers": lambda db: get_top_customers(db, org_id),
     }
+    futures = {name: _executor.submit(_in_own_session, fn) for name, fn in sections.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def get_dashboard_summary(org_id: UUID) -> dict:
+    """Cached per org; concurrent misses share one computation.
+
+    Order, AR and stock writes drop the org's entry when they commit, and the
+    short TTL bounds staleness from anything that does not announce itself.
+    """
+    return dashboard_cache.get_or_set(org_id, lambda: compute_dashboard_summary(org_id))
 
 
-def get_low_stock(db: Session) -> list[dict]:
-    return []
+def _on_change(org_id: UUID | None) -> None:
+    if org_id is None:
+        dashboard_cache.clear()
+    else:
+        dashboard_cache.invalidate(org_id)
 
 
-def get_top_customers(db: Session, limit: int = 5) -> list[dict]:
-    return []
+for _topic in ("orders", "ar", "stock"):
+    subscribe(_topic, _on_change)
@@ -1,57 +1,358 @@
-from uuid import uuid4
+import hashlib
+import re
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
+from typing import Sequence
+from uuid import UUID, uuid4
 
+from sqlalchemy import insert, literal, select, tuple_, update
 from sqlalchemy.orm import Session
 
+from app.core.events import publish
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.upsert import upsert
 from app.models.finance import Account, FinancialTransaction
-from app.models.user import User
-from app.models.user_org import UserOrganization
+from app.models.order import Order
+from app.models.partner import Partner
 from app.schemas.finance import FinancialTransactionCreate
+from app.services.account_balance_service import shift_snapshots
+from app.services.rollup_service import utc_day
+from app.services.statement_parser import StatementLine, normalize_iban
 
 
 class FinanceServiceError(Exception):
     pass
 
 
+# Orders a payment can still be booked against.
+OPEN_ORDER_STATUSES = ("TEKLIF", "SIPARIS")
+
+STATEMENT_METHOD = "STATEMENT"
+
+ORDER_NUMBER_RE = re.compile(r"\b(\d{4}-\d{3,})\b")
+
+# Rows per multi-row INSERT when importing statements.
+IMPORT_CHUNK_SIZE = 1000
+
+TRANSACTION_FIELDS = (
+    "partner_id",
+    "order_id",
+    "direction",
+    "amount",
+    "transaction_date",
+    "description",
+    "method",
+)
+
+
 def record_transaction(
-    db: Session, data: FinancialTransactionCreate, current_user: User
+    db: Session, org_id: UUID, data: FinancialTransactionCreate
 ) -> FinancialTransaction:
-    account = db.query(Account).filter(Account.id == data.account_id).first()
-    if not account:
+    """Insert a transaction and post it to its account's balance.
+
+    The balance moves with ``UPDATE ... SET current_balance = current_balance
+    ± amount`` so concurrent postings to one account never lose an update.
+    On PostgreSQL the update and the insert are a single statement (the
+    update runs in a CTE the insert selects from); elsewhere they are two
+    statements in the same transaction. The account's org check is part of
+    the update's WHERE clause.
+    """
+    delta = data.amount if data.direction == "IN" else -data.amount
+    posted = (
+        update(Account)
+        .where(Account.id == data.account_id, Account.organization_id == org_id)
+        .values(current_balance=Account.current_balance + delta)
+        .returning(Account.id, Account.organization_id)
+    )
+    tx_id = uuid4()
+    values = {"id": tx_id, **{field: getattr(data, field) for field in TRANSACTION_FIELDS}}
+
+    if db.get_bind().dialect.name == "postgresql":
+        account = posted.cte("posted")
+        table = FinancialTransaction.__table__
+        source = select(
+            literal(tx_id, table.c.id.type),
+            account.c.organization_id,
+            account.c.id,
+            *(literal(values[field], table.c[field].type) for field in TRANSACTION_FIELDS),
+        )
+        columns = ["id", "organization_id", "account_id", *TRANSACTION_FIELDS]
+        tx = db.scalars(
+            insert(FinancialTransaction)
+            .from_select(columns, source)
+            .returning(FinancialTransaction)
+        ).first()
+    else:
+        account = db.execute(posted).first()
+        tx = None
+        if account is not None:
+            tx = db.scalars(
+                insert(FinancialTransaction)
+                .values(organization_id=org_id, account_id=account.id, **values)
+                .returning(FinancialTransaction)
+            ).first()
+
+    if tx is None:
+        db.rollback()
         raise FinanceServiceError("account_not_found")
+    shift_snapshots(db, tx.account_id, {utc_day(data.transaction_date): delta})
+    publish(
+        db,
+        org_id,
+        "finance.transaction",
+        {
+            "id": tx.id,
+            "account_id": tx.account_id,
+            "partner_id": tx.partner_id,
+            "direction": tx.direction,
+            "amount": tx.amount,
+        },
+    )
+    db.commit()
+    return tx
+
+
+def list_transactions(
+    db: Session,
+    org_id: UUID,
+    *,
+    account_id: UUID | None = None,
+    partner_id: UUID | None = None,
+    direction: str | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    cursor: str | None = None,
+    limit: int = 50,
+) -> tuple[list[FinancialTransaction], str | None]:
+    """Newest-first page of transactions and the cursor for the next page.
 
-    membership = (
-        db.query(UserOrganization)
-        .filter(
-            UserOrganization.user_id == current_user.id,
-            UserOrganization.org_id == account.organization_id,
+    Pages continue from ``(transaction_date, id)`` of the previous page's
+    last row, so every page costs one index range scan no matter how deep
+    it is. ``date_to`` is inclusive. Raises ``InvalidCursor`` for a cursor
+    this function did not produce.
+    """
+    stmt = select(FinancialTransaction).where(FinancialTransaction.organization_id == org_id)
+    if account_id is not None:
+        stmt = stmt.where(FinancialTransaction.account_id == account_id)
+    if partner_id is not None:
+        stmt = stmt.where(FinancialTransaction.partner_id == partner_id)
+    if direction is not None:
+        stmt = stmt.where(FinancialTransaction.direction == direction)
+    if date_from is not None:
+        stmt = stmt.where(
+            FinancialTransaction.transaction_date
+            >= datetime.combine(date_from, time.min, tzinfo=timezone.utc)
+        )
+    if date_to is not None:
+        stmt = stmt.where(
+            FinancialTransaction.transaction_date
+            < datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        )
+    if cursor is not None:
+        after_date, after_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(FinancialTransaction.transaction_date, FinancialTransaction.id)
+            < (after_date, after_id)
+        )
+    rows = list(
+        db.scalars(
+            stmt.order_by(
+                FinancialTransaction.transaction_date.desc(), FinancialTransaction.id.desc()
+            ).limit(limit + 1)
         )
-        .first()
     )
-    if not membership:
-        raise FinanceServiceError("forbidden")
-
-    tx = FinancialTransaction(
-        id=uuid4(),
-        organization_id=account.organization_id,
-        account_id=data.account_id,
-        partner_id=data.partner_id,
-        order_id=data.order_id,
-        direction=data.direction,
-        amount=data.amount,
-        transaction_date=data.transaction_date,
-        description=data.description,
-        method=data.method,
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].transaction_date, rows[-1].id)
+
+
+def _normalize_name(name: str | None) -> str | None:
+    return " ".join(name.lower().split()) if name else None
+
+
+class _StatementMatcher:
+    """Hash indexes over the org's partners and the orders a statement names.
+
+    Built once per import so each line is matched with a few dict lookups.
+    """
+
+    def __init__(self, db: Session, org_id: UUID, lines: Sequence[StatementLine]):
+        self.by_tax: dict[str, UUID] = {}
+        self.by_iban: dict[str, UUID] = {}
+        self.by_name: dict[str, UUID] = {}
+        for partner in db.execute(
+            select(Partner.id, Partner.tax_number, Partner.iban, Partner.name).where(
+                Partner.organization_id == org_id
+            )
+        ):
+            if partner.tax_number:
+                self.by_tax.setdefault(partner.tax_number.strip(), partner.id)
+            if partner.iban:
+                self.by_iban.setdefault(normalize_iban(partner.iban), partner.id)
+            self.by_name.setdefault(_normalize_name(partner.name), partner.id)
+
+        self.numbers = {line.line: ORDER_NUMBER_RE.findall(line.description) for line in lines}
+        wanted = {number for found in self.numbers.values() for number in found}
+        self.orders: dict[str, tuple[UUID, UUID, Decimal]] = {}
+        wanted_list = list(wanted)
+        for start in range(0, len(wanted_list), IMPORT_CHUNK_SIZE):
+            for order in db.execute(
+                select(Order.number, Order.id, Order.partner_id, Order.grand_total).where(
+                    Order.organization_id == org_id,
+                    Order.status.in_(OPEN_ORDER_STATUSES),
+                    Order.number.in_(wanted_list[start : start + IMPORT_CHUNK_SIZE]),
+                )
+            ):
+                self.orders[order.number] = (order.id, order.partner_id, order.grand_total)
+
+    def match_partner(self, line: StatementLine) -> UUID | None:
+        if line.counterparty_tax_number and line.counterparty_tax_number in self.by_tax:
+            return self.by_tax[line.counterparty_tax_number]
+        if line.counterparty_iban and line.counterparty_iban in self.by_iban:
+            return self.by_iban[line.counterparty_iban]
+        name = _normalize_name(line.counterparty_name)
+        return self.by_name.get(name) if name else None
+
+    def match_order(self, line: StatementLine) -> tuple[UUID, UUID] | None:
+        """The named open order, preferring one whose total equals the amount."""
+        candidates = [self.orders[n] for n in self.numbers[line.line] if n in self.orders]
+        if not candidates:
+            return None
+        amount = abs(line.amount)
+        for order_id, partner_id, total in candidates:
+            if total == amount:
+                return order_id, partner_id
+        order_id, partner_id, _ = candidates[0]
+        return order_id, partner_id
+
+
+def statement_fingerprint(line: StatementLine, occurrence: int) -> str:
+    """Identity of a statement line within its account.
+
+    The bank's reference identifies the line where the format has one, else
+    the description does. ``occurrence`` numbers lines that share the rest
+    of the key within one statement, so genuinely repeated entries are kept.
+    """
+    key = "|".join(
+        (
+            line.transaction_date.isoformat(),
+            str(line.amount.quantize(Decimal("0.01"))),
+            line.reference or line.description or "",
+            str(occurrence),
+        )
     )
+    return hashlib.sha256(key.encode()).hexdigest()
 
-    current_balance = account.current_balance or Decimal("0")
-    if data.direction == "IN":
-        account.current_balance = current_balance + data.amount
-    else:
-        account.current_balance = current_balance - data.amount
 
-    db.add(tx)
-    db.add(account)
+def import_statement(
+    db: Session, org_id: UUID, account_id: UUID, lines: Sequence[StatementLine]
+) -> dict:
+    """Book the matched statement lines as transactions on ``account_id``.
+
+    Lines are matched to a partner by tax number, IBAN or name, and to an
+    open order by an order number in the description. Lines with no partner
+    are returned for manual booking. Each line is stored with its
+    :func:`statement_fingerprint`; lines already booked on the account (an
+    overlapping or repeated import) are skipped and returned as
+    ``duplicates``. Transactions go in with multi-row INSERTs of
+    ``IMPORT_CHUNK_SIZE`` rows, and the account balance moves once by the net
+    amount actually booked. Everything commits together.
+    """
+    account = db.execute(
+        select(Account.id)
+        .where(Account.id == account_id, Account.organization_id == org_id)
+        # Serialises imports into one account, so each sees the other's lines.
+        .with_for_update()
+    ).first()
+    if account is None:
+        db.rollback()
+        raise FinanceServiceError("account_not_found")
+
+    matcher = _StatementMatcher(db, org_id, lines)
+    rows: list[dict] = []
+    booked: dict[str, tuple[StatementLine, bool]] = {}
+    unmatched: list[StatementLine] = []
+    seen: Counter = Counter()
+    for line in lines:
+        if not line.amount:
+            continue
+        key = (line.transaction_date, line.amount, line.reference or line.description or "")
+        seen[key] += 1
+        fingerprint = statement_fingerprint(line, seen[key])
+        order = matcher.match_order(line)
+        partner_id = matcher.match_partner(line) or (order[1] if order else None)
+        if partner_id is None:
+            unmatched.append(line)
+            continue
+        booked[fingerprint] = (line, order is not None)
+        rows.append(
+            {
+                "organization_id": org_id,
+                "account_id": account_id,
+                "partner_id": partner_id,
+                "order_id": order[0] if order else None,
+                "direction": "IN" if line.amount > 0 else "OUT",
+                "amount": abs(line.amount),
+                "transaction_date": datetime.combine(
+                    line.transaction_date, time.min, tzinfo=timezone.utc
+                ),
+                "description": line.description or None,
+                "method": STATEMENT_METHOD,
+                "statement_fingerprint": fingerprint,
+            }
+        )
+
+    table = FinancialTransaction.__table__
+    inserted: set[str] = set()
+    for start in range(0, len(rows), IMPORT_CHUNK_SIZE):
+        stmt = upsert(db, table).values(rows[start : start + IMPORT_CHUNK_SIZE])
+        inserted.update(
+            db.scalars(
+                stmt.on_conflict_do_nothing(
+                    index_elements=["account_id", "statement_fingerprint"]
+                ).returning(table.c.statement_fingerprint)
+            )
+        )
+
+    matched_orders = 0
+    net = Decimal("0")
+    daily: dict[date, Decimal] = defaultdict(Decimal)
+    duplicates: list[StatementLine] = []
+    for fingerprint, (line, has_order) in booked.items():
+        if fingerprint not in inserted:
+            duplicates.append(line)
+            continue
+        matched_orders += has_order
+        net += line.amount
+        daily[line.transaction_date] += line.amount
+
+    balance = db.execute(
+        update(Account)
+        .where(Account.id == account_id)
+        .values(current_balance=Account.current_balance + net)
+        .returning(Account.current_balance)
+    ).scalar_one()
+    shift_snapshots(db, account_id, daily)
+    publish(
+        db,
+        org_id,
+        "finance.statement_imported",
+        {
+            "account_id": account_id,
+            "imported": len(inserted),
+            "unmatched": len(unmatched),
+            "duplicates": len(duplicates),
+        },
+    )
     db.commit()
-    db.refresh(tx)
-    return tx
+    return {
+        "account_id": account_id,
+        "imported": len(inserted),
+        "matched_orders": matched_orders,
+        "net_amount": net,
+        "balance": balance,
+        "unmatched": unmatched,
+        "duplicates": duplicates,
+    }
@@ -0,0 +1,260 @@
+"""Month-end invoicing: one ISSUED invoice per confirmed order in a period.
+
+A run covers an org and a period. Partners are split across a process pool;
+each partner is invoiced in its own transaction that also advances the
+run's progress counters, so a crashed run resumes by simply running the
+same period again: invoiced orders are no longer eligible, and the
+``uq_sales_invoices_order`` index guarantees no order is billed twice.
+Starting a run claims the period's ``invoice_runs`` row with one upsert, so
+a second run for the same period is refused while the first is running.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import Text, exists, func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import notify_on_commit
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.upsert import upsert
+from app.models.ar import ArEntry
+from app.models.invoice import InvoiceRun, SalesInvoice, SalesInvoiceItem
+from app.models.order import Order, OrderItem
+from app.services.ar_allocation_service import mark_partners_pending
+from app.services.rollup_service import SALES_STATUSES
+from app.services.sequence_service import allocate_block
+
+
+class InvoiceServiceError(Exception):
+    pass
+
+
+def invoice_number(year: int, seq: int) -> str:
+    return f"{settings.INVOICE_NUMBER_PREFIX}{year}{seq:09d}"
+
+
+def _in_period(org_id: UUID, period_start: date, period_end: date):
+    return (
+        Order.organization_id == org_id,
+        Order.created_at_utc >= datetime.combine(period_start, time.min, tzinfo=timezone.utc),
+        Order.created_at_utc
+        < datetime.combine(period_end + timedelta(days=1), time.min, tzinfo=timezone.utc),
+    )
+
+
+def _invoiced():
+    return exists().where(SalesInvoice.order_id == Order.id, SalesInvoice.status != "CANCELLED")
+
+
+def _eligible(org_id: UUID, period_start: date, period_end: date):
+    """Confirmed, not yet invoiced orders created in the period."""
+    return (
+        *_in_period(org_id, period_start, period_end),
+        Order.status.in_(SALES_STATUSES),
+        ~_invoiced(),
+    )
+
+
+def invoice_partner(db: Session, run: dict, partner_id: UUID) -> int:
+    """Invoice one partner's eligible orders and record the progress.
+
+    Invoice numbers, invoices, their lines and AR entries commit together,
+    so a failure leaves no gap in the numbering. Commits.
+    """
+    org_id = run["organization_id"]
+    scope = (
+        *_eligible(org_id, run["period_start"], run["period_end"]),
+        Order.partner_id == partner_id,
+    )
+    orders = db.execute(
+        select(
+            Order.id,
+            Order.number,
+            Order.discount_rate,
+            Order.subtotal,
+            Order.tax_total,
+            Order.grand_total,
+        )
+        .where(*scope)
+        .order_by(Order.created_at_utc, Order.number)
+        .with_for_update()
+    ).all()
+    first = 0
+    if orders:
+        # Numbered in the invoices' own transaction, so a failure rolls the
+        # counter back too and the series stays gapless. The counter row is
+        # then held until commit, which serialises partners' inserts.
+        first = allocate_block(db, org_id, f"invoice:{run['issue_date'].year}", len(orders))
+    invoices = [
+        {
+            "id": uuid4(),
+            "organization_id": org_id,
+            "number": invoice_number(run["issue_date"].year, first + i),
+            "partner_id": partner_id,
+            "order_id": order.id,
+            "status": "ISSUED",
+            "issue_date": run["issue_date"],
+            "notes": f"Sipariş {order.number}",
+            "discount_rate": order.discount_rate,
+            "subtotal": order.subtotal,
+            "tax_total": order.tax_total,
+            "grand_total": order.grand_total,
+        }
+        for i, order in enumerate(orders)
+    ]
+    if invoices:
+        db.execute(insert(SalesInvoice), invoices)
+        invoice_ids = [invoice["id"] for invoice in invoices]
+        item_columns = (
+            "product_id",
+            "description",
+            "quantity",
+            "unit_price",
+            "line_discount_rate",
+            "tax_rate",
+            "line_subtotal",
+            "line_tax",
+            "line_total",
+        )
+        db.execute(
+            insert(SalesInvoiceItem).from_select(
+                ["invoice_id", *item_columns],
+                select(SalesInvoice.id, *(getattr(OrderItem, c) for c in item_columns))
+                .join(OrderItem, OrderItem.order_id == SalesInvoice.order_id)
+                .where(SalesInvoice.id.in_(invoice_ids)),
+            )
+        )
+        db.execute(
+            insert(ArEntry).from_select(
+                ["organization_id", "partner_id", "invoice_id", "entry_date", "type", "amount"],
+                select(
+                    SalesInvoice.organization_id,
+                    SalesInvoice.partner_id,
+                    SalesInvoice.id,
+                    SalesInvoice.issue_date,
+                    literal("INVOICE", Text),
+                    SalesInvoice.grand_total,
+                ).where(SalesInvoice.id.in_(invoice_ids)),
+            )
+        )
+        mark_partners_pending(db, org_id, [partner_id])
+        notify_on_commit(db, "ar", org_id)
+    db.execute(
+        update(InvoiceRun)
+        .where(InvoiceRun.id == run["id"])
+        .values(
+            done_partners=InvoiceRun.done_partners + 1,
+            invoices_created=InvoiceRun.invoices_created + len(invoices),
+        )
+    )
+    db.commit()
+    return len(invoices)
+
+
+def _invoice_partners(run: dict, partner_ids: list[UUID]) -> int:
+    with db_session.SessionLocal() as db:
+        return sum(invoice_partner(db, run, partner_id) for partner_id in partner_ids)
+
+
+def _init_worker() -> None:
+    # Connections inherited from the parent must not be shared with it.
+    db_session.engine.dispose(close=False)
+
+
+def generate_invoices(
+    db: Session,
+    org_id: UUID,
+    period_start: date,
+    period_end: date,
+    issue_date: date | None = None,
+    workers: int | None = None,
+    force: bool = False,
+) -> InvoiceRun:
+    """Invoice every eligible order in the period; rerun to resume.
+
+    Returns the finished run. A failure marks the run ``FAILED`` (keeping
+    the work already committed) and re-raises. Raises
+    ``InvoiceServiceError("run_in_progress")`` while another run for the
+    period is ``RUNNING``; ``force`` takes over a run whose process died.
+    Partner counts are distinct partners of the period, however often the
+    run is resumed.
+    """
+    partner_ids = sorted(
+        db.scalars(
+            select(Order.partner_id).where(*_eligible(org_id, period_start, period_end)).distinct()
+        )
+    )
+    total = db.scalar(
+        select(func.count(func.distinct(Order.partner_id))).where(
+            *_in_period(org_id, period_start, period_end),
+            or_(Order.status.in_(SALES_STATUSES), _invoiced()),
+        )
+    )
+    progress = {
+        "status": "RUNNING",
+        "error": None,
+        "finished_at_utc": None,
+        "total_partners": total,
+        # Partners left with nothing to invoice are done already.
+        "done_partners": total - len(partner_ids),
+    }
+    table = InvoiceRun.__table__
+    stmt = upsert(db, table).values(
+        id=uuid4(),
+        organization_id=org_id,
+        period_start=period_start,
+        period_end=period_end,
+        issue_date=issue_date or period_end,
+        **progress,
+    )
+    run_id = db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["organization_id", "period_start", "period_end"],
+            set_={**progress, "started_at_utc": func.now()},
+            where=None if force else table.c.status != "RUNNING",
+        ).returning(table.c.id)
+    ).scalar()
+    db.commit()
+    if run_id is None:
+        raise InvoiceServiceError("run_in_progress")
+    run = db.get(InvoiceRun, run_id)
+    db.refresh(run)
+
+    task = {
+        "id": run.id,
+        "organization_id": org_id,
+        "period_start": period_start,
+        "period_end": period_end,
+        "issue_date": run.issue_date,
+    }
+    if workers is None:
+        workers = settings.INVOICE_RUN_WORKERS
+    try:
+        if workers > 1 and len(partner_ids) > 1:
+            buckets = [partner_ids[i::workers] for i in range(min(workers, len(partner_ids)))]
+            with ProcessPoolExecutor(max_workers=len(buckets), initializer=_init_worker) as pool:
+                list(pool.map(_invoice_partners, [task] * len(buckets), buckets))
+        else:
+            for partner_id in partner_ids:
+                invoice_partner(db, task, partner_id)
+    except Exception as exc:
+        db.rollback()
+        db.execute(
+            update(InvoiceRun)
+            .where(InvoiceRun.id == run.id)
+            .values(status="FAILED", error=repr(exc)[:1000])
+        )
+        db.commit()
+        raise
+
+    db.execute(
+        update(InvoiceRun)
+        .where(InvoiceRun.id == run.id)
+        .values(status="DONE", finished_at_utc=datetime.now(timezone.utc))
+    )
+    db.commit()
+    db.refresh(run)
+    return run
@@ -0,0 +1,175 @@
+"""Partner ledger (cari hesap ekstresi): every debit and credit in date order.
+
+The ledger merges three sources:
+
+* orders in ``SIPARIS`` that have not been invoiced yet (debit),
+* ``INVOICE``/``ADJUSTMENT`` AR entries (debit),
+* financial transactions: money received is a credit, money paid out a debit.
+
+Payments live in ``financial_transactions``, so AR ``PAYMENT``/``REFUND``
+entries are left out rather than counted twice. The running balance is a
+window ``SUM`` computed by the database, and rows are read through a
+server-side cursor so a long history never sits in memory.
+"""
+
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Iterator
+from uuid import UUID
+
+from sqlalchemy import Numeric, Text, case, exists, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.ar import ArEntry
+from app.models.finance import FinancialTransaction
+from app.models.invoice import SalesInvoice
+from app.models.order import Order
+from app.services.ar_service import AR_DEBIT_TYPES
+from app.services.rollup_service import SALES_STATUSES, utc_day_expr
+
+# Rows fetched from the cursor, and written to the response, at a time.
+LEDGER_FETCH_SIZE = 500
+
+LEDGER_COLUMNS = ("date", "source", "reference", "description", "debit", "credit", "balance")
+
+CENT = Decimal("0.01")
+
+
+def _money(value) -> Decimal:
+    return Decimal(value or 0).quantize(CENT)
+
+
+def ledger_query(
+    db: Session,
+    org_id: UUID,
+    partner_id: UUID,
+    date_from: date | None = None,
+    date_to: date | None = None,
+):
+    zero = literal(0, Numeric(14, 2))
+    invoiced = exists().where(
+        SalesInvoice.order_id == Order.id, SalesInvoice.status != "CANCELLED"
+    )
+    orders = select(
+        utc_day_expr(db, Order.created_at_utc).label("day"),
+        Order.created_at_utc.label("at"),
+        Order.id.label("ref_id"),
+        literal("ORDER", Text).label("source"),
+        Order.number.label("reference"),
+        Order.project_name.label("description"),
+        Order.grand_total.label("debit"),
+        zero.label("credit"),
+    ).where(
+        Order.organization_id == org_id,
+        Order.partner_id == partner_id,
+        Order.status.in_(SALES_STATUSES),
+        ~invoiced,
+    )
+    ar = (
+        select(
+            ArEntry.entry_date.label("day"),
+            ArEntry.created_at_utc.label("at"),
+            ArEntry.id.label("ref_id"),
+            ArEntry.type.label("source"),
+            SalesInvoice.number.label("reference"),
+            ArEntry.note.label("description"),
+            ArEntry.amount.label("debit"),
+            zero.label("credit"),
+        )
+        .outerjoin(SalesInvoice, SalesInvoice.id == ArEntry.invoice_id)
+        .where(
+            ArEntry.organization_id == org_id,
+            ArEntry.partner_id == partner_id,
+            ArEntry.type.in_(AR_DEBIT_TYPES),
+        )
+    )
+    is_out = FinancialTransaction.direction == "OUT"
+    transactions = select(
+        utc_day_expr(db, FinancialTransaction.transaction_date).label("day"),
+        FinancialTransaction.transaction_date.label("at"),
+        FinancialTransaction.id.label("ref_id"),
+        literal("TRANSACTION", Text).label("source"),
+        FinancialTransaction.method.label("reference"),
+        FinancialTransaction.description.label("description"),
+        case((is_out, FinancialTransaction.amount), else_=zero).label("debit"),
+        case((is_out, zero), else_=FinancialTransaction.amount).label("credit"),
+    ).where(
+        FinancialTransaction.organization_id == org_id,
+        FinancialTransaction.partner_id == partner_id,
+    )
+
+    entries = union_all(orders, ar, transactions).subquery("entries")
+    order = (entries.c.day, entries.c.at, entries.c.ref_id)
+    # The window runs over the whole history so a date_from filter still
+    # starts from the right opening balance.
+    running = select(
+        entries,
+        func.sum(entries.c.debit - entries.c.credit)
+        .over(order_by=order, rows=(None, 0))
+        .label("balance"),
+    ).subquery("running")
+    stmt = select(running).order_by(running.c.day, running.c.at, running.c.ref_id)
+    if date_from is not None:
+        stmt = stmt.where(running.c.day >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(running.c.day <= date_to)
+    return stmt
+
+
+def iter_ledger(
+    db: Session,
+    org_id: UUID,
+    partner_id: UUID,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> Iterator[dict]:
+    stmt = ledger_query(db, org_id, partner_id, date_from, date_to)
+    result = db.execute(stmt, execution_options={"yield_per": LEDGER_FETCH_SIZE})
+    for row in result:
+        yield {
+            "date": row.day,
+            "source": row.source,
+            "reference": row.reference,
+            "description": row.description,
+            "debit": _money(row.debit),
+            "credit": _money(row.credit),
+            "balance": _money(row.balance),
+        }
+
+
+def _batched(rows: Iterator[dict]) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == LEDGER_FETCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ledger_json(partner_id: UUID, rows: Iterator[dict]) -> Iterator[str]:
+    """``{"partner_id": ..., "items": [...]}`` written a batch at a time."""
+    yield json.dumps({"partner_id": str(partner_id)})[:-1] + ', "items": ['
+    first = True
+    for batch in _batched(rows):
+        body = ",".join(json.dumps(row, default=str) for row in batch)
+        yield body if first else "," + body
+        first = False
+    yield "]}"
+
+
+def ledger_csv(rows: Iterator[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=LEDGER_COLUMNS)
+    writer.writeheader()
+    for batch in _batched(rows):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,173 @@
+"""Material requirements: open order demand per product and delivery week.
+
+Demand is the m² of every open order line, summed per product and the ISO
+week of its order's delivery date in one grouped query. Confirmed
+(``SIPARIS``) lines that already hold a reservation are covered by stock
+that ``reserved_quantity`` has taken out of the available figure, so only
+their unreserved rest is netted again. Quoted (``TEKLIF``) lines are
+reported and netted separately, since most of them never turn into orders.
+
+Projections are cached per org and dropped whenever an order or stock
+write for the org commits.
+"""
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache, subscribe
+from app.core.config import settings
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.models.stock import StockBalance, StockReservation
+from app.services.pricing import line_area_sql
+from app.services.rollup_service import week_start_expr
+
+CONFIRMED_STATUS = "SIPARIS"
+QUOTED_STATUS = "TEKLIF"
+
+mrp_cache = TTLCache(settings.MRP_CACHE_TTL_SECONDS)
+
+_M2 = Decimal("0.001")
+
+
+def _m2(value) -> Decimal:
+    return Decimal(value or 0).quantize(_M2)
+
+
+def _demand(db: Session, org_id: UUID):
+    area = line_area_sql(OrderItem.width, OrderItem.height, OrderItem.quantity)
+    reserved = (
+        select(
+            StockReservation.order_item_id,
+            func.sum(StockReservation.quantity).label("quantity"),
+        )
+        .where(StockReservation.organization_id == org_id)
+        .group_by(StockReservation.order_item_id)
+        .subquery()
+    )
+    week = week_start_expr(db, Order.delivery_date).label("week_start")
+    return db.execute(
+        select(
+            OrderItem.product_id,
+            week,
+            func.sum(case((Order.status == CONFIRMED_STATUS, area), else_=0)).label("confirmed"),
+            func.sum(func.coalesce(reserved.c.quantity, 0)).label("reserved"),
+            func.sum(case((Order.status == QUOTED_STATUS, area), else_=0)).label("quoted"),
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .outerjoin(reserved, reserved.c.order_item_id == OrderItem.id)
+        .where(
+            Order.organization_id == org_id,
+            Order.status.in_((CONFIRMED_STATUS, QUOTED_STATUS)),
+        )
+        .group_by(OrderItem.product_id, week)
+    ).all()
+
+
+def compute_projection(db: Session, org_id: UUID) -> list[dict]:
+    """Week-by-week projected availability of every product with open demand.
+
+    Weeks run in delivery order, with lines that have no delivery date first
+    (``week_start`` is ``None``) as they may be due at any time. A product's
+    ``shortage_week`` is the first week its projection from confirmed demand
+    goes negative. Products short soonest come first.
+    """
+    weeks: dict[UUID, list] = defaultdict(list)
+    for row in _demand(db, org_id):
+        weeks[row.product_id].append(row)
+    if not weeks:
+        return []
+
+    stock = {
+        row.product_id: row
+        for row in db.execute(
+            select(
+                StockBalance.product_id,
+                func.sum(StockBalance.quantity).label("on_hand"),
+                func.sum(StockBalance.reserved_quantity).label("reserved"),
+            )
+            .where(
+                StockBalance.organization_id == org_id,
+                StockBalance.product_id.in_(list(weeks)),
+            )
+            .group_by(StockBalance.product_id)
+        )
+    }
+    products = {
+        row.id: row
+        for row in db.execute(
+            select(Product.id, Product.sku, Product.name).where(Product.id.in_(list(weeks)))
+        )
+    }
+
+    projection = []
+    for product_id, rows in weeks.items():
+        balance = stock.get(product_id)
+        on_hand = _m2(balance.on_hand if balance else 0)
+        reserved = _m2(balance.reserved if balance else 0)
+        projected = with_quotes = on_hand - reserved
+        shortage_week: date | None = None
+        short = False
+        lines = []
+        for row in sorted(rows, key=lambda r: (r.week_start is not None, r.week_start)):
+            confirmed = _m2(row.confirmed)
+            unreserved = max(confirmed - _m2(row.reserved), Decimal("0"))
+            quoted = _m2(row.quoted)
+            projected -= unreserved
+            with_quotes -= unreserved + quoted
+            if projected < 0 and not short:
+                short = True
+                shortage_week = row.week_start
+            lines.append(
+                {
+                    "week_start": row.week_start,
+                    "confirmed": confirmed,
+                    "unreserved": unreserved,
+                    "quoted": quoted,
+                    "projected_available": projected,
+                    "projected_with_quotes": with_quotes,
+                }
+            )
+        product = products[product_id]
+        projection.append(
+            {
+                "product_id": product_id,
+                "sku": product.sku,
+                "name": product.name,
+                "on_hand": on_hand,
+                "reserved": reserved,
+                "available": on_hand - reserved,
+                "shortage": short,
+                "shortage_week": shortage_week,
+                "weeks": lines,
+            }
+        )
+    projection.sort(
+        key=lambda p: (
+            not p["shortage"],
+            p["shortage_week"] is not None,
+            p["shortage_week"] or date.min,
+            p["sku"],
+        )
+    )
+    return projection
+
+
+def get_projection(db: Session, org_id: UUID) -> list[dict]:
+    return mrp_cache.get_or_set(org_id, lambda: compute_projection(db, org_id))
+
+
+def _on_change(org_id: UUID | None) -> None:
+    if org_id is None:
+        mrp_cache.clear()
+    else:
+        mrp_cache.invalidate(org_id)
+
+
+for _topic in ("demand", "stock"):
+    subscribe(_topic, _on_change)
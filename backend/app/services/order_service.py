@@ -3,32 +3,85 @@ from decimal import Decimal
 from typing import Sequence
 from uuid import UUID, uuid4
 
+from sqlalchemy import insert, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.cache import notify_on_commit
+from app.core.events import publish
 from app.models.order import Order, OrderItem
 from app.models.production_job import ProductionJob
-from app.models.user import User
-from app.schemas.order import OrderCreate, OrderUpdate
+from app.schemas.order import OrderCreate, OrderItemUpdate, OrderUpdate
+from app.services.capacity_service import apply_load_changes, load_facts_for, order_loads
+from app.services.pricing import compute_line_total
+from app.services.production_service import cancel_jobs_for_items, reschedule_jobs_for_items
+from app.services.remnant_service import release_remnants_for_items, reserve_remnants_for_jobs
+from app.services.reservation_service import (
+    release_for_items,
+    release_for_orders,
+    reserve_for_items,
+    reserve_for_orders,
+)
+from app.services.rollup_service import (
+    SALES_STATUSES,
+    apply_order_changes,
+    facts_for,
+    order_facts,
+)
+from app.services.stock_service import StockServiceError
 
 
-def create_order(db: Session, org_id: UUID, data: OrderCreate) -> Order:
+class OrderServiceError(Exception):
+    pass
+
+
+# Order ids per "order.status" event, keeping NOTIFY payloads well under 8 kB.
+STATUS_EVENT_CHUNK = 100
+
+ITEM_FIELDS = (
+    "product_id",
+    "description",
+    "quantity",
+    "unit_price",
+    "width",
+    "height",
+    "line_discount_rate",
+    "tax_rate",
+)
+PRICED_FIELDS = {"quantity", "unit_price", "width", "height"}
+# Fields that decide how much of which glass a line holds in stock.
+RESERVED_FIELDS = ("product_id", "width", "height", "quantity")
+
+# Allowed order status moves; mirrors ``chk_order_status`` on the table.
+ORDER_STATUS_TRANSITIONS: dict[str, frozenset[str]] = {
+    "TEKLIF": frozenset({"SIPARIS", "IPTAL"}),
+    "SIPARIS": frozenset({"IPTAL"}),
+    "IPTAL": frozenset(),
+}
+# Entering this status releases the order to production and reserves its stock.
+PRODUCTION_STATUS = "SIPARIS"
+# Entering this status gives the order's reserved stock back.
+CANCELLED_STATUS = "IPTAL"
+
+
+def next_order_number(db: Session) -> str:
     year = datetime.utcnow().year
     last_order = db.query(Order).order_by(Order.number.desc()).first()
     if last_order and last_order.number.startswith(f"{year}-"):
         seq = int(last_order.number.split("-")[1]) + 1
     else:
         seq = 1
-    order_number = f"{year}-{seq:03d}"
+    return f"{year}-{seq:03d}"
+
+
+def create_order(db: Session, org_id: UUID, data: OrderCreate) -> Order:
+    order_number = next_order_number(db)
 
     items = []
     grand_total = Decimal("0")
     for item in data.items:
-        total_price = (
-            (item.width / Decimal("1000"))
-            * (item.height / Decimal("1000"))
-            * item.quantity
-            * item.unit_price
+        total_price = compute_line_total(
+            item.width, item.height, item.quantity, item.unit_price
         )
         order_item = OrderItem(
             id=uuid4(),
@@ -55,6 +108,7 @@ def create_order(db: Session, org_id: UUID, data: OrderCreate) -> Order:
         project_name=data.project_name,
         delivery_date=data.delivery_date,
         status="TEKLIF",
+        priority=data.priority,
         discount_rate=data.discount_rate,
         notes=data.notes,
         subtotal=grand_total,
@@ -63,6 +117,8 @@ def create_order(db: Session, org_id: UUID, data: OrderCreate) -> Order:
         items=items,
     )
     db.add(order)
+    apply_order_changes(db, [(None, facts_for(order))])
+    notify_on_commit(db, "demand", org_id)
     try:
         db.commit()
     except IntegrityError:
@@ -102,38 +158,48 @@ def update_order(db: Session, org_id: UUID, id: UUID, data: OrderUpdate) -> Orde
     )
     if not order:
         return None
+    before = facts_for(order)
+    load_before = load_facts_for(order)
+    schedule_before = (order.delivery_date, order.priority)
     for field, value in data.model_dump(exclude_unset=True, exclude={"items"}).items():
         setattr(order, field, value)
     if data.items is not None:
-        order.items = [
-            OrderItem(
-                id=uuid4(),
-                product_id=item.product_id,
-                description=item.description,
-                quantity=item.quantity,
-                unit_price=item.unit_price,
-                width=item.width,
-                height=item.height,
-                line_discount_rate=item.line_discount_rate,
-                tax_rate=item.tax_rate,
-            )
-            for item in data.items
-        ]
-    grand_total = Decimal("0")
-    for item in order.items:
-        total_price = (
-            (item.width / Decimal("1000"))
-            * (item.height / Decimal("1000"))
-            * item.quantity
-            * item.unit_price
+        confirmed = order.status == PRODUCTION_STATUS
+        before_ids = {item.id for item in order.items}
+        reshaped = _reshaped_lines(order, data.items)
+        try:
+            if confirmed and reshaped:
+                # Before the lines change: their reservations cascade away
+                # with them, but reserved_quantity would not come back, and
+                # their jobs were planned for the old glass.
+                release_for_items(db, org_id, reshaped)
+                release_remnants_for_items(db, reshaped)
+                cancel_jobs_for_items(db, reshaped)
+            delta = _sync_order_items(order, data.items)
+            if confirmed:
+                db.flush()
+                replanned = [
+                    i.id for i in order.items if i.id not in before_ids or i.id in reshaped
+                ]
+                reserve_for_items(db, org_id, replanned)
+                if replanned:
+                    _queue_production(db, org_id, OrderItem.id.in_(replanned))
+        except OrderServiceError:
+            db.rollback()
+            raise
+        except StockServiceError as e:
+            db.rollback()
+            raise OrderServiceError(str(e)) from None
+        order.subtotal = (order.subtotal or Decimal("0")) + delta
+        order.tax_total = Decimal("0")
+        order.grand_total = order.subtotal
+    if (order.delivery_date, order.priority) != schedule_before:
+        reschedule_jobs_for_items(
+            db, [item.id for item in order.items], order.delivery_date, order.priority
         )
-        item.line_subtotal = total_price
-        item.line_tax = Decimal("0")
-        item.line_total = total_price
-        grand_total += total_price
-    order.subtotal = grand_total
-    order.tax_total = Decimal("0")
-    order.grand_total = grand_total
+    apply_order_changes(db, [(before, facts_for(order))])
+    apply_load_changes(db, [(load_before, load_facts_for(order))])
+    notify_on_commit(db, "demand", org_id)
 
     try:
         db.commit()
@@ -144,6 +210,69 @@ def update_order(db: Session, org_id: UUID, id: UUID, data: OrderUpdate) -> Orde
     return order
 
 
+def _reshaped_lines(order: Order, items: list[OrderItemUpdate]) -> list[UUID]:
+    """Existing lines that ``items`` removes or changes in product, size or quantity."""
+    wanted = {data.id: data for data in items if data.id is not None}
+    return [
+        item.id
+        for item in order.items
+        if item.id not in wanted
+        or any(getattr(item, f) != getattr(wanted[item.id], f) for f in RESERVED_FIELDS)
+    ]
+
+
+def _sync_order_items(order: Order, items: list[OrderItemUpdate]) -> Decimal:
+    """Bring ``order.items`` in line with ``items`` and return the subtotal delta.
+
+    Lines carrying an ``id`` update the matching row in place (only when a
+    field actually changed), lines without one are inserted and existing rows
+    missing from ``items`` are deleted, so untouched lines keep their ids and
+    production jobs.
+    """
+    existing = {item.id: item for item in order.items}
+    kept: set[UUID] = set()
+    delta = Decimal("0")
+    for data in items:
+        values = data.model_dump(include=set(ITEM_FIELDS))
+        if data.id is None:
+            line_total = compute_line_total(
+                data.width, data.height, data.quantity, data.unit_price
+            )
+            order.items.append(
+                OrderItem(
+                    id=uuid4(),
+                    **values,
+                    line_subtotal=line_total,
+                    line_tax=Decimal("0"),
+                    line_total=line_total,
+                )
+            )
+            delta += line_total
+            continue
+
+        item = existing.get(data.id)
+        if item is None or data.id in kept:
+            raise OrderServiceError("order_item_not_found")
+        kept.add(data.id)
+        changed = {f for f, v in values.items() if getattr(item, f) != v}
+        for field in changed:
+            setattr(item, field, values[field])
+        if changed & PRICED_FIELDS:
+            line_total = compute_line_total(
+                item.width, item.height, item.quantity, item.unit_price
+            )
+            delta += line_total - (item.line_total or Decimal("0"))
+            item.line_subtotal = line_total
+            item.line_tax = Decimal("0")
+            item.line_total = line_total
+
+    for item_id, item in existing.items():
+        if item_id not in kept:
+            delta -= item.line_total or Decimal("0")
+            order.items.remove(item)
+    return delta
+
+
 def delete_order(db: Session, org_id: UUID, id: UUID) -> bool:
     order = (
         db.query(Order)
@@ -152,28 +281,149 @@ def delete_order(db: Session, org_id: UUID, id: UUID) -> bool:
     )
     if not order:
         return False
+    apply_order_changes(db, [(facts_for(order), None)])
+    apply_load_changes(db, [(load_facts_for(order), None)])
+    _withdraw_from_production(db, org_id, [order.id])
+    notify_on_commit(db, "demand", org_id)
     db.delete(order)
     db.commit()
     return True
 
 
-def update_order_status(db: Session, id: UUID, new_status: str, current_user: User) -> Order | None:
-    order = db.query(Order).filter(Order.id == id).first()
-    if not order:
-        return None
-    order.status = new_status
-    if new_status == "URETIMDE":
-        for item in order.items:
-            job = ProductionJob(
-                id=uuid4(),
-                order_item_id=item.id,
-                quantity_required=item.quantity,
+def _queue_production(db: Session, org_id: UUID, scope) -> None:
+    """Create a production job for every line matching ``scope`` and reserve remnants.
+
+    One ``INSERT ... SELECT`` over ``order_items``; jobs take their due date
+    and priority from the order.
+    """
+    job_ids = db.execute(
+        insert(ProductionJob)
+        .from_select(
+            ["organization_id", "order_item_id", "quantity_required", "due_date", "priority"],
+            select(
+                Order.organization_id,
+                OrderItem.id,
+                OrderItem.quantity,
+                Order.delivery_date,
+                Order.priority,
+            )
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(scope),
+        )
+        .returning(ProductionJob.id)
+    ).scalars().all()
+    reserve_remnants_for_jobs(db, org_id, job_ids)
+
+
+def _withdraw_from_production(db: Session, org_id: UUID, order_ids: Sequence[UUID]) -> None:
+    """Free the stock and remnants and cancel the unfinished jobs of orders leaving production."""
+    release_for_orders(db, org_id, order_ids)
+    item_ids = db.scalars(
+        select(OrderItem.id).where(OrderItem.order_id.in_(list(order_ids)))
+    ).all()
+    release_remnants_for_items(db, item_ids)
+    cancel_jobs_for_items(db, item_ids)
+
+
+def bulk_update_order_status(
+    db: Session, org_id: UUID, ids: Sequence[UUID], new_status: str
+) -> tuple[list[UUID], list[UUID], list[dict]]:
+    """Move every order in ``ids`` that may legally enter ``new_status``.
+
+    The status change is a set-based UPDATE guarded by the allowed source
+    statuses, and production jobs for the moved orders are generated with one
+    ``INSERT ... SELECT`` over ``order_items``. Returns ``(updated, skipped,
+    shortages)``; skipped ids are unknown, in another org or in a status that
+    cannot move to ``new_status``, and shortages are the confirmed lines stock
+    could not fully cover.
+    """
+    if new_status not in ORDER_STATUS_TRANSITIONS:
+        raise OrderServiceError("invalid_status")
+    sources = [
+        status
+        for status, targets in ORDER_STATUS_TRANSITIONS.items()
+        if new_status in targets
+    ]
+    requested = list(dict.fromkeys(ids))
+    updated: list[UUID] = []
+    moved_from: dict[UUID, str] = {}
+    changes = []
+    # One UPDATE per source status (at most two) so RETURNING tells us what
+    # each order moved from; the rollups need that to undo the old status.
+    for source in sources if requested else ():
+        rows = db.execute(
+            update(Order)
+            .where(
+                Order.organization_id == org_id,
+                Order.id.in_(requested),
+                Order.status == source,
             )
-            db.add(job)
+            .values(status=new_status)
+            .returning(
+                Order.id,
+                Order.organization_id,
+                Order.partner_id,
+                Order.created_at_utc,
+                Order.grand_total,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        for row in rows:
+            updated.append(row.id)
+            moved_from[row.id] = source
+            facts = (row.organization_id, row.partner_id)
+            changes.append(
+                (
+                    order_facts(*facts, source, row.created_at_utc, row.grand_total),
+                    order_facts(*facts, new_status, row.created_at_utc, row.grand_total),
+                )
+            )
+    apply_order_changes(db, changes)
+    loaded = new_status in SALES_STATUSES
+    apply_load_changes(
+        db,
+        (
+            (load if moved_from[id] in SALES_STATUSES else None, load if loaded else None)
+            for id, load in order_loads(db, updated).items()
+        ),
+    )
+    if updated:
+        notify_on_commit(db, "demand", org_id)
+    if updated and new_status == PRODUCTION_STATUS:
+        _queue_production(db, org_id, OrderItem.order_id.in_(updated))
+    shortages: list[dict] = []
+    try:
+        if updated and new_status == PRODUCTION_STATUS:
+            shortages = reserve_for_orders(db, org_id, updated)
+        elif updated and new_status == CANCELLED_STATUS:
+            _withdraw_from_production(db, org_id, updated)
+    except StockServiceError as e:
+        db.rollback()
+        raise OrderServiceError(str(e)) from None
+    for start in range(0, len(updated), STATUS_EVENT_CHUNK):
+        publish(
+            db,
+            org_id,
+            "order.status",
+            {"order_ids": updated[start : start + STATUS_EVENT_CHUNK], "status": new_status},
+        )
     try:
         db.commit()
     except IntegrityError:
         db.rollback()
         raise
+    moved = set(updated)
+    return updated, [id for id in requested if id not in moved], shortages
+
+
+def update_order_status(
+    db: Session, org_id: UUID, id: UUID, new_status: str
+) -> Order | None:
+    order = get_order(db, org_id, id)
+    if not order:
+        return None
+    updated, _, _ = bulk_update_order_status(db, org_id, [id], new_status)
+    if not updated:
+        raise OrderServiceError("invalid_status_transition")
     db.refresh(order)
     return order
@@ -0,0 +1,40 @@
+"""Line pricing shared by orders, quotes and conversions between them.
+
+Glass is sold by area: a line costs width × height (mm, so divided by 1000
+each to get m²) × quantity × the unit price per m², rounded half up to the
+cent. :func:`line_total_sql` is the same rule for set-based SQL copies.
+Stock, reservations and planning work in the same m² of a line.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import Numeric, func
+
+
+def compute_line_total(
+    width: Decimal, height: Decimal, quantity: Decimal, unit_price: Decimal
+) -> Decimal:
+    total = (
+        (width / Decimal("1000"))
+        * (height / Decimal("1000"))
+        * quantity
+        * unit_price
+    )
+    return total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def line_total_sql(width, height, quantity, unit_price):
+    # PostgreSQL rounds numeric halves away from zero, i.e. half up for prices.
+    return func.round(
+        width / 1000 * height / 1000 * quantity * unit_price, 2, type_=Numeric(14, 2)
+    )
+
+
+def line_area(width: Decimal, height: Decimal, quantity: Decimal) -> Decimal:
+    """Area of an order line in m², at stock precision."""
+    area = Decimal(width) / 1000 * Decimal(height) / 1000 * Decimal(quantity)
+    return area.quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
+
+
+def line_area_sql(width, height, quantity):
+    return width / 1000 * height / 1000 * quantity
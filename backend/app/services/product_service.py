@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.stock_service import sync_restock_level
 
 
 def create_product(db: Session, org_id: UUID, data: ProductCreate) -> Product:
@@ -60,8 +61,11 @@ def update_product(db: Session, org_id: UUID, id: UUID, data: ProductUpdate) ->
     )
     if not product:
         return None
-    for field, value in data.model_dump(exclude_unset=True).items():
+    changes = data.model_dump(exclude_unset=True)
+    for field, value in changes.items():
         setattr(product, field, value)
+    if "restock_level" in changes:
+        sync_restock_level(db, org_id, product.id, changes["restock_level"])
     try:
         db.commit()
     except IntegrityError:
@@ -0,0 +1,241 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.production_job import ProductionJob
+from app.services.remnant_service import consume_remnants_for_job
+
+# Mirrors ``chk_production_job_status``.
+JOB_STATUSES = ("PENDING", "CLAIMED", "DONE", "FAILED", "CANCELLED")
+# Jobs a station may still pick up or is working on.
+OPEN_JOB_STATUSES = ("PENDING", "CLAIMED")
+
+
+class ProductionServiceError(Exception):
+    pass
+
+
+def cancel_jobs_for_items(db: Session, item_ids: Sequence[UUID]) -> int:
+    """Withdraw the unfinished jobs of ``item_ids`` from the queue.
+
+    Call inside the transaction that cancels the order or removes the lines;
+    a station still holding a cancelled job gets ``job_not_claimed`` when it
+    reports back. Finished jobs are left as history.
+    """
+    if not item_ids:
+        return 0
+    result = db.execute(
+        update(ProductionJob)
+        .where(
+            ProductionJob.order_item_id.in_(list(item_ids)),
+            ProductionJob.status.in_(OPEN_JOB_STATUSES),
+        )
+        .values(status="CANCELLED", claimed_by=None, claimed_at_utc=None)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def reschedule_jobs_for_items(
+    db: Session, item_ids: Sequence[UUID], due_date: date | None, priority: int
+) -> int:
+    """Copy an order's delivery date and priority onto its unfinished jobs."""
+    if not item_ids:
+        return 0
+    result = db.execute(
+        update(ProductionJob)
+        .where(
+            ProductionJob.order_item_id.in_(list(item_ids)),
+            ProductionJob.status.in_(OPEN_JOB_STATUSES),
+        )
+        .values(due_date=due_date, priority=priority)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def claim_jobs(
+    db: Session, org_id: UUID, station: str, limit: int = 1
+) -> Sequence[ProductionJob]:
+    """Claim up to ``limit`` pending jobs for ``station``.
+
+    Jobs are taken highest priority first, then earliest due date, then oldest.
+    The candidate rows are selected ``FOR UPDATE SKIP LOCKED`` inside the
+    UPDATE, so stations polling at the same time each get different jobs and
+    never wait on one another.
+    """
+    candidates = (
+        select(ProductionJob.id)
+        .where(
+            ProductionJob.organization_id == org_id,
+            ProductionJob.status == "PENDING",
+        )
+        .order_by(
+            ProductionJob.priority.desc(),
+            ProductionJob.due_date.asc().nulls_last(),
+            ProductionJob.created_at_utc.asc(),
+        )
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    jobs = (
+        db.execute(
+            update(ProductionJob)
+            .where(ProductionJob.id.in_(candidates.scalar_subquery()))
+            .values(
+                status="CLAIMED",
+                claimed_by=station,
+                claimed_at_utc=func.now(),
+                attempts=ProductionJob.attempts + 1,
+            )
+            .returning(ProductionJob)
+            .execution_options(synchronize_session=False)
+        )
+        .scalars()
+        .all()
+    )
+    db.commit()
+    return sorted(
+        jobs,
+        key=lambda job: (
+            -job.priority,
+            job.due_date is None,
+            job.due_date,
+            job.created_at_utc,
+        ),
+    )
+
+
+def complete_job(
+    db: Session,
+    org_id: UUID,
+    id: UUID,
+    station: str,
+    success: bool = True,
+    error: str | None = None,
+) -> ProductionJob | None:
+    """Finish a claimed job; failures go back to the queue until attempts run out."""
+    job = (
+        db.query(ProductionJob)
+        .filter(ProductionJob.id == id, ProductionJob.organization_id == org_id)
+        .with_for_update()
+        .first()
+    )
+    if not job:
+        return None
+    if job.status != "CLAIMED" or job.claimed_by != station:
+        db.rollback()
+        raise ProductionServiceError("job_not_claimed")
+    if success:
+        job.status = "DONE"
+        job.finished_at_utc = func.now()
+        job.last_error = None
+        consume_remnants_for_job(db, job.id)
+    elif job.attempts >= settings.PRODUCTION_JOB_MAX_ATTEMPTS:
+        job.status = "FAILED"
+        job.finished_at_utc = func.now()
+        job.last_error = error
+    else:
+        job.status = "PENDING"
+        job.claimed_by = None
+        job.claimed_at_utc = None
+        job.last_error = error
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def requeue_stale_jobs(db: Session, timeout_seconds: int | None = None) -> int:
+    """Return jobs whose station went silent past the claim timeout to the queue.
+
+    A timed-out claim counts as an attempt: jobs that have used up
+    ``PRODUCTION_JOB_MAX_ATTEMPTS`` are marked ``FAILED`` instead, so a job
+    that crashes every station it lands on stops being handed out. Returns
+    the number of jobs requeued or failed.
+    """
+    if timeout_seconds is None:
+        timeout_seconds = settings.PRODUCTION_CLAIM_TIMEOUT_SECONDS
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=timeout_seconds)
+    stale = (
+        ProductionJob.status == "CLAIMED",
+        ProductionJob.claimed_at_utc < cutoff,
+    )
+    failed = db.execute(
+        update(ProductionJob)
+        .where(*stale, ProductionJob.attempts >= settings.PRODUCTION_JOB_MAX_ATTEMPTS)
+        .values(status="FAILED", finished_at_utc=func.now(), last_error="claim_timeout")
+        .execution_options(synchronize_session=False)
+    )
+    requeued = db.execute(
+        update(ProductionJob)
+        .where(*stale)
+        .values(status="PENDING", claimed_by=None, claimed_at_utc=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return failed.rowcount + requeued.rowcount
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return round(ordered[index], 3)
+
+
+def get_queue_stats(db: Session, org_id: UUID, window_minutes: int = 60) -> dict:
+    """Queue depth per status plus throughput and latency over the last window.
+
+    ``wait`` is creation to claim, ``service`` is claim to finish, both in
+    seconds, over jobs finished inside the window.
+    """
+    depth = dict(
+        db.execute(
+            select(ProductionJob.status, func.count())
+            .where(ProductionJob.organization_id == org_id)
+            .group_by(ProductionJob.status)
+        ).all()
+    )
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=window_minutes)
+    finished = db.execute(
+        select(
+            ProductionJob.created_at_utc,
+            ProductionJob.claimed_at_utc,
+            ProductionJob.finished_at_utc,
+        ).where(
+            ProductionJob.organization_id == org_id,
+            ProductionJob.status == "DONE",
+            ProductionJob.finished_at_utc >= cutoff,
+        )
+    ).all()
+    waits = [
+        (row.claimed_at_utc - row.created_at_utc).total_seconds()
+        for row in finished
+        if row.claimed_at_utc is not None
+    ]
+    services = [
+        (row.finished_at_utc - row.claimed_at_utc).total_seconds()
+        for row in finished
+        if row.claimed_at_utc is not None
+    ]
+    overdue = db.execute(
+        select(func.count()).where(
+            ProductionJob.organization_id == org_id,
+            ProductionJob.status.in_(OPEN_JOB_STATUSES),
+            ProductionJob.due_date < datetime.now(timezone.utc).date(),
+        )
+    ).scalar_one()
+    return {
+        "depth": {status: depth.get(status, 0) for status in JOB_STATUSES},
+        "overdue": overdue,
+        "window_minutes": window_minutes,
+        "completed": len(finished),
+        "throughput_per_hour": round(len(finished) * 60 / window_minutes, 2),
+        "wait_seconds": {"p50": _percentile(waits, 50), "p95": _percentile(waits, 95)},
+        "service_seconds": {"p50": _percentile(services, 50), "p95": _percentile(services, 95)},
+    }
@@ -0,0 +1,96 @@
+from uuid import UUID, uuid4
+
+from sqlalchemy import exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import notify_on_commit
+from app.models.order import Order, OrderItem
+from app.models.quote import Quote, QuoteItem
+from app.services.order_service import next_order_number
+from app.services.pricing import line_total_sql
+
+
+class QuoteServiceError(Exception):
+    pass
+
+
+# A quote can become an order once it has gone to the customer.
+CONVERTIBLE_QUOTE_STATUSES = ("SENT", "APPROVED")
+
+
+def convert_quote(db: Session, org_id: UUID, quote_id: UUID) -> Order:
+    """Create a ``TEKLIF`` order from a quote, linked back through ``quote_id``.
+
+    Items are copied and repriced with one ``INSERT ... SELECT`` and the
+    order totals are summed in the database, so no item passes through
+    Python however large the quote is. The quote row is locked for the
+    short transaction and marked ``APPROVED``; ``orders.quote_id`` is
+    unique as well, so a quote converts at most once.
+    """
+    quote = db.execute(
+        select(Quote.id, Quote.partner_id, Quote.status, Quote.discount_rate, Quote.notes)
+        .where(Quote.id == quote_id, Quote.organization_id == org_id)
+        .with_for_update()
+    ).first()
+    if quote is None:
+        db.rollback()
+        raise QuoteServiceError("quote_not_found")
+    if quote.status not in CONVERTIBLE_QUOTE_STATUSES:
+        db.rollback()
+        raise QuoteServiceError("quote_not_convertible")
+    if db.scalar(select(exists().where(Order.quote_id == quote.id))):
+        db.rollback()
+        raise QuoteServiceError("quote_already_converted")
+
+    order_id = uuid4()
+    db.execute(
+        insert(Order).values(
+            id=order_id,
+            organization_id=org_id,
+            number=next_order_number(db),
+            partner_id=quote.partner_id,
+            status="TEKLIF",
+            discount_rate=quote.discount_rate,
+            notes=quote.notes,
+            quote_id=quote.id,
+        )
+    )
+    line_total = line_total_sql(
+        QuoteItem.width, QuoteItem.height, QuoteItem.quantity, QuoteItem.unit_price
+    )
+    copied = (
+        "product_id",
+        "description",
+        "quantity",
+        "unit_price",
+        "width",
+        "height",
+        "line_discount_rate",
+        "tax_rate",
+    )
+    db.execute(
+        insert(OrderItem).from_select(
+            ["order_id", *copied, "line_subtotal", "line_tax", "line_total"],
+            select(
+                literal(order_id, OrderItem.order_id.type),
+                *(getattr(QuoteItem, c) for c in copied),
+                line_total,
+                literal(0, OrderItem.line_tax.type),
+                line_total,
+            ).where(QuoteItem.quote_id == quote.id),
+        )
+    )
+    total = (
+        select(func.coalesce(func.sum(OrderItem.line_total), 0))
+        .where(OrderItem.order_id == order_id)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(Order)
+        .where(Order.id == order_id)
+        .values(subtotal=total, tax_total=0, grand_total=total)
+    )
+    db.execute(update(Quote).where(Quote.id == quote.id).values(status="APPROVED"))
+    notify_on_commit(db, "demand", org_id)
+    db.commit()
+    return db.get(Order, order_id)
@@ -0,0 +1,208 @@
+import math
+from collections import defaultdict
+from decimal import Decimal
+from typing import Sequence
+from uuid import UUID, uuid4
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.order import OrderItem
+from app.models.product import Product
+from app.models.production_job import ProductionJob
+from app.models.remnant import Remnant
+from app.models.warehouse import Warehouse
+from app.schemas.remnant import RemnantCreate
+
+
+class RemnantServiceError(Exception):
+    pass
+
+
+def _normalize(width: Decimal, height: Decimal) -> tuple[Decimal, Decimal]:
+    """Return ``(long side, short side)``; remnants are stored that way round."""
+    return (width, height) if width >= height else (height, width)
+
+
+def create_remnant(db: Session, org_id: UUID, data: RemnantCreate) -> Remnant:
+    product = db.get(Product, data.product_id)
+    if not product or product.organization_id != org_id:
+        raise RemnantServiceError("product_not_found")
+    warehouse = db.get(Warehouse, data.warehouse_id)
+    if not warehouse or warehouse.organization_id != org_id or not warehouse.is_active:
+        raise RemnantServiceError("warehouse_not_found")
+    width, height = _normalize(data.width, data.height)
+    remnant = Remnant(
+        id=uuid4(),
+        organization_id=org_id,
+        product_id=data.product_id,
+        warehouse_id=data.warehouse_id,
+        width=width,
+        height=height,
+        status="AVAILABLE",
+    )
+    db.add(remnant)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
+    db.refresh(remnant)
+    return remnant
+
+
+def list_remnants(
+    db: Session,
+    org_id: UUID,
+    page: int,
+    page_size: int,
+    product_id: UUID | None = None,
+    status: str | None = None,
+) -> tuple[Sequence[Remnant], int]:
+    query = db.query(Remnant).filter(Remnant.organization_id == org_id)
+    if product_id:
+        query = query.filter(Remnant.product_id == product_id)
+    if status:
+        query = query.filter(Remnant.status == status)
+    total = query.count()
+    items = (
+        query.order_by(Remnant.created_at_utc.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
+    return items, total
+
+
+def find_fitting_remnant(
+    db: Session,
+    org_id: UUID,
+    product_id: UUID,
+    width: Decimal,
+    height: Decimal,
+    lock: bool = False,
+) -> Remnant | None:
+    """Smallest available remnant that a ``width`` x ``height`` pane fits on.
+
+    Served by the partial ``ix_remnants_fit`` index on
+    ``(organization_id, product_id, width * height, width)``, which returns
+    candidates already in this order. With ``lock`` the row is
+    claimed ``FOR UPDATE SKIP LOCKED`` so concurrent reservations pass over
+    each other instead of queueing on the same offcut.
+    """
+    long_side, short_side = _normalize(width, height)
+    query = (
+        select(Remnant)
+        .where(
+            Remnant.organization_id == org_id,
+            Remnant.product_id == product_id,
+            Remnant.status == "AVAILABLE",
+            Remnant.width >= long_side,
+            Remnant.height >= short_side,
+        )
+        .order_by(Remnant.width * Remnant.height, Remnant.width)
+        .limit(1)
+    )
+    if lock:
+        query = query.with_for_update(skip_locked=True)
+    return db.execute(query).scalars().first()
+
+
+def reserve_remnants_for_jobs(db: Session, org_id: UUID, job_ids: Sequence[UUID]) -> int:
+    """Reserve the smallest fitting remnant for each pane of the given jobs.
+
+    Runs inside the caller's transaction and returns the number of panes that
+    were matched to a remnant. The remnants that could hold any of the panes
+    are locked ``FOR UPDATE SKIP LOCKED`` in one query per product, matched
+    to panes in memory and reserved with one bulk UPDATE.
+    """
+    if not job_ids:
+        return 0
+    jobs = db.execute(
+        select(
+            ProductionJob.id,
+            ProductionJob.quantity_required,
+            OrderItem.product_id,
+            OrderItem.width,
+            OrderItem.height,
+        )
+        .join(OrderItem, OrderItem.id == ProductionJob.order_item_id)
+        .where(ProductionJob.id.in_(job_ids))
+    ).all()
+    panes: dict[UUID, list] = defaultdict(list)
+    for job in jobs:
+        long_side, short_side = _normalize(job.width, job.height)
+        panes[job.product_id].append((job.id, long_side, short_side, job.quantity_required))
+
+    assignments = []
+    for product_id, product_panes in panes.items():
+        candidates = list(
+            db.execute(
+                select(Remnant.id, Remnant.width, Remnant.height)
+                .where(
+                    Remnant.organization_id == org_id,
+                    Remnant.product_id == product_id,
+                    Remnant.status == "AVAILABLE",
+                    Remnant.width >= min(pane[1] for pane in product_panes),
+                    Remnant.height >= min(pane[2] for pane in product_panes),
+                )
+                .order_by(Remnant.width * Remnant.height, Remnant.width)
+                .with_for_update(skip_locked=True)
+            )
+        )
+        for job_id, long_side, short_side, quantity in product_panes:
+            for _ in range(math.ceil(quantity)):
+                fit = next(
+                    (
+                        index
+                        for index, remnant in enumerate(candidates)
+                        if remnant.width >= long_side and remnant.height >= short_side
+                    ),
+                    None,
+                )
+                if fit is None:
+                    break
+                assignments.append(
+                    {
+                        "id": candidates.pop(fit).id,
+                        "status": "RESERVED",
+                        "production_job_id": job_id,
+                    }
+                )
+    if assignments:
+        db.execute(update(Remnant), assignments)
+    return len(assignments)
+
+
+def release_remnants_for_items(db: Session, item_ids: Sequence[UUID]) -> int:
+    """Return the remnants reserved for the jobs of ``item_ids`` to the shelf.
+
+    Call inside the transaction that cancels the order or removes the lines,
+    before the lines are deleted.
+    """
+    if not item_ids:
+        return 0
+    result = db.execute(
+        update(Remnant)
+        .where(
+            Remnant.status == "RESERVED",
+            Remnant.production_job_id.in_(
+                select(ProductionJob.id).where(ProductionJob.order_item_id.in_(list(item_ids)))
+            ),
+        )
+        .values(status="AVAILABLE", production_job_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def consume_remnants_for_job(db: Session, job_id: UUID) -> int:
+    """Mark the remnants reserved for a finished job as cut."""
+    result = db.execute(
+        update(Remnant)
+        .where(Remnant.production_job_id == job_id, Remnant.status == "RESERVED")
+        .values(status="CONSUMED")
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -0,0 +1,237 @@
+"""Stock reservations for confirmed orders.
+
+Confirming an order reserves the area (m²) of each line from the line's
+product, drawing on the warehouses with the most available stock first.
+When several orders are confirmed together and stock runs short, the ones
+due soonest are served first.
+Available-to-promise is ``quantity - reserved_quantity`` on
+``stock_balances``. Reservations never push it below zero; whatever cannot
+be covered stays unreserved and shows up as a shortage.
+
+Balances are updated optimistically rather than locked. A reservation
+reads the balances, plans against them, and updates each row only
+``WHERE version = <version read>``. If another writer got there first, the
+attempt rolls back to a savepoint and is planned again from fresh reads.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import notify_on_commit
+from app.core.config import settings
+from app.models.order import Order, OrderItem
+from app.models.stock import StockBalance, StockReservation
+from app.services.pricing import line_area
+from app.services.stock_service import StockServiceError
+
+Pair = tuple[UUID, UUID]
+
+
+def _plan(lines, balances) -> tuple[list[dict], dict[Pair, Decimal], list[dict]]:
+    """Greedy allocation of ``lines`` against ``balances``.
+
+    Returns the reservation rows, the reserved increment per pair and the
+    lines (or parts of lines) left uncovered.
+    """
+    available: dict[UUID, dict[UUID, Decimal]] = defaultdict(dict)
+    for row in balances:
+        free = Decimal(row.quantity) - Decimal(row.reserved_quantity)
+        if free > 0:
+            available[row.product_id][row.warehouse_id] = free
+    reservations, increments, shortages = [], defaultdict(Decimal), []
+    for line in lines:
+        need = line_area(line.width, line.height, line.quantity)
+        stock = available[line.product_id]
+        for warehouse_id in sorted(stock, key=lambda w: (-stock[w], w)):
+            if need <= 0:
+                break
+            take = min(need, stock[warehouse_id])
+            if take <= 0:
+                continue
+            stock[warehouse_id] -= take
+            need -= take
+            increments[(line.product_id, warehouse_id)] += take
+            reservations.append(
+                {
+                    "order_id": line.order_id,
+                    "order_item_id": line.id,
+                    "product_id": line.product_id,
+                    "warehouse_id": warehouse_id,
+                    "quantity": take,
+                }
+            )
+        if need > 0:
+            shortages.append(
+                {"order_item_id": line.id, "product_id": line.product_id, "missing": need}
+            )
+    return reservations, increments, shortages
+
+
+def reserve_for_orders(db: Session, org_id: UUID, order_ids: Sequence[UUID]) -> list[dict]:
+    """Reserve stock for every line of ``order_ids``; returns the shortages.
+
+    Runs in the caller's transaction and does not commit. Raises
+    ``StockServiceError("reservation_conflict")`` when the balances keep
+    changing underneath for ``STOCK_RESERVATION_MAX_ATTEMPTS`` attempts.
+    """
+    return _reserve(db, org_id, OrderItem.order_id.in_(list(order_ids)))
+
+
+def reserve_for_items(db: Session, org_id: UUID, item_ids: Sequence[UUID]) -> list[dict]:
+    """Like :func:`reserve_for_orders` for single lines of confirmed orders."""
+    return _reserve(db, org_id, OrderItem.id.in_(list(item_ids)))
+
+
+def _reserve(db: Session, org_id: UUID, scope) -> list[dict]:
+    lines = db.execute(
+        select(
+            OrderItem.id,
+            OrderItem.order_id,
+            OrderItem.product_id,
+            OrderItem.width,
+            OrderItem.height,
+            OrderItem.quantity,
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(scope)
+        # Earliest delivery first, undated orders last (portable NULLS LAST).
+        .order_by(
+            Order.delivery_date.is_(None),
+            Order.delivery_date,
+            Order.created_at_utc,
+            OrderItem.id,
+        )
+    ).all()
+    if not lines:
+        return []
+    product_ids = {line.product_id for line in lines}
+
+    for _ in range(settings.STOCK_RESERVATION_MAX_ATTEMPTS):
+        balances = db.execute(
+            select(
+                StockBalance.product_id,
+                StockBalance.warehouse_id,
+                StockBalance.quantity,
+                StockBalance.reserved_quantity,
+                StockBalance.version,
+            ).where(
+                StockBalance.organization_id == org_id,
+                StockBalance.product_id.in_(product_ids),
+            )
+        ).all()
+        versions = {(row.product_id, row.warehouse_id): row.version for row in balances}
+        reservations, increments, shortages = _plan(lines, balances)
+
+        savepoint = db.begin_nested()
+        conflict = False
+        # Key order keeps concurrent confirmations from waiting on each other in a cycle.
+        for (product_id, warehouse_id), amount in sorted(increments.items()):
+            result = db.execute(
+                update(StockBalance)
+                .where(
+                    StockBalance.product_id == product_id,
+                    StockBalance.warehouse_id == warehouse_id,
+                    StockBalance.version == versions[(product_id, warehouse_id)],
+                )
+                .values(
+                    reserved_quantity=StockBalance.reserved_quantity + amount,
+                    version=StockBalance.version + 1,
+                    updated_at_utc=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                conflict = True
+                break
+        if conflict:
+            savepoint.rollback()
+            continue
+        if reservations:
+            db.execute(
+                insert(StockReservation),
+                [{"organization_id": org_id, **row} for row in reservations],
+            )
+        savepoint.commit()
+        if increments:
+            notify_on_commit(db, "stock", org_id)
+        return shortages
+    raise StockServiceError("reservation_conflict")
+
+
+def release_for_orders(db: Session, org_id: UUID, order_ids: Sequence[UUID]) -> None:
+    """Drop the reservations of ``order_ids`` and give the stock back.
+
+    Decrements commute, so no version check is needed; the bump still
+    invalidates plans other confirmations made against the old figures.
+    Runs in the caller's transaction and does not commit.
+    """
+    _release(db, org_id, StockReservation.order_id.in_(list(order_ids)))
+
+
+def release_for_items(db: Session, org_id: UUID, item_ids: Sequence[UUID]) -> None:
+    """Like :func:`release_for_orders` for single order lines.
+
+    Call before the lines are deleted or resized: the reservation rows would
+    cascade away with a line, but ``reserved_quantity`` would not.
+    """
+    _release(db, org_id, StockReservation.order_item_id.in_(list(item_ids)))
+
+
+def _release(db: Session, org_id: UUID, scope) -> None:
+    held = db.execute(
+        select(
+            StockReservation.product_id,
+            StockReservation.warehouse_id,
+            func.sum(StockReservation.quantity).label("quantity"),
+        )
+        .where(StockReservation.organization_id == org_id, scope)
+        .group_by(StockReservation.product_id, StockReservation.warehouse_id)
+        .order_by(StockReservation.product_id, StockReservation.warehouse_id)
+    ).all()
+    if not held:
+        return
+    for row in held:
+        db.execute(
+            update(StockBalance)
+            .where(
+                StockBalance.product_id == row.product_id,
+                StockBalance.warehouse_id == row.warehouse_id,
+            )
+            .values(
+                reserved_quantity=StockBalance.reserved_quantity - row.quantity,
+                version=StockBalance.version + 1,
+                updated_at_utc=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+    db.execute(
+        delete(StockReservation)
+        .where(StockReservation.organization_id == org_id, scope)
+        .execution_options(synchronize_session=False)
+    )
+    notify_on_commit(db, "stock", org_id)
+
+
+def available_to_promise(
+    db: Session, org_id: UUID, product_id: UUID | None = None, warehouse_id: UUID | None = None
+) -> list:
+    """On-hand, reserved and available quantity per product and warehouse."""
+    stmt = select(
+        StockBalance.product_id,
+        StockBalance.warehouse_id,
+        StockBalance.quantity,
+        StockBalance.reserved_quantity,
+        (StockBalance.quantity - StockBalance.reserved_quantity).label("available"),
+    ).where(StockBalance.organization_id == org_id)
+    if product_id is not None:
+        stmt = stmt.where(StockBalance.product_id == product_id)
+    if warehouse_id is not None:
+        stmt = stmt.where(StockBalance.warehouse_id == warehouse_id)
+    return db.execute(
+        stmt.order_by(StockBalance.product_id, StockBalance.warehouse_id)
+    ).all()
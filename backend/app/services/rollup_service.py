@@ -0,0 +1,307 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Iterable, NamedTuple
+from uuid import UUID
+
+from sqlalchemy import Date, DateTime, cast, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import notify_on_commit
+from app.core.config import settings
+from app.db.upsert import upsert
+from app.models.order import Order
+from app.models.partner import Partner
+from app.models.rollup import CustomerRevenueWindow, DailySalesRollup, PartnerDailyRevenue
+
+# Order statuses that count as sales in the rollups.
+SALES_STATUSES = frozenset({"SIPARIS"})
+
+
+class OrderFacts(NamedTuple):
+    """The parts of an order that rollups aggregate."""
+
+    organization_id: UUID
+    partner_id: UUID
+    day: date
+    grand_total: Decimal
+
+
+def utc_day(value: datetime) -> date:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def order_facts(
+    organization_id: UUID,
+    partner_id: UUID,
+    status: str,
+    created_at_utc: datetime,
+    grand_total: Decimal | None,
+) -> OrderFacts | None:
+    """Facts for an order in ``status``, or ``None`` if it does not count as a sale.
+
+    Orders are bucketed by their creation day, which never changes, so later
+    edits and cancellations always correct the same rollup row.
+    """
+    if status not in SALES_STATUSES:
+        return None
+    return OrderFacts(
+        organization_id, partner_id, utc_day(created_at_utc), grand_total or Decimal("0")
+    )
+
+
+def facts_for(order: Order) -> OrderFacts | None:
+    if order.status not in SALES_STATUSES:
+        return None
+    return order_facts(
+        order.organization_id,
+        order.partner_id,
+        order.status,
+        order.created_at_utc,
+        order.grand_total,
+    )
+
+
+def upsert_counts(
+    db: Session, table, keys: list[str], count_col: str, sum_col: str, deltas: dict
+) -> None:
+    """Add ``key -> [count, sum]`` deltas to ``table`` in one multi-row upsert."""
+    rows = [
+        {**dict(zip(keys, key)), count_col: count, sum_col: total}
+        for key, (count, total) in deltas.items()
+        if count or total
+    ]
+    if not rows:
+        return
+    stmt = upsert(db, table).values(rows)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={
+                count_col: table.c[count_col] + stmt.excluded[count_col],
+                sum_col: table.c[sum_col] + stmt.excluded[sum_col],
+            },
+        )
+    )
+
+
+def apply_order_changes(
+    db: Session,
+    changes: Iterable[tuple[OrderFacts | None, OrderFacts | None]],
+    today: date | None = None,
+) -> None:
+    """Fold ``(before, after)`` order facts into the rollups.
+
+    Call inside the transaction that writes the orders so the rollups commit
+    or roll back with them. Deltas are summed per rollup row first, so a bulk
+    change issues one multi-row upsert per rollup table regardless of how
+    many orders moved. Revenue windows only take orders whose day is still
+    inside the window; :func:`refresh_revenue_windows` drops days that age out.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    daily: dict[tuple, list] = defaultdict(lambda: [0, Decimal("0")])
+    partner_daily: dict[tuple, list] = defaultdict(lambda: [0, Decimal("0")])
+    windows: dict[tuple, list] = defaultdict(lambda: [0, Decimal("0")])
+
+    def add(facts: OrderFacts, sign: int) -> None:
+        amount = sign * facts.grand_total
+        targets = [
+            daily[(facts.organization_id, facts.day)],
+            partner_daily[(facts.organization_id, facts.partner_id, facts.day)],
+        ]
+        age = (today - facts.day).days
+        targets.extend(
+            windows[(facts.organization_id, window, facts.partner_id)]
+            for window in settings.LEADERBOARD_WINDOWS
+            if age < window
+        )
+        for row in targets:
+            row[0] += sign
+            row[1] += amount
+
+    orgs: set[UUID] = set()
+    for before, after in changes:
+        if before is not None:
+            add(before, -1)
+            orgs.add(before.organization_id)
+        if after is not None:
+            add(after, 1)
+            orgs.add(after.organization_id)
+    for org_id in orgs:
+        notify_on_commit(db, "orders", org_id)
+
+    upsert_counts(
+        db, DailySalesRollup.__table__, ["organization_id", "day"], "order_count", "total", daily
+    )
+    upsert_counts(
+        db,
+        PartnerDailyRevenue.__table__,
+        ["organization_id", "partner_id", "day"],
+        "order_count",
+        "total",
+        partner_daily,
+    )
+    upsert_counts(
+        db,
+        CustomerRevenueWindow.__table__,
+        ["organization_id", "window_days", "partner_id"],
+        "order_count",
+        "revenue",
+        windows,
+    )
+
+
+def utc_day_expr(db: Session, column):
+    """SQL for the UTC calendar day of a timestamp column."""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.date(func.timezone("UTC", column), type_=Date)
+    return func.date(column, type_=Date)
+
+
+def week_start_expr(db: Session, column):
+    """SQL for the Monday that starts the ISO week of a date column."""
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(func.date_trunc("week", column), Date)
+    return func.date(column, "weekday 0", "-6 days", type_=Date)
+
+
+def utc_day_end_expr(db: Session, column):
+    """SQL for the instant the UTC day in a date column ends (next midnight)."""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.timezone(
+            "UTC", cast(column + 1, DateTime), type_=DateTime(timezone=True)
+        )
+    return func.datetime(column, "+1 day", type_=DateTime(timezone=True))
+
+
+def rebuild_sales_rollup(
+    db: Session, org_id: UUID | None = None, since: date | None = None
+) -> int:
+    """Recompute the daily sales rollups from ``orders`` and return the row count.
+
+    Rebuilds ``daily_sales_rollup`` and ``partner_daily_revenue``, then the
+    revenue windows. Used to backfill history or repair drift; limited to one
+    org and/or to days on or after ``since`` when given.
+    """
+    day = utc_day_expr(db, Order.created_at_utc)
+    source_scope = [Order.status.in_(SALES_STATUSES)]
+    if org_id is not None:
+        source_scope.append(Order.organization_id == org_id)
+    if since is not None:
+        source_scope.append(day >= since)
+
+    rows = 0
+    for table, group in (
+        (DailySalesRollup, [Order.organization_id]),
+        (PartnerDailyRevenue, [Order.organization_id, Order.partner_id]),
+    ):
+        scope = []
+        if org_id is not None:
+            scope.append(table.organization_id == org_id)
+        if since is not None:
+            scope.append(table.day >= since)
+        db.execute(delete(table).where(*scope))
+        result = db.execute(
+            insert(table).from_select(
+                [column.key for column in group] + ["day", "order_count", "total"],
+                select(
+                    *group,
+                    day,
+                    func.count(),
+                    func.coalesce(func.sum(Order.grand_total), 0),
+                )
+                .where(*source_scope)
+                .group_by(*group, day),
+            )
+        )
+        if table is DailySalesRollup:
+            rows = result.rowcount
+    refresh_revenue_windows(db, org_id)
+    return rows
+
+
+def refresh_revenue_windows(
+    db: Session, org_id: UUID | None = None, today: date | None = None
+) -> int:
+    """Recompute ``customer_revenue_windows`` from ``partner_daily_revenue``.
+
+    Order writes keep the windows current between runs; this drops the days
+    that have slid out of each window, so schedule it daily.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    scope = []
+    source_scope = []
+    if org_id is not None:
+        scope.append(CustomerRevenueWindow.organization_id == org_id)
+        source_scope.append(PartnerDailyRevenue.organization_id == org_id)
+
+    db.execute(delete(CustomerRevenueWindow).where(*scope))
+    rows = 0
+    for window in settings.LEADERBOARD_WINDOWS:
+        result = db.execute(
+            insert(CustomerRevenueWindow).from_select(
+                ["organization_id", "window_days", "partner_id", "order_count", "revenue"],
+                select(
+                    PartnerDailyRevenue.organization_id,
+                    literal(window),
+                    PartnerDailyRevenue.partner_id,
+                    func.sum(PartnerDailyRevenue.order_count),
+                    func.sum(PartnerDailyRevenue.total),
+                )
+                .where(
+                    *source_scope,
+                    PartnerDailyRevenue.day > today - timedelta(days=window),
+                )
+                .group_by(PartnerDailyRevenue.organization_id, PartnerDailyRevenue.partner_id)
+                .having(func.sum(PartnerDailyRevenue.order_count) != 0),
+            )
+        )
+        rows += result.rowcount
+    notify_on_commit(db, "orders", org_id)
+    db.commit()
+    return rows
+
+
+def get_top_customers(
+    db: Session, org_id: UUID, window_days: int | None = None, limit: int = 5
+) -> list[dict]:
+    """Top partners by revenue over a window, read off the ranking index."""
+    window_days = window_days or settings.LEADERBOARD_WINDOWS[0]
+    top = (
+        select(CustomerRevenueWindow)
+        .where(
+            CustomerRevenueWindow.organization_id == org_id,
+            CustomerRevenueWindow.window_days == window_days,
+            CustomerRevenueWindow.order_count > 0,
+        )
+        .order_by(CustomerRevenueWindow.revenue.desc())
+        .limit(limit)
+        .subquery()
+    )
+    rows = db.execute(
+        select(top, Partner.name)
+        .join(Partner, Partner.id == top.c.partner_id)
+        .order_by(top.c.revenue.desc())
+    ).all()
+    return [
+        {
+            "partner_id": row.partner_id,
+            "name": row.name,
+            "revenue": row.revenue,
+            "order_count": row.order_count,
+        }
+        for row in rows
+    ]
+
+
+def get_daily_sales(db: Session, org_id: UUID, start: date, end: date) -> dict[date, Decimal]:
+    rows = db.execute(
+        select(DailySalesRollup.day, DailySalesRollup.total).where(
+            DailySalesRollup.organization_id == org_id,
+            DailySalesRollup.day >= start,
+            DailySalesRollup.day <= end,
+        )
+    )
+    return {row.day: row.total for row in rows}
@@ -0,0 +1,23 @@
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.sequence import DocumentSequence
+
+
+def allocate_block(db: Session, org_id: UUID, name: str, count: int) -> int:
+    """Reserve ``count`` consecutive numbers and return the first.
+
+    One upsert per block, so a batch of documents takes the counter row's
+    lock once. Allocate in the transaction that writes the documents, so a
+    rollback returns the numbers, and commit promptly, since other
+    allocators wait on that lock until then.
+    """
+    table = DocumentSequence.__table__
+    stmt = upsert(db, table).values(organization_id=org_id, name=name, next_value=1 + count)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["organization_id", "name"],
+        set_={"next_value": table.c.next_value + count},
+    ).returning(table.c.next_value)
+    return db.execute(stmt).scalar_one() - count
@@ -0,0 +1,226 @@
+"""Parse bank statements (CSV exports and SWIFT MT940) into plain lines."""
+
+import csv
+import io
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Iterator
+
+
+class StatementParseError(ValueError):
+    def __init__(self, line: int, reason: str):
+        super().__init__(f"line {line}: {reason}")
+        self.line = line
+        self.reason = reason
+
+
+@dataclass(slots=True)
+class StatementLine:
+    line: int
+    transaction_date: date
+    # Signed: positive money in, negative money out.
+    amount: Decimal
+    description: str
+    counterparty_name: str | None = None
+    counterparty_iban: str | None = None
+    counterparty_tax_number: str | None = None
+    # The bank's own id for the entry, when the format carries one.
+    reference: str | None = None
+
+
+IBAN_RE = re.compile(r"\b([A-Z]{2}\d{2}(?: ?[A-Z0-9]){11,30})\b")
+TAX_NUMBER_RE = re.compile(r"\b(?:VKN|TCKN|VN|VERGI NO)[:.\s]*(\d{10,11})\b", re.IGNORECASE)
+
+CSV_COLUMNS = {
+    "date": ("date", "tarih", "transaction_date", "islem_tarihi", "value_date"),
+    "amount": ("amount", "tutar"),
+    "credit": ("credit", "alacak"),
+    "debit": ("debit", "borc", "borç"),
+    "description": ("description", "aciklama", "açıklama", "details"),
+    "name": ("name", "counterparty", "karsi_taraf", "unvan"),
+    "iban": ("iban", "counterparty_iban"),
+    "tax_number": ("tax_number", "vkn", "tckn", "vergi_no"),
+    "reference": ("reference", "referans", "ref", "dekont_no", "islem_no"),
+}
+
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y", "%Y%m%d")
+
+
+def normalize_iban(value: str | None) -> str | None:
+    if not value:
+        return None
+    cleaned = re.sub(r"\s+", "", value).upper()
+    return cleaned or None
+
+
+def parse_amount(value: str) -> Decimal:
+    """Parse ``1234.56``, ``1.234,56``, ``1,234.56`` or ``-12,5``."""
+    text = value.strip().replace(" ", "")
+    if "," in text and "." in text:
+        # Whichever separator comes last is the decimal point.
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif "," in text:
+        text = text.replace(",", ".")
+    return Decimal(text)
+
+
+def parse_date(value: str) -> date:
+    value = value.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognised date {value!r}")
+
+
+def _extract_ids(text: str) -> tuple[str | None, str | None]:
+    iban = IBAN_RE.search(text.upper())
+    tax = TAX_NUMBER_RE.search(text)
+    return (
+        normalize_iban(iban.group(1)) if iban else None,
+        tax.group(1) if tax else None,
+    )
+
+
+def _csv_field_map(header: list[str]) -> dict[str, int]:
+    positions = {name.strip().lower(): i for i, name in enumerate(header)}
+    fields = {}
+    for field, aliases in CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in positions:
+                fields[field] = positions[alias]
+                break
+    if "date" not in fields or not ("amount" in fields or "credit" in fields or "debit" in fields):
+        raise StatementParseError(1, "header needs a date and an amount or credit/debit column")
+    return fields
+
+
+def parse_csv(text: str) -> Iterator[StatementLine]:
+    first_line = text.split("\n", 1)[0]
+    delimiter = max(";,\t", key=first_line.count)
+    reader = csv.reader(io.StringIO(text), delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        return
+    fields = _csv_field_map(header)
+
+    def cell(row: list[str], field: str) -> str:
+        index = fields.get(field)
+        return row[index].strip() if index is not None and index < len(row) else ""
+
+    for number, row in enumerate(reader, start=2):
+        if not any(value.strip() for value in row):
+            continue
+        try:
+            if "amount" in fields:
+                amount = parse_amount(cell(row, "amount"))
+            else:
+                credit, debit = cell(row, "credit"), cell(row, "debit")
+                amount = (parse_amount(credit) if credit else 0) - (
+                    parse_amount(debit) if debit else 0
+                )
+            line_date = parse_date(cell(row, "date"))
+        except (InvalidOperation, ValueError) as exc:
+            raise StatementParseError(number, str(exc) or "invalid amount") from None
+        description = cell(row, "description")
+        iban, tax_number = _extract_ids(description)
+        yield StatementLine(
+            line=number,
+            transaction_date=line_date,
+            amount=amount,
+            description=description,
+            counterparty_name=cell(row, "name") or None,
+            counterparty_iban=normalize_iban(cell(row, "iban")) or iban,
+            counterparty_tax_number=cell(row, "tax_number") or tax_number,
+            reference=cell(row, "reference") or None,
+        )
+
+
+MT940_TAG_RE = re.compile(r"^:(\d{2}[A-Z]?):")
+MT940_61_RE = re.compile(
+    r"^(?P<date>\d{6})(?P<entry>\d{4})?(?P<mark>R?[CD])[A-Z]?(?P<amount>\d+,\d*)"
+    r"(?:[NSF][A-Z0-9]{3}(?P<customer_ref>[^/]*)(?://(?P<bank_ref>\S+))?)?"
+)
+MT940_NAME_RE = re.compile(r"\?3[23]([^?]*)")
+MT940_SUBFIELD_RE = re.compile(r"\?\d{2}")
+
+
+def parse_mt940(text: str) -> Iterator[StatementLine]:
+    """Yield one line per ``:61:`` entry, described by the ``:86:`` that follows."""
+    pending: tuple[int, date, Decimal, str | None] | None = None
+    info: list[str] = []
+    tag = None
+
+    def flush() -> StatementLine | None:
+        if pending is None:
+            return None
+        number, line_date, amount, reference = pending
+        raw = "".join(part.strip() for part in info)
+        names = [name.strip() for name in MT940_NAME_RE.findall(raw)]
+        # Drop the ``?20``-style subfield codes so ids and order numbers stand alone.
+        description = " ".join(MT940_SUBFIELD_RE.sub(" ", raw).split())
+        iban, tax_number = _extract_ids(description)
+        return StatementLine(
+            line=number,
+            transaction_date=line_date,
+            amount=amount,
+            description=description,
+            counterparty_name=" ".join(names) or None,
+            counterparty_iban=iban,
+            counterparty_tax_number=tax_number,
+            reference=reference,
+        )
+
+    for number, raw in enumerate(text.splitlines(), start=1):
+        line = raw.rstrip()
+        match = MT940_TAG_RE.match(line)
+        if match:
+            tag = match.group(1)
+            body = line[match.end():]
+            if tag == "61":
+                entry = flush()
+                if entry is not None:
+                    yield entry
+                info = []
+                fields = MT940_61_RE.match(body)
+                if not fields:
+                    raise StatementParseError(number, "malformed :61: entry")
+                amount = parse_amount(fields.group("amount"))
+                if fields.group("mark") in ("D", "RC"):
+                    amount = -amount
+                line_date = datetime.strptime(fields.group("date"), "%y%m%d").date()
+                customer_ref = (fields.group("customer_ref") or "").strip()
+                reference = fields.group("bank_ref") or (
+                    customer_ref if customer_ref and customer_ref != "NONREF" else None
+                )
+                pending = (number, line_date, amount, reference)
+            elif tag == "86" and pending is not None:
+                info.append(body)
+            elif tag in ("62F", "62M", "20"):
+                entry = flush()
+                if entry is not None:
+                    yield entry
+                pending, info = None, []
+        elif tag == "86" and pending is not None and line and not line.startswith("-"):
+            info.append(line)
+    entry = flush()
+    if entry is not None:
+        yield entry
+
+
+def detect_format(filename: str | None, text: str) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".sta", ".mt940", ".940")) or ":61:" in text[:4000]:
+        return "mt940"
+    return "csv"
+
+
+def parse_statement(text: str, format: str) -> list[StatementLine]:
+    parser = parse_mt940 if format == "mt940" else parse_csv
+    return list(parser(text))
@@ -0,0 +1,365 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Sequence
+from uuid import UUID, uuid4
+
+from sqlalchemy import case, func, insert, select, true, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import notify_on_commit
+from app.db.upsert import upsert
+from app.models.product import Product
+from app.models.stock import StockBalance, StockMovement, StockReservation
+from app.models.warehouse import Warehouse
+from app.services.valuation_service import cost_movements
+
+
+class StockServiceError(Exception):
+    pass
+
+
+class InsufficientStock(StockServiceError):
+    code = "insufficient_stock"
+
+    def __init__(self, shortages: list[dict]):
+        super().__init__(self.code)
+        self.shortages = shortages
+
+
+class StockReserved(InsufficientStock):
+    """The batch would draw on stock already reserved for confirmed orders."""
+
+    code = "stock_reserved"
+
+
+# Rows per multi-row INSERT when posting movement batches.
+MOVEMENT_CHUNK_SIZE = 1000
+
+
+def signed_quantity(direction: str, quantity: Decimal) -> Decimal:
+    return quantity if direction == "IN" else -quantity
+
+
+def movement_sum():
+    """SQL net quantity of the grouped movements: ``IN`` adds, ``OUT`` subtracts."""
+    return func.coalesce(
+        func.sum(
+            case(
+                (StockMovement.direction == "IN", StockMovement.quantity),
+                else_=-StockMovement.quantity,
+            )
+        ),
+        0,
+    )
+
+
+def apply_balance_deltas(
+    db: Session, org_id: UUID, deltas: dict[tuple[UUID, UUID], Decimal]
+) -> None:
+    """Add ``(product_id, warehouse_id) -> delta`` to ``stock_balances``.
+
+    Runs in the caller's transaction, so balances commit or roll back with
+    the movements that produced them. All pairs go out as one multi-row
+    upsert; new rows pick up the product's current restock level.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    product_ids = {product_id for product_id, _ in deltas}
+    restock = dict(
+        db.execute(
+            select(Product.id, Product.restock_level).where(
+                Product.id.in_(product_ids), Product.organization_id == org_id
+            )
+        ).all()
+    )
+    if len(restock) != len(product_ids):
+        raise StockServiceError("product_not_found")
+
+    # Key order is lock order, so concurrent batches cannot deadlock.
+    rows = [
+        {
+            "product_id": product_id,
+            "warehouse_id": warehouse_id,
+            "organization_id": org_id,
+            "quantity": delta,
+            "restock_level": restock[product_id],
+        }
+        for (product_id, warehouse_id), delta in sorted(deltas.items(), key=lambda kv: kv[0])
+    ]
+    stmt = upsert(db, StockBalance.__table__).values(rows)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["product_id", "warehouse_id"],
+            set_={
+                "quantity": StockBalance.quantity + stmt.excluded.quantity,
+                "version": StockBalance.version + 1,
+                "updated_at_utc": func.now(),
+            },
+        )
+    )
+    notify_on_commit(db, "stock", org_id)
+
+
+def _stamped(count: int) -> list[dict]:
+    """Ids and timestamps for a batch, a microsecond apart in posting order.
+
+    Costing replays movements by ``created_at_utc``; distinct stamps keep a
+    batch's INs and OUTs in the order they were posted.
+    """
+    now = datetime.now(timezone.utc)
+    return [
+        {"id": uuid4(), "created_at_utc": now + timedelta(microseconds=i)} for i in range(count)
+    ]
+
+
+def post_movements(db: Session, org_id: UUID, movements: Sequence[dict]) -> dict:
+    """Record a batch of movements, refusing any that would leave stock negative.
+
+    Movements are netted per ``(product, warehouse)`` and the balances moved
+    first with one sorted multi-row upsert, which also row-locks them until
+    commit. One query then finds every pair the batch took below zero, or
+    below what confirmed orders hold reserved; if there are any, nothing is
+    written and :class:`InsufficientStock` (or :class:`StockReserved` when
+    only reserved stock was touched) lists them. Otherwise the movements go in with multi-row INSERTs of
+    ``MOVEMENT_CHUNK_SIZE`` rows, are costed, and everything commits together.
+    """
+    warehouse_ids = {movement["warehouse_id"] for movement in movements}
+    active = set(
+        db.scalars(
+            select(Warehouse.id).where(
+                Warehouse.id.in_(warehouse_ids),
+                Warehouse.organization_id == org_id,
+                Warehouse.is_active.is_(True),
+            )
+        )
+    )
+    if active != warehouse_ids:
+        raise StockServiceError("warehouse_not_found")
+
+    deltas: dict[tuple[UUID, UUID], Decimal] = defaultdict(lambda: Decimal("0"))
+    for movement in movements:
+        key = (movement["product_id"], movement["warehouse_id"])
+        deltas[key] += signed_quantity(movement["direction"], movement["quantity"])
+    try:
+        apply_balance_deltas(db, org_id, deltas)
+    except StockServiceError:
+        db.rollback()
+        raise
+
+    key = tuple_(StockBalance.product_id, StockBalance.warehouse_id)
+    drawn = [pair for pair, delta in deltas.items() if delta < 0]
+    if drawn:
+        shortages = [
+            row._asdict()
+            for row in db.execute(
+                select(
+                    StockBalance.product_id,
+                    StockBalance.warehouse_id,
+                    StockBalance.quantity,
+                    StockBalance.reserved_quantity,
+                )
+                .where(key.in_(drawn), StockBalance.quantity < StockBalance.reserved_quantity)
+                .order_by(StockBalance.product_id, StockBalance.warehouse_id)
+            )
+        ]
+        if shortages:
+            db.rollback()
+            if any(row["quantity"] < 0 for row in shortages):
+                raise InsufficientStock(shortages)
+            raise StockReserved(shortages)
+
+    rows = [
+        {
+            **stamp,
+            "product_id": movement["product_id"],
+            "warehouse_id": movement["warehouse_id"],
+            "direction": movement["direction"],
+            "quantity": movement["quantity"],
+            "unit_cost": movement.get("unit_cost"),
+            "reason": movement.get("reason"),
+            "document_no": movement.get("document_no"),
+        }
+        for stamp, movement in zip(_stamped(len(movements)), movements)
+    ]
+    for start in range(0, len(rows), MOVEMENT_CHUNK_SIZE):
+        db.execute(insert(StockMovement), rows[start : start + MOVEMENT_CHUNK_SIZE])
+    cost_movements(db, org_id, rows, deltas)
+    balances = db.execute(
+        select(StockBalance.product_id, StockBalance.warehouse_id, StockBalance.quantity)
+        .where(key.in_(list(deltas)))
+        .order_by(StockBalance.product_id, StockBalance.warehouse_id)
+    ).all()
+    db.commit()
+    return {"recorded": len(rows), "balances": balances}
+
+
+def get_product_stock(db: Session, org_id: UUID, product_id: UUID) -> list:
+    """The product's balance rows, one per warehouse that has held it."""
+    return db.execute(
+        select(StockBalance.product_id, StockBalance.warehouse_id, StockBalance.quantity)
+        .where(StockBalance.organization_id == org_id, StockBalance.product_id == product_id)
+        .order_by(StockBalance.warehouse_id)
+    ).all()
+
+
+def sync_restock_level(
+    db: Session, org_id: UUID, product_id: UUID, restock_level: Decimal
+) -> None:
+    """Copy a product's new restock level onto its balance rows."""
+    notify_on_commit(db, "stock", org_id)
+    db.execute(
+        update(StockBalance)
+        .where(StockBalance.product_id == product_id)
+        .values(restock_level=restock_level)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def get_low_stock(db: Session, org_id: UUID, limit: int = 20) -> list[dict]:
+    """Balances below their restock level, largest shortfall first.
+
+    The balance columns come straight from the partial ``ix_stock_balances_low``
+    index; products are joined only for the rows returned.
+    """
+    low = (
+        select(
+            StockBalance.product_id,
+            StockBalance.warehouse_id,
+            StockBalance.quantity,
+            StockBalance.restock_level,
+        )
+        .where(
+            StockBalance.organization_id == org_id,
+            StockBalance.quantity < StockBalance.restock_level,
+        )
+        .order_by((StockBalance.restock_level - StockBalance.quantity).desc())
+        .limit(limit)
+        .subquery()
+    )
+    rows = db.execute(
+        select(low, Product.sku, Product.name)
+        .join(Product, Product.id == low.c.product_id)
+        .order_by((low.c.restock_level - low.c.quantity).desc())
+    ).all()
+    return [
+        {
+            "product_id": row.product_id,
+            "sku": row.sku,
+            "name": row.name,
+            "warehouse_id": row.warehouse_id,
+            "quantity": row.quantity,
+            "restock_level": row.restock_level,
+        }
+        for row in rows
+    ]
+
+
+def find_balance_drift(db: Session, org_id: UUID | None = None) -> list[dict]:
+    """Pairs whose stored balance differs from the sum of their movements."""
+    source = (
+        select(
+            StockMovement.product_id,
+            StockMovement.warehouse_id,
+            movement_sum().label("quantity"),
+        )
+        .join(Product, Product.id == StockMovement.product_id)
+        .group_by(StockMovement.product_id, StockMovement.warehouse_id)
+    )
+    balances = select(
+        StockBalance.product_id, StockBalance.warehouse_id, StockBalance.quantity
+    )
+    if org_id is not None:
+        source = source.where(Product.organization_id == org_id)
+        balances = balances.where(StockBalance.organization_id == org_id)
+
+    expected = {(r.product_id, r.warehouse_id): Decimal(r.quantity) for r in db.execute(source)}
+    stored = {(r.product_id, r.warehouse_id): Decimal(r.quantity) for r in db.execute(balances)}
+    drift = []
+    for key in expected.keys() | stored.keys():
+        want = expected.get(key, Decimal("0"))
+        have = stored.get(key, Decimal("0"))
+        if want != have:
+            drift.append(
+                {"product_id": key[0], "warehouse_id": key[1], "expected": want, "stored": have}
+            )
+    return drift
+
+
+def rebuild_stock_balances(db: Session, org_id: UUID | None = None) -> int:
+    """Recompute ``stock_balances`` quantities from ``stock_movements``.
+
+    Rows are corrected in place: the valuation columns are kept and
+    ``version`` is bumped rather than reset, so reservations planned against
+    the old figures re-plan instead of passing a stale version check.
+    Returns the number of pairs with movements.
+    """
+    quantity = movement_sum()
+    source = (
+        select(
+            StockMovement.product_id,
+            StockMovement.warehouse_id,
+            Product.organization_id,
+            quantity,
+            Product.restock_level,
+        )
+        .join(Product, Product.id == StockMovement.product_id)
+        # SQLite needs a WHERE to parse INSERT ... SELECT ... ON CONFLICT.
+        .where(true())
+        .group_by(
+            StockMovement.product_id,
+            StockMovement.warehouse_id,
+            Product.organization_id,
+            Product.restock_level,
+        )
+    )
+    scope = []
+    if org_id is not None:
+        source = source.where(Product.organization_id == org_id)
+        scope.append(StockBalance.organization_id == org_id)
+
+    stmt = upsert(db, StockBalance.__table__).from_select(
+        ["product_id", "warehouse_id", "organization_id", "quantity", "restock_level"],
+        source,
+    )
+    result = db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["product_id", "warehouse_id"],
+            set_={
+                "quantity": stmt.excluded.quantity,
+                "restock_level": stmt.excluded.restock_level,
+                "version": StockBalance.__table__.c.version + 1,
+                "updated_at_utc": func.now(),
+            },
+        )
+    )
+    # Pairs whose movements are all gone hold nothing.
+    moved = select(StockMovement.id).where(
+        StockMovement.product_id == StockBalance.product_id,
+        StockMovement.warehouse_id == StockBalance.warehouse_id,
+    )
+    db.execute(
+        update(StockBalance)
+        .where(*scope, StockBalance.quantity != 0, ~moved.exists())
+        .values(quantity=0, version=StockBalance.version + 1, updated_at_utc=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    # Reservations are not movements; recompute them from their own rows.
+    reserved = (
+        select(func.sum(StockReservation.quantity))
+        .where(
+            StockReservation.product_id == StockBalance.product_id,
+            StockReservation.warehouse_id == StockBalance.warehouse_id,
+        )
+        .scalar_subquery()
+    )
+    db.execute(
+        update(StockBalance)
+        .where(*scope)
+        .values(reserved_quantity=func.coalesce(reserved, 0))
+        .execution_options(synchronize_session=False)
+    )
+    notify_on_commit(db, "stock", org_id)
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,231 @@
+"""Historical stock on hand from per-pair snapshots.
+
+``stock_balances`` only holds the quantity now. A scheduled run snapshots
+each ``(product, warehouse)`` pair at the end of every UTC day it moved, so
+the quantity on any day is the pair's nearest earlier snapshot plus the
+movements after it, which the ``ix_stock_movements_pair_created`` index
+reads as one short range. Compaction thins snapshots older than
+``STOCK_SNAPSHOT_KEEP_DAILY_DAYS`` to the last one of each month.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.upsert import upsert
+from app.models.product import Product
+from app.models.stock import StockMovement, StockSnapshot
+from app.services.rollup_service import utc_day_end_expr, utc_day_expr
+from app.services.stock_service import movement_sum
+
+# Rows per multi-row statement when writing or deleting snapshots.
+SNAPSHOT_CHUNK_SIZE = 1000
+
+# Movements are stamped when posted but only visible once their transaction
+# commits. A day is snapshotted only after it has been over this long, so no
+# posting stamped inside it can still be in flight.
+SETTLE_MARGIN = timedelta(minutes=10)
+
+Pair = tuple[UUID, UUID]
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _latest(
+    org_id: UUID | None,
+    on_or_before: date | None = None,
+    product_id: UUID | None = None,
+    warehouse_id: UUID | None = None,
+):
+    """Each pair's latest snapshot, as a subquery with its quantity."""
+    scope = []
+    if org_id is not None:
+        scope.append(StockSnapshot.organization_id == org_id)
+    if on_or_before is not None:
+        scope.append(StockSnapshot.snapshot_date <= on_or_before)
+    if product_id is not None:
+        scope.append(StockSnapshot.product_id == product_id)
+    if warehouse_id is not None:
+        scope.append(StockSnapshot.warehouse_id == warehouse_id)
+    latest = (
+        select(
+            StockSnapshot.product_id,
+            StockSnapshot.warehouse_id,
+            func.max(StockSnapshot.snapshot_date).label("snapshot_date"),
+        )
+        .where(*scope)
+        .group_by(StockSnapshot.product_id, StockSnapshot.warehouse_id)
+        .subquery()
+    )
+    return (
+        select(
+            StockSnapshot.product_id,
+            StockSnapshot.warehouse_id,
+            StockSnapshot.snapshot_date,
+            StockSnapshot.quantity,
+        )
+        .join(
+            latest,
+            (StockSnapshot.product_id == latest.c.product_id)
+            & (StockSnapshot.warehouse_id == latest.c.warehouse_id)
+            & (StockSnapshot.snapshot_date == latest.c.snapshot_date),
+        )
+        .subquery()
+    )
+
+
+def _movements_after(
+    db: Session,
+    latest,
+    org_id: UUID | None,
+    through: date,
+    product_id: UUID | None = None,
+    warehouse_id: UUID | None = None,
+    by_day: bool = False,
+):
+    """Movement sums per pair after its latest snapshot, up to the end of ``through``."""
+    columns = [StockMovement.product_id, StockMovement.warehouse_id, Product.organization_id]
+    if by_day:
+        columns.append(utc_day_expr(db, StockMovement.created_at_utc).label("day"))
+    stmt = (
+        select(*columns, movement_sum().label("quantity"))
+        .join(Product, Product.id == StockMovement.product_id)
+        .outerjoin(
+            latest,
+            (latest.c.product_id == StockMovement.product_id)
+            & (latest.c.warehouse_id == StockMovement.warehouse_id),
+        )
+        .where(
+            StockMovement.created_at_utc < _day_start(through + timedelta(days=1)),
+            or_(
+                latest.c.snapshot_date.is_(None),
+                StockMovement.created_at_utc >= utc_day_end_expr(db, latest.c.snapshot_date),
+            ),
+        )
+        .group_by(*columns)
+    )
+    if org_id is not None:
+        stmt = stmt.where(Product.organization_id == org_id)
+    if product_id is not None:
+        stmt = stmt.where(StockMovement.product_id == product_id)
+    if warehouse_id is not None:
+        stmt = stmt.where(StockMovement.warehouse_id == warehouse_id)
+    if by_day:
+        stmt = stmt.order_by(columns[-1])
+    return db.execute(stmt)
+
+
+def take_stock_snapshots(
+    db: Session, org_id: UUID | None = None, through: date | None = None
+) -> int:
+    """Snapshot every pair at the end of each day it moved, up to ``through``.
+
+    Each pair continues from its latest snapshot, so a scheduled run reads
+    only the movements since the previous run; the first run backfills the
+    whole history. ``through`` defaults to yesterday (UTC) and is held back
+    to the last day that ended more than :data:`SETTLE_MARGIN` ago; a later
+    run picks up the days skipped. Nothing is locked, so postings carry on
+    while the history is read. Returns the number of snapshots written.
+    Commits.
+    """
+    settled = (datetime.now(timezone.utc) - SETTLE_MARGIN).date() - timedelta(days=1)
+    through = min(through or settled, settled)
+
+    latest = _latest(org_id)
+    running: dict[Pair, Decimal] = {
+        (row.product_id, row.warehouse_id): Decimal(row.quantity)
+        for row in db.execute(select(latest))
+    }
+    rows = []
+    for row in _movements_after(db, latest, org_id, through, by_day=True):
+        pair = (row.product_id, row.warehouse_id)
+        running[pair] = running.get(pair, Decimal("0")) + Decimal(row.quantity)
+        rows.append(
+            {
+                "product_id": row.product_id,
+                "warehouse_id": row.warehouse_id,
+                "snapshot_date": row.day,
+                "organization_id": row.organization_id,
+                "quantity": running[pair],
+            }
+        )
+
+    for start in range(0, len(rows), SNAPSHOT_CHUNK_SIZE):
+        stmt = upsert(db, StockSnapshot.__table__)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["product_id", "warehouse_id", "snapshot_date"],
+                set_={"quantity": stmt.excluded.quantity, "updated_at_utc": func.now()},
+            ),
+            rows[start : start + SNAPSHOT_CHUNK_SIZE],
+        )
+    db.commit()
+    return len(rows)
+
+
+def compact_stock_snapshots(
+    db: Session,
+    org_id: UUID | None = None,
+    keep_daily_days: int | None = None,
+    today: date | None = None,
+) -> int:
+    """Keep only each pair's last snapshot per month before the daily window.
+
+    The last snapshot of a month is also the pair's month-end quantity, so
+    an ``as_of`` query in compacted history adds at most a month of that
+    pair's movements. Returns the number of snapshots deleted. Commits.
+    """
+    if keep_daily_days is None:
+        keep_daily_days = settings.STOCK_SNAPSHOT_KEEP_DAILY_DAYS
+    cutoff = (today or datetime.now(timezone.utc).date()) - timedelta(days=keep_daily_days)
+    stmt = select(
+        StockSnapshot.product_id, StockSnapshot.warehouse_id, StockSnapshot.snapshot_date
+    ).where(StockSnapshot.snapshot_date < cutoff)
+    if org_id is not None:
+        stmt = stmt.where(StockSnapshot.organization_id == org_id)
+
+    months: dict[tuple[UUID, UUID, int, int], list[date]] = defaultdict(list)
+    for product_id, warehouse_id, snapshot_date in db.execute(stmt):
+        months[(product_id, warehouse_id, snapshot_date.year, snapshot_date.month)].append(
+            snapshot_date
+        )
+    doomed = [
+        (product_id, warehouse_id, day)
+        for (product_id, warehouse_id, _, _), days in months.items()
+        for day in sorted(days)[:-1]
+    ]
+    key = tuple_(StockSnapshot.product_id, StockSnapshot.warehouse_id, StockSnapshot.snapshot_date)
+    for start in range(0, len(doomed), SNAPSHOT_CHUNK_SIZE):
+        db.execute(delete(StockSnapshot).where(key.in_(doomed[start : start + SNAPSHOT_CHUNK_SIZE])))
+    db.commit()
+    return len(doomed)
+
+
+def stock_as_of(
+    db: Session,
+    org_id: UUID,
+    day: date,
+    product_id: UUID | None = None,
+    warehouse_id: UUID | None = None,
+) -> list[dict]:
+    """On-hand quantity per pair at the end of ``day`` (UTC); empty pairs are omitted."""
+    latest = _latest(org_id, day, product_id, warehouse_id)
+    quantities: dict[Pair, Decimal] = {
+        (row.product_id, row.warehouse_id): Decimal(row.quantity)
+        for row in db.execute(select(latest))
+    }
+    for row in _movements_after(db, latest, org_id, day, product_id, warehouse_id):
+        pair = (row.product_id, row.warehouse_id)
+        quantities[pair] = quantities.get(pair, Decimal("0")) + Decimal(row.quantity)
+    return [
+        {"product_id": product_id, "warehouse_id": warehouse_id, "quantity": quantity}
+        for (product_id, warehouse_id), quantity in sorted(quantities.items())
+        if quantity
+    ]
@@ -0,0 +1,293 @@
+"""Inventory valuation under FIFO and moving weighted average costing.
+
+Every IN opens a cost layer at its ``unit_cost`` (or, without one, at the
+pair's current average cost); every OUT consumes the oldest open layers.
+``stock_balances`` carries each pair's value under both methods, so the
+valuation report is a grouped read of the balances. Postings cost their
+movements incrementally in their own transaction, loading only the open
+layers of the pairs they draw from; :func:`recompute_valuation` replays
+the whole history in chunks to backfill or repair.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Sequence
+from uuid import UUID, uuid4
+
+from sqlalchemy import bindparam, delete, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.product import Product
+from app.models.stock import StockBalance, StockCostLayer, StockMovement
+
+VALUATION_METHODS = ("fifo", "average")
+
+# Rows per multi-row statement when writing layers and values.
+WRITE_CHUNK_SIZE = 1000
+
+Pair = tuple[UUID, UUID]
+
+
+def _money(value: Decimal) -> Decimal:
+    return value.quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
+
+
+@dataclass
+class _Layer:
+    id: UUID
+    remaining: Decimal
+    unit_cost: Decimal
+    written: bool
+
+
+@dataclass
+class _PairCost:
+    quantity: Decimal = Decimal("0")
+    average_value: Decimal = Decimal("0")
+    fifo_value: Decimal = Decimal("0")
+    layers: deque = field(default_factory=deque)
+
+
+class _Costing:
+    """Costs a stream of movements and collects the writes it implies."""
+
+    def __init__(self):
+        self.pairs: dict[Pair, _PairCost] = {}
+        self.new_layers: list[dict] = []
+        self.consumed: dict[UUID, _Layer] = {}
+        self.sequence = 0
+
+    def apply(self, movement, organization_id: UUID) -> None:
+        pair = self.pairs.setdefault(
+            (movement["product_id"], movement["warehouse_id"]), _PairCost()
+        )
+        quantity = Decimal(movement["quantity"])
+        if movement["direction"] == "IN":
+            unit_cost = movement.get("unit_cost")
+            if unit_cost is None:
+                unit_cost = pair.average_value / pair.quantity if pair.quantity > 0 else 0
+            unit_cost = Decimal(unit_cost)
+            layer = _Layer(uuid4(), quantity, unit_cost, written=False)
+            pair.layers.append(layer)
+            pair.quantity += quantity
+            pair.average_value += quantity * unit_cost
+            pair.fifo_value += quantity * unit_cost
+            self.sequence += 1
+            self.new_layers.append(
+                {
+                    "id": layer.id,
+                    "organization_id": organization_id,
+                    "product_id": movement["product_id"],
+                    "warehouse_id": movement["warehouse_id"],
+                    "movement_id": movement["id"],
+                    "received_at_utc": movement["created_at_utc"],
+                    "sequence": self.sequence,
+                    "quantity": quantity,
+                    "unit_cost": unit_cost,
+                    "layer": layer,
+                }
+            )
+            return
+
+        if pair.quantity > 0:
+            share = min(quantity, pair.quantity) / pair.quantity
+            pair.average_value -= pair.average_value * share
+        pair.quantity -= quantity
+        if pair.quantity <= 0:
+            pair.average_value = Decimal("0")
+        # Stock received before costing existed has no layers; it goes out at zero.
+        while quantity > 0 and pair.layers:
+            layer = pair.layers[0]
+            take = min(quantity, layer.remaining)
+            layer.remaining -= take
+            quantity -= take
+            pair.fifo_value -= take * layer.unit_cost
+            if layer.written:
+                self.consumed[layer.id] = layer
+            if layer.remaining <= 0:
+                pair.layers.popleft()
+
+    def flush_layers(self, db: Session) -> None:
+        """Write the layers opened and the remaining quantities changed so far."""
+        rows = [
+            {
+                **{key: value for key, value in row.items() if key != "layer"},
+                "remaining_quantity": row["layer"].remaining,
+            }
+            for row in self.new_layers
+        ]
+        for start in range(0, len(rows), WRITE_CHUNK_SIZE):
+            db.execute(insert(StockCostLayer), rows[start : start + WRITE_CHUNK_SIZE])
+        for row in self.new_layers:
+            row["layer"].written = True
+        self.new_layers = []
+
+        if self.consumed:
+            table = StockCostLayer.__table__
+            db.execute(
+                update(table)
+                .where(table.c.id == bindparam("layer_id"))
+                .values(remaining_quantity=bindparam("remaining")),
+                [
+                    {"layer_id": layer.id, "remaining": layer.remaining}
+                    for layer in self.consumed.values()
+                ],
+            )
+            self.consumed = {}
+
+    def flush_values(self, db: Session) -> None:
+        table = StockBalance.__table__
+        params = [
+            {
+                "p": product_id,
+                "w": warehouse_id,
+                "fifo": _money(pair.fifo_value),
+                "average": _money(pair.average_value),
+            }
+            for (product_id, warehouse_id), pair in sorted(self.pairs.items())
+        ]
+        for start in range(0, len(params), WRITE_CHUNK_SIZE):
+            db.execute(
+                update(table)
+                .where(
+                    table.c.product_id == bindparam("p"), table.c.warehouse_id == bindparam("w")
+                )
+                .values(fifo_value=bindparam("fifo"), average_value=bindparam("average")),
+                params[start : start + WRITE_CHUNK_SIZE],
+            )
+
+
+def cost_movements(
+    db: Session,
+    org_id: UUID,
+    movements: Sequence[dict],
+    deltas: dict[Pair, Decimal],
+) -> None:
+    """Cost freshly inserted movements and update their pairs' values.
+
+    Call after the balances have taken the batch (``deltas`` is what they
+    moved by, per pair) and while their rows are still locked. Runs in the
+    caller's transaction.
+    """
+    pairs = list(deltas)
+    costing = _Costing()
+    for row in db.execute(
+        select(
+            StockBalance.product_id,
+            StockBalance.warehouse_id,
+            StockBalance.quantity,
+            StockBalance.average_value,
+            StockBalance.fifo_value,
+        ).where(tuple_(StockBalance.product_id, StockBalance.warehouse_id).in_(pairs))
+    ):
+        costing.pairs[(row.product_id, row.warehouse_id)] = _PairCost(
+            quantity=Decimal(row.quantity) - deltas[(row.product_id, row.warehouse_id)],
+            average_value=Decimal(row.average_value),
+            fifo_value=Decimal(row.fifo_value),
+        )
+    drawn = sorted(
+        {(m["product_id"], m["warehouse_id"]) for m in movements if m["direction"] == "OUT"}
+    )
+    if drawn:
+        for layer in db.execute(
+            select(
+                StockCostLayer.id,
+                StockCostLayer.product_id,
+                StockCostLayer.warehouse_id,
+                StockCostLayer.remaining_quantity,
+                StockCostLayer.unit_cost,
+            )
+            .where(
+                tuple_(StockCostLayer.product_id, StockCostLayer.warehouse_id).in_(drawn),
+                StockCostLayer.remaining_quantity > 0,
+            )
+            .order_by(StockCostLayer.received_at_utc, StockCostLayer.sequence)
+        ):
+            pair = costing.pairs.setdefault((layer.product_id, layer.warehouse_id), _PairCost())
+            pair.layers.append(
+                _Layer(layer.id, Decimal(layer.remaining_quantity), Decimal(layer.unit_cost), True)
+            )
+    for movement in movements:
+        costing.apply(movement, org_id)
+    costing.flush_layers(db)
+    costing.flush_values(db)
+
+
+def recompute_valuation(
+    db: Session, org_id: UUID | None = None, chunk_size: int | None = None
+) -> int:
+    """Rebuild cost layers and values by replaying every movement in order.
+
+    Movements are streamed ``chunk_size`` at a time; each chunk's layers
+    and layer updates go out as multi-row statements before the next chunk
+    is read, and the pair values are written once at the end. Returns the
+    number of movements replayed. Commits.
+    """
+    chunk_size = chunk_size or settings.VALUATION_CHUNK_SIZE
+    layer_scope, balance_scope = [], []
+    if org_id is not None:
+        layer_scope.append(StockCostLayer.organization_id == org_id)
+        balance_scope.append(StockBalance.organization_id == org_id)
+    # Postings cost against the balances, so locking them keeps postings out.
+    db.execute(
+        select(StockBalance.product_id)
+        .where(*balance_scope)
+        .order_by(StockBalance.product_id, StockBalance.warehouse_id)
+        .with_for_update()
+    ).all()
+    db.execute(delete(StockCostLayer).where(*layer_scope))
+    db.execute(
+        update(StockBalance)
+        .where(*balance_scope)
+        .values(fifo_value=0, average_value=0)
+        .execution_options(synchronize_session=False)
+    )
+
+    stmt = (
+        select(
+            StockMovement.id,
+            StockMovement.product_id,
+            StockMovement.warehouse_id,
+            StockMovement.direction,
+            StockMovement.quantity,
+            StockMovement.unit_cost,
+            StockMovement.created_at_utc,
+            Product.organization_id,
+        )
+        .join(Product, Product.id == StockMovement.product_id)
+        .order_by(StockMovement.created_at_utc, StockMovement.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    if org_id is not None:
+        stmt = stmt.where(Product.organization_id == org_id)
+
+    costing = _Costing()
+    replayed = 0
+    for chunk in db.execute(stmt).partitions():
+        for row in chunk:
+            costing.apply(row._mapping, row.organization_id)
+        replayed += len(chunk)
+        costing.flush_layers(db)
+    costing.flush_values(db)
+    db.commit()
+    return replayed
+
+
+def valuation_report(db: Session, org_id: UUID, method: str = "fifo") -> list:
+    """Quantity and value per warehouse and product category."""
+    value = StockBalance.fifo_value if method == "fifo" else StockBalance.average_value
+    return db.execute(
+        select(
+            StockBalance.warehouse_id,
+            Product.category_id,
+            func.sum(StockBalance.quantity).label("quantity"),
+            func.round(func.sum(value), 2).label("value"),
+        )
+        .join(Product, Product.id == StockBalance.product_id)
+        .where(StockBalance.organization_id == org_id)
+        .group_by(StockBalance.warehouse_id, Product.category_id)
+        .order_by(StockBalance.warehouse_id, Product.category_id)
+    ).all()
+
@@ -0,0 +1,34 @@
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.warehouse import Warehouse
+from app.schemas.stock import WarehouseCreate
+
+
+def create_warehouse(db: Session, org_id: UUID, data: WarehouseCreate) -> Warehouse:
+    warehouse = Warehouse(organization_id=org_id, **data.model_dump())
+    db.add(warehouse)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
+    db.refresh(warehouse)
+    return warehouse
+
+
+def list_warehouses(
+    db: Session, org_id: UUID, page: int, page_size: int
+) -> tuple[Sequence[Warehouse], int]:
+    query = db.query(Warehouse).filter(Warehouse.organization_id == org_id)
+    total = query.count()
+    items = (
+        query.order_by(Warehouse.name.asc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
+    return items, total
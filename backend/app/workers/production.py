@@ -0,0 +1,238 @@
+"""Worker pool that drains the production job queue.
+
+Run one process per shop-floor station::
+
+    python -m app.workers.production --org default --station cutter-1 \\
+        --handler app.workers.production:log_job --mode process --concurrency 4
+"""
+
+import argparse
+import importlib
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable
+from uuid import UUID
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.models.organization import Organization
+from app.models.production_job import ProductionJob
+from app.services.production_service import (
+    ProductionServiceError,
+    claim_jobs,
+    complete_job,
+    requeue_stale_jobs,
+)
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict], object]
+
+
+def log_job(job: dict) -> None:
+    """Default handler: record that the station processed the job."""
+    logger.info("processed production job %s", job["id"])
+
+
+def _job_payload(job: ProductionJob) -> dict:
+    # Plain, picklable data so handlers can run in a process pool.
+    return {
+        "id": str(job.id),
+        "order_item_id": str(job.order_item_id),
+        "quantity_required": str(job.quantity_required),
+        "priority": job.priority,
+        "due_date": job.due_date.isoformat() if job.due_date else None,
+        "attempts": job.attempts,
+    }
+
+
+class WorkerStats:
+    """Thread-safe counters for one pool; latencies keep the last 1000 jobs."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.completed = 0
+        self.failed = 0
+        self.latencies: deque[float] = deque(maxlen=1000)
+
+    def record(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self.latencies.append(latency)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started, 1e-9)
+            ordered = sorted(self.latencies)
+            completed, failed = self.completed, self.failed
+
+        def pct(p: float) -> float | None:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 4)
+
+        return {
+            "completed": completed,
+            "failed": failed,
+            "throughput_per_second": round(completed / elapsed, 3),
+            "latency_seconds": {"p50": pct(50), "p95": pct(95), "max": pct(100)},
+        }
+
+
+class ProductionWorkerPool:
+    """Claim jobs with SKIP LOCKED and run ``handler`` on a thread or process pool.
+
+    The pool keeps at most ``concurrency`` jobs in flight and only claims as
+    many jobs as it has free slots, so several pools (one per station or host)
+    can share the queue without hoarding work.
+    """
+
+    def __init__(
+        self,
+        org_id: UUID,
+        station: str,
+        handler: JobHandler = log_job,
+        mode: str | None = None,
+        concurrency: int | None = None,
+        batch_size: int | None = None,
+        poll_interval: float = 2.0,
+    ) -> None:
+        self.org_id = org_id
+        self.station = station
+        self.handler = handler
+        self.mode = mode or settings.PRODUCTION_WORKER_MODE
+        if self.mode not in ("thread", "process"):
+            raise ValueError("mode must be 'thread' or 'process'")
+        self.concurrency = concurrency or settings.PRODUCTION_WORKER_CONCURRENCY
+        self.batch_size = batch_size or settings.PRODUCTION_CLAIM_BATCH
+        self.poll_interval = poll_interval
+        self.stats = WorkerStats()
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _executor(self) -> Executor:
+        if self.mode == "process":
+            return ProcessPoolExecutor(max_workers=self.concurrency)
+        return ThreadPoolExecutor(max_workers=self.concurrency)
+
+    def _finish(self, job_id: UUID, future: Future, started: float) -> None:
+        error = future.exception()
+        with db_session.SessionLocal() as db:
+            try:
+                complete_job(
+                    db,
+                    self.org_id,
+                    job_id,
+                    self.station,
+                    success=error is None,
+                    error=repr(error) if error else None,
+                )
+            except ProductionServiceError as exc:
+                # The claim was requeued, failed or cancelled while the handler
+                # ran; the job is no longer ours to finish.
+                logger.warning("could not finish production job %s: %s", job_id, exc)
+        self.stats.record(time.monotonic() - started, error is None)
+
+    def run(self, drain: bool = False) -> dict:
+        """Process jobs until stopped; with ``drain`` exit once the queue is empty."""
+        in_flight: dict[Future, tuple[UUID, float]] = {}
+        last_requeue = 0.0
+        with self._executor() as executor:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if now - last_requeue > settings.PRODUCTION_CLAIM_TIMEOUT_SECONDS / 4:
+                    with db_session.SessionLocal() as db:
+                        requeue_stale_jobs(db)
+                    last_requeue = now
+
+                free = self.concurrency - len(in_flight)
+                claimed = []
+                if free > 0:
+                    with db_session.SessionLocal() as db:
+                        claimed = [
+                            (job.id, _job_payload(job))
+                            for job in claim_jobs(
+                                db, self.org_id, self.station, min(free, self.batch_size)
+                            )
+                        ]
+                for job_id, payload in claimed:
+                    future = executor.submit(self.handler, payload)
+                    in_flight[future] = (job_id, time.monotonic())
+
+                if not in_flight:
+                    if drain:
+                        break
+                    self._stop.wait(self.poll_interval)
+                    continue
+
+                done, _ = wait(
+                    list(in_flight), timeout=self.poll_interval, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    job_id, started = in_flight.pop(future)
+                    self._finish(job_id, future, started)
+
+            for future in list(in_flight):
+                job_id, started = in_flight.pop(future)
+                future.exception()
+                self._finish(job_id, future, started)
+        return self.stats.snapshot()
+
+
+def _load_handler(path: str) -> JobHandler:
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a production job worker pool.")
+    parser.add_argument("--org", default="default", help="organization slug")
+    parser.add_argument("--station", required=True)
+    parser.add_argument("--handler", default="app.workers.production:log_job")
+    parser.add_argument("--mode", choices=("thread", "process"), default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--drain", action="store_true", help="exit when the queue is empty")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with db_session.SessionLocal() as db:
+        org = db.query(Organization).filter(Organization.slug == args.org).first()
+        if not org:
+            raise SystemExit(f"organization {args.org!r} not found")
+        org_id = org.id
+
+    pool = ProductionWorkerPool(
+        org_id,
+        args.station,
+        handler=_load_handler(args.handler),
+        mode=args.mode,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+    )
+    try:
+        stats = pool.run(drain=args.drain)
+    except KeyboardInterrupt:
+        pool.stop()
+        stats = pool.stats.snapshot()
+    logger.info("worker stats: %s", stats)
+
+
+if __name__ == "__main__":
+    main()
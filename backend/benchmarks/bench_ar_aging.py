@@ -0,0 +1,88 @@
+"""Benchmark the AR aging query against synthetic ledger data.
+
+Needs PostgreSQL (``DATABASE_URL``); everything it inserts is rolled back.
+Run from ``backend/``::
+
+    python -m benchmarks.bench_ar_aging --entries 1000000 --partners 5000
+"""
+
+import argparse
+import time
+from datetime import date
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from app.db.session import SessionLocal
+from app.services.ar_service import ar_summary_cache, compute_ar_summary, get_ar_summary
+
+
+def seed(db, org_id, entries: int, partners: int) -> None:
+    db.execute(
+        text("INSERT INTO organizations (id, name, slug) VALUES (:id, 'bench', :slug)"),
+        {"id": org_id, "slug": f"bench-{org_id.hex[:8]}"},
+    )
+    db.execute(
+        text(
+            """
+            INSERT INTO partners (id, organization_id, type, name)
+            SELECT gen_random_uuid(), :org, 'CUSTOMER', 'bench partner ' || g
+            FROM generate_series(1, :partners) AS g
+            """
+        ),
+        {"org": org_id, "partners": partners},
+    )
+    # Roughly three invoices for every payment, spread over the last two years.
+    db.execute(
+        text(
+            """
+            INSERT INTO ar_entries (organization_id, partner_id, entry_date, type, amount)
+            SELECT :org, p.ids[1 + (g % :partners)],
+                   current_date - (random() * 730)::int,
+                   CASE WHEN g % 4 = 0 THEN 'PAYMENT' ELSE 'INVOICE' END,
+                   round((random() * 5000)::numeric, 2)
+            FROM generate_series(1, :entries) AS g,
+                 (SELECT array_agg(id) AS ids FROM partners WHERE organization_id = :org) AS p
+            """
+        ),
+        {"org": org_id, "entries": entries, "partners": partners},
+    )
+    db.execute(text("ANALYZE ar_entries"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--partners", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    org_id = uuid4()
+    today = date.today()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        seed(db, org_id, args.entries, args.partners)
+        print(f"seeded {args.entries} entries in {time.perf_counter() - started:.1f}s")
+
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            summary = compute_ar_summary(db, org_id, today)
+            timings.append(time.perf_counter() - started)
+        print(f" query: best {min(timings):.3f}s, worst {max(timings):.3f}s")
+        print(f"  open: {summary['open_total']} aging: {summary['aging']}")
+
+        ar_summary_cache.clear()
+        get_ar_summary(db, org_id, today)
+        started = time.perf_counter()
+        for _ in range(1000):
+            get_ar_summary(db, org_id, today)
+        print(f"cached: {(time.perf_counter() - started) / 1000 * 1e6:.1f}us per call")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark the guillotine cutting optimizer on synthetic glass orders.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_cutting --panes 5000 --products 4
+"""
+
+import argparse
+import os
+import random
+import time
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ADMIN_EMAIL", "bench@example.com")
+os.environ.setdefault("ADMIN_PASSWORD", "bench")
+os.environ.setdefault("APP_ENV", "test")
+
+from app.core.config import settings  # noqa: E402
+from app.services.cutting_service import Piece, build_cutting_plan  # noqa: E402
+
+
+def make_pieces(panes: int, products: int, seed: int) -> list[Piece]:
+    rng = random.Random(seed)
+    product_ids = [uuid4() for _ in range(products)]
+    pieces = []
+    for _ in range(panes):
+        pieces.append(
+            Piece(
+                job_id=uuid4(),
+                order_item_id=uuid4(),
+                product_id=rng.choice(product_ids),
+                width=float(rng.randrange(300, 2400, 10)),
+                height=float(rng.randrange(300, 1800, 10)),
+            )
+        )
+    return pieces
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--panes", type=int, default=5000)
+    parser.add_argument("--products", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=settings.CUTTING_CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    pieces = make_pieces(args.panes, args.products, args.seed)
+    for label, chunk_size in (("chunked", args.chunk_size), ("whole", args.panes)):
+        settings.CUTTING_CHUNK_SIZE = chunk_size
+        started = time.perf_counter()
+        plan = build_cutting_plan(pieces)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{label:>7}: {args.panes} panes -> {len(plan.sheets)} sheets, "
+            f"yield {plan.yield_pct:.2f}%, unplaced {len(plan.unplaced)}, "
+            f"{elapsed:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
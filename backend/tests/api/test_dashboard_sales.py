@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.partner import Partner
+from app.models.rollup import DailySalesRollup
+from app.services.rollup_service import (
+    get_top_customers,
+    rebuild_sales_rollup,
+    refresh_revenue_windows,
+)
+from tests.conftest import TestingSessionLocal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create_order(client, token, seed_catalog, partner_id=None, quantity=2):
+    item = {
+        "product_id": str(seed_catalog["product"].id),
+        "quantity": quantity,
+        "unit_price": 100,
+        "width": 1000,
+        "height": 500,
+    }
+    response = client.post(
+        "/orders",
+        headers=_auth(token),
+        json={"partner_id": partner_id or str(seed_catalog["partner"].id), "items": [item]},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _sales(client, token):
+    response = client.get("/dashboard/summary", headers=_auth(token))
+    assert response.status_code == 200
+    sales = response.json()["sales"]
+    return Decimal(str(sales["today"])), Decimal(str(sales["month"]))
+
+
+def test_sales_follow_order_status(client, admin_token, seed_catalog):
+    first = _create_order(client, admin_token, seed_catalog)
+    second = _create_order(client, admin_token, seed_catalog)
+    assert _sales(client, admin_token) == (Decimal("0"), Decimal("0"))
+
+    client.post(
+        "/orders/status",
+        headers=_auth(admin_token),
+        json={"order_ids": [first, second], "status": "SIPARIS"},
+    )
+    assert _sales(client, admin_token) == (Decimal("200"), Decimal("200"))
+
+    client.post(f"/orders/{first}/status", headers=_auth(admin_token), json={"status": "IPTAL"})
+    assert _sales(client, admin_token) == (Decimal("100"), Decimal("100"))
+
+
+def test_rebuild_matches_incremental_rollup(client, admin_token, seed_catalog):
+    order_id = _create_order(client, admin_token, seed_catalog)
+    client.post(f"/orders/{order_id}/status", headers=_auth(admin_token), json={"status": "SIPARIS"})
+
+    db = TestingSessionLocal()
+    try:
+        incremental = [(r.day, r.order_count, r.total) for r in db.query(DailySalesRollup)]
+        rebuild_sales_rollup(db, seed_catalog["org"].id)
+        rebuilt = [(r.day, r.order_count, r.total) for r in db.query(DailySalesRollup)]
+    finally:
+        db.close()
+    assert incremental == rebuilt
+    assert incremental[0][1:] == (1, Decimal("100.00"))
+
+
+def test_top_customers_ranked_by_window_revenue(client, admin_token, seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        other = Partner(
+            id=uuid4(),
+            organization_id=seed_catalog["org"].id,
+            type="CUSTOMER",
+            name="Beta Yapı",
+        )
+        db.add(other)
+        db.commit()
+        other_id = str(other.id)
+    finally:
+        db.close()
+
+    small = _create_order(client, admin_token, seed_catalog)
+    big = _create_order(client, admin_token, seed_catalog, partner_id=other_id, quantity=5)
+    client.post(
+        "/orders/status",
+        headers=_auth(admin_token),
+        json={"order_ids": [small, big], "status": "SIPARIS"},
+    )
+
+    response = client.get("/dashboard/top-customers?window=90", headers=_auth(admin_token))
+    assert response.status_code == 200
+    ranking = [(row["name"], Decimal(str(row["revenue"]))) for row in response.json()["items"]]
+    assert ranking == [("Beta Yapı", Decimal("250")), ("Acme Cam", Decimal("100"))]
+
+    client.post(f"/orders/{big}/status", headers=_auth(admin_token), json={"status": "IPTAL"})
+    response = client.get("/dashboard/summary", headers=_auth(admin_token))
+    assert [row["name"] for row in response.json()["top_customers"]] == ["Acme Cam"]
+
+    assert client.get("/dashboard/top-customers?window=7", headers=_auth(admin_token)).status_code == 400
+
+
+def test_refresh_drops_days_outside_window(client, admin_token, seed_catalog):
+    order_id = _create_order(client, admin_token, seed_catalog)
+    client.post(f"/orders/{order_id}/status", headers=_auth(admin_token), json={"status": "SIPARIS"})
+
+    db = TestingSessionLocal()
+    try:
+        org_id = seed_catalog["org"].id
+        assert len(get_top_customers(db, org_id, 30)) == 1
+        refresh_revenue_windows(db, org_id, today=date.today() + timedelta(days=45))
+        assert get_top_customers(db, org_id, 30) == []
+        assert len(get_top_customers(db, org_id, 90)) == 1
+    finally:
+        db.close()
@@ -0,0 +1,121 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import psycopg
+import pytest
+
+from app.core import cache
+from app.core.events import CHANNEL, EventBroker, broker, format_sse, publish
+from tests.conftest import TestingSessionLocal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _drain(loop, sub):
+    async def collect():
+        await asyncio.sleep(0)
+        items = []
+        while not sub.queue.empty():
+            items.append(sub.queue.get_nowait())
+        return items
+
+    return loop.run_until_complete(collect())
+
+
+def test_status_change_is_pushed_to_org_subscribers(client, admin_token, seed_catalog):
+    loop = asyncio.new_event_loop()
+    sub = broker.subscribe(seed_catalog["org"].id, loop)
+    try:
+        item = {
+            "product_id": str(seed_catalog["product"].id),
+            "quantity": 1,
+            "unit_price": 100,
+            "width": 1000,
+            "height": 1000,
+        }
+        order_id = client.post(
+            "/orders",
+            headers=_auth(admin_token),
+            json={"partner_id": str(seed_catalog["partner"].id), "items": [item]},
+        ).json()["id"]
+        _drain(loop, sub)
+
+        client.post(
+            f"/orders/{order_id}/status", headers=_auth(admin_token), json={"status": "SIPARIS"}
+        )
+        events = {event["type"]: event["data"] for event in _drain(loop, sub)}
+        assert events["order.status"] == {"order_ids": [order_id], "status": "SIPARIS"}
+        assert events["dashboard"] == {"sections": ["sales", "top_customers"]}
+        assert format_sse({"type": "dashboard", "data": {"sections": ["ar"]}}) == (
+            'event: dashboard\ndata: {"sections": ["ar"]}\n\n'
+        )
+    finally:
+        broker.unsubscribe(sub)
+        loop.close()
+
+
+def test_rolled_back_events_are_not_delivered(seed_catalog):
+    loop = asyncio.new_event_loop()
+    sub = broker.subscribe(seed_catalog["org"].id, loop)
+    db = TestingSessionLocal()
+    try:
+        publish(db, seed_catalog["org"].id, "order.status", {"order_ids": [], "status": "IPTAL"})
+        db.rollback()
+        db.commit()
+        assert _drain(loop, sub) == []
+    finally:
+        db.close()
+        broker.unsubscribe(sub)
+        loop.close()
+
+
+def test_events_require_a_valid_token(client, seed_users):
+    assert client.get("/events").status_code == 422
+    assert client.get("/events?token=bogus").status_code == 401
+
+
+class _FakeListenConnection:
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        pass
+
+    def notifies(self):
+        for channel, payload in self.payloads:
+            yield SimpleNamespace(channel=channel, payload=payload)
+        raise RuntimeError("listener crashed")
+
+
+def test_listener_skips_bad_events_and_can_restart(monkeypatch):
+    good = {"org_id": "org-1", "type": "dashboard", "data": {}}
+    connection = _FakeListenConnection(
+        [
+            (CHANNEL, "not json"),
+            (cache.CHANNEL, json.dumps({"topic": "listener-topic", "org_id": None})),
+            (CHANNEL, json.dumps(good)),
+        ]
+    )
+    changed = []
+    cache.subscribe("listener-topic", changed.append)
+    monkeypatch.setattr(psycopg, "connect", lambda *args, **kwargs: connection)
+    relay = EventBroker()
+    delivered = []
+    monkeypatch.setattr(relay, "dispatch", delivered.append)
+    relay._listener = object()
+
+    with pytest.raises(RuntimeError):
+        relay._listen()
+    assert delivered == [good]
+    # Once for the missed-while-disconnected sweep, once for the notification.
+    assert changed == [None, None]
+    assert relay._listener is None
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.models.finance import Account, FinancialTransaction
+from tests.conftest import TestingSessionLocal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _seed(org_id, partner_id):
+    db = TestingSessionLocal()
+    bank = Account(id=uuid4(), organization_id=org_id, name="Banka", type="BANK")
+    cash = Account(id=uuid4(), organization_id=org_id, name="Kasa", type="CASH")
+    db.add_all([bank, cash])
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(25):
+        db.add(
+            FinancialTransaction(
+                id=uuid4(),
+                organization_id=org_id,
+                account_id=bank.id if i % 5 else cash.id,
+                partner_id=partner_id,
+                direction="IN" if i % 2 else "OUT",
+                amount=i + 1,
+                # Pairs share a timestamp so paging must break ties on id.
+                transaction_date=start + timedelta(days=i // 2),
+                method="EFT",
+            )
+        )
+    db.commit()
+    db.close()
+    return bank.id, cash.id
+
+
+def test_keyset_pages_cover_every_transaction_once(client, admin_token, seed_catalog):
+    _seed(seed_catalog["org"].id, seed_catalog["partner"].id)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/finance/transactions", headers=_auth(admin_token), params=params).json()
+        seen.extend(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 25
+    assert len({item["id"] for item in seen}) == 25
+    keys = [(item["transaction_date"], item["id"]) for item in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_transactions_are_filtered(client, admin_token, seed_catalog):
+    bank_id, cash_id = _seed(seed_catalog["org"].id, seed_catalog["partner"].id)
+
+    body = client.get(
+        "/finance/transactions",
+        headers=_auth(admin_token),
+        params={"account_id": str(cash_id)},
+    ).json()
+    assert len(body["items"]) == 5
+    assert {item["account_id"] for item in body["items"]} == {str(cash_id)}
+
+    body = client.get(
+        "/finance/transactions",
+        headers=_auth(admin_token),
+        params={
+            "account_id": str(bank_id),
+            "direction": "IN",
+            "date_from": "2026-01-02",
+            "date_to": "2026-01-05",
+        },
+    ).json()
+    # Days 2-5 hold transactions 2..9; the odd, bank ones are 3, 7 and 9.
+    assert sorted(item["amount"] for item in body["items"]) == ["10.00", "4.00", "8.00"]
+
+    resp = client.get(
+        "/finance/transactions", headers=_auth(admin_token), params={"cursor": "nope"}
+    )
+    assert resp.status_code == 400
+
+
+def test_account_balances_as_of(client, admin_token, seed_catalog):
+    bank_id, cash_id = _seed(seed_catalog["org"].id, seed_catalog["partner"].id)
+
+    body = client.get(
+        "/finance/accounts/balances", headers=_auth(admin_token), params={"as_of": "2026-01-02"}
+    ).json()
+    # Days 1-2 hold transactions 0..3: cash -1, bank +2 -3 +4.
+    balances = {item["id"]: item["balance"] for item in body["items"]}
+    assert body["as_of"] == "2026-01-02"
+    assert balances == {str(bank_id): "3.00", str(cash_id): "-1.00"}
@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _order(client, token, seed_catalog, delivery_date, width, height, quantity):
+    resp = client.post(
+        "/orders",
+        headers=_auth(token),
+        json={
+            "partner_id": str(seed_catalog["partner"].id),
+            "delivery_date": delivery_date,
+            "items": [
+                {
+                    "product_id": str(seed_catalog["product"].id),
+                    "quantity": quantity,
+                    "unit_price": 100,
+                    "width": width,
+                    "height": height,
+                }
+            ],
+        },
+    )
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _mrp(client, token):
+    resp = client.get("/stock/mrp", headers=_auth(token))
+    assert resp.status_code == 200
+    return resp.json()["items"]
+
+
+def test_mrp_nets_demand_by_week(client, admin_token, seed_catalog):
+    product_id = str(seed_catalog["product"].id)
+    resp = client.post(
+        "/warehouses", headers=_auth(admin_token), json={"name": "Ana Depo", "code": "MAIN"}
+    )
+    warehouse_id = resp.json()["id"]
+    resp = client.post(
+        "/stock-movements",
+        headers=_auth(admin_token),
+        json={
+            "product_id": product_id,
+            "warehouse_id": warehouse_id,
+            "direction": "IN",
+            "quantity": 10,
+        },
+    )
+    assert resp.status_code == 201
+    assert _mrp(client, admin_token) == []
+
+    # 6 m² due Wednesday 4 Nov, 8 m² due Thursday 12 Nov: the first is fully
+    # reserved, the second gets the 4 m² left and is short 4 m² that week.
+    first = _order(client, admin_token, seed_catalog, "2026-11-04", 2000, 1500, 2)
+    second = _order(client, admin_token, seed_catalog, "2026-11-12", 2000, 2000, 2)
+    resp = client.post(
+        "/orders/status",
+        headers=_auth(admin_token),
+        json={"order_ids": [first, second], "status": "SIPARIS"},
+    )
+    assert resp.status_code == 200
+    quote = _order(client, admin_token, seed_catalog, None, 1000, 1000, 1)
+
+    [item] = _mrp(client, admin_token)
+    assert item["product_id"] == product_id
+    assert Decimal(item["on_hand"]) == 10
+    assert Decimal(item["available"]) == 0
+    assert item["shortage"] is True
+    assert item["shortage_week"] == "2026-11-09"
+    weeks = [
+        (
+            w["week_start"],
+            Decimal(w["confirmed"]),
+            Decimal(w["unreserved"]),
+            Decimal(w["quoted"]),
+            Decimal(w["projected_available"]),
+            Decimal(w["projected_with_quotes"]),
+        )
+        for w in item["weeks"]
+    ]
+    assert weeks == [
+        (None, 0, 0, 1, 0, -1),
+        ("2026-11-02", 6, 0, 0, 0, -1),
+        ("2026-11-09", 8, 4, 0, -4, -5),
+    ]
+
+    # Cancelling the quote invalidates the cached projection.
+    resp = client.post(
+        f"/orders/{quote}/status", headers=_auth(admin_token), json={"status": "IPTAL"}
+    )
+    assert resp.status_code == 200
+    [item] = _mrp(client, admin_token)
+    assert [w["week_start"] for w in item["weeks"]] == ["2026-11-02", "2026-11-09"]
@@ -0,0 +1,70 @@
+from app.models.production_job import ProductionJob
+from tests.conftest import TestingSessionLocal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create_order(client, token, seed_catalog, item_count=1):
+    item = {
+        "product_id": str(seed_catalog["product"].id),
+        "quantity": 2,
+        "unit_price": 100,
+        "width": 1000,
+        "height": 500,
+    }
+    response = client.post(
+        "/orders",
+        headers=_auth(token),
+        json={"partner_id": str(seed_catalog["partner"].id), "items": [item] * item_count},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_bulk_confirm_creates_production_jobs(client, admin_token, seed_catalog):
+    first = _create_order(client, admin_token, seed_catalog, item_count=2)
+    second = _create_order(client, admin_token, seed_catalog, item_count=3)
+    cancelled = _create_order(client, admin_token, seed_catalog)
+    client.post(f"/orders/{cancelled}/status", headers=_auth(admin_token), json={"status": "IPTAL"})
+
+    response = client.post(
+        "/orders/status",
+        headers=_auth(admin_token),
+        json={"order_ids": [first, second, cancelled], "status": "SIPARIS"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert sorted(data["updated"]) == sorted([first, second])
+    assert data["skipped"] == [cancelled]
+
+    db = TestingSessionLocal()
+    try:
+        assert db.query(ProductionJob).count() == 5
+    finally:
+        db.close()
+
+
+def test_invalid_transition_rejected(client, admin_token, seed_catalog):
+    order_id = _create_order(client, admin_token, seed_catalog)
+    response = client.post(
+        f"/orders/{order_id}/status", headers=_auth(admin_token), json={"status": "IPTAL"}
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "IPTAL"
+
+    response = client.post(
+        f"/orders/{order_id}/status", headers=_auth(admin_token), json={"status": "SIPARIS"}
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"] == "invalid_status_transition"
+
+
+def test_unknown_status_rejected(client, admin_token, seed_catalog):
+    order_id = _create_order(client, admin_token, seed_catalog)
+    response = client.post(
+        f"/orders/{order_id}/status", headers=_auth(admin_token), json={"status": "URETIMDE"}
+    )
+    assert response.status_code == 422
+
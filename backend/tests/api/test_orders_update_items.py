@@ -0,0 +1,142 @@
+from uuid import UUID, uuid4
+
+from app.models.production_job import ProductionJob
+from tests.conftest import TestingSessionLocal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _item(product_id, **overrides):
+    item = {
+        "product_id": str(product_id),
+        "quantity": 1,
+        "unit_price": 100,
+        "width": 1000,
+        "height": 1000,
+    }
+    item.update(overrides)
+    return item
+
+
+def _create_order(client, token, seed_catalog, items):
+    response = client.post(
+        "/orders",
+        headers=_auth(token),
+        json={"partner_id": str(seed_catalog["partner"].id), "items": items},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_update_keeps_untouched_item_ids(client, admin_token, seed_catalog):
+    product_id = seed_catalog["product"].id
+    order = _create_order(
+        client,
+        admin_token,
+        seed_catalog,
+        [_item(product_id), _item(product_id, quantity=2), _item(product_id, quantity=3)],
+    )
+    kept, changed, removed = order["items"]
+
+    response = client.put(
+        f"/orders/{order['id']}",
+        headers=_auth(admin_token),
+        json={
+            "items": [
+                {**_item(product_id), "id": kept["id"]},
+                {**_item(product_id, quantity=5), "id": changed["id"]},
+                _item(product_id, width=500),
+            ]
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    ids = {item["id"] for item in data["items"]}
+    assert kept["id"] in ids
+    assert changed["id"] in ids
+    assert removed["id"] not in ids
+    assert len(ids) == 3
+    assert float(data["grand_total"]) == 100 + 500 + 50
+
+
+def test_update_header_only_leaves_items(client, admin_token, seed_catalog):
+    order = _create_order(
+        client, admin_token, seed_catalog, [_item(seed_catalog["product"].id)]
+    )
+    response = client.put(
+        f"/orders/{order['id']}",
+        headers=_auth(admin_token),
+        json={"notes": "urgent"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"][0]["id"] == order["items"][0]["id"]
+    assert float(data["grand_total"]) == 100
+
+
+def test_update_unknown_item_id_rejected(client, admin_token, seed_catalog):
+    product_id = seed_catalog["product"].id
+    order = _create_order(client, admin_token, seed_catalog, [_item(product_id)])
+    response = client.put(
+        f"/orders/{order['id']}",
+        headers=_auth(admin_token),
+        json={"items": [{**_item(product_id), "id": str(uuid4())}]},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "order_item_not_found"
+
+
+def _jobs(item_ids):
+    db = TestingSessionLocal()
+    try:
+        return sorted(
+            (str(job.order_item_id), job.status, int(job.quantity_required))
+            for job in db.query(ProductionJob).filter(
+                ProductionJob.order_item_id.in_([UUID(id) for id in item_ids])
+            )
+        )
+    finally:
+        db.close()
+
+
+def test_editing_a_confirmed_order_replans_production(client, admin_token, seed_catalog):
+    product_id = seed_catalog["product"].id
+    order = _create_order(
+        client, admin_token, seed_catalog, [_item(product_id), _item(product_id, quantity=2)]
+    )
+    kept, changed = order["items"]
+    response = client.post(
+        f"/orders/{order['id']}/status", headers=_auth(admin_token), json={"status": "SIPARIS"}
+    )
+    assert response.status_code == 200
+
+    response = client.put(
+        f"/orders/{order['id']}",
+        headers=_auth(admin_token),
+        json={
+            "items": [
+                {**_item(product_id), "id": kept["id"]},
+                {**_item(product_id, quantity=4), "id": changed["id"]},
+                _item(product_id, quantity=3),
+            ]
+        },
+    )
+    assert response.status_code == 200
+    added = next(
+        item["id"]
+        for item in response.json()["items"]
+        if item["id"] not in (kept["id"], changed["id"])
+    )
+
+    # The untouched line keeps its job, the resized one is replanned and the
+    # new one is queued.
+    assert _jobs([kept["id"], changed["id"], added]) == sorted(
+        [
+            (kept["id"], "PENDING", 1),
+            (changed["id"], "CANCELLED", 2),
+            (changed["id"], "PENDING", 4),
+            (added, "PENDING", 3),
+        ]
+    )
@@ -0,0 +1,134 @@
+import csv
+import io
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.ar import ArEntry
+from app.models.finance import Account, FinancialTransaction
+from app.models.invoice import SalesInvoice
+from app.models.order import Order
+from tests.conftest import TestingSessionLocal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _at(day):
+    return datetime(2026, 3, day, 10, tzinfo=timezone.utc)
+
+
+def _seed(seed_catalog):
+    org_id, partner_id = seed_catalog["org"].id, seed_catalog["partner"].id
+    db = TestingSessionLocal()
+    account = Account(id=uuid4(), organization_id=org_id, name="Banka", type="BANK")
+    open_order = Order(
+        id=uuid4(),
+        organization_id=org_id,
+        number="2026-001",
+        partner_id=partner_id,
+        status="SIPARIS",
+        grand_total=Decimal("500"),
+        created_at_utc=_at(1),
+    )
+    invoiced_order = Order(
+        id=uuid4(),
+        organization_id=org_id,
+        number="2026-002",
+        partner_id=partner_id,
+        status="SIPARIS",
+        grand_total=Decimal("300"),
+        created_at_utc=_at(2),
+    )
+    quote = Order(
+        id=uuid4(),
+        organization_id=org_id,
+        number="2026-003",
+        partner_id=partner_id,
+        status="TEKLIF",
+        grand_total=Decimal("999"),
+        created_at_utc=_at(2),
+    )
+    invoice = SalesInvoice(
+        id=uuid4(),
+        organization_id=org_id,
+        number="FTR-1",
+        partner_id=partner_id,
+        order_id=invoiced_order.id,
+        status="ISSUED",
+        issue_date=date(2026, 3, 3),
+        grand_total=Decimal("300"),
+    )
+    db.add_all([account, open_order, invoiced_order, quote, invoice])
+    db.flush()
+    db.add_all(
+        [
+            ArEntry(
+                organization_id=org_id,
+                partner_id=partner_id,
+                invoice_id=invoice.id,
+                type="INVOICE",
+                amount=Decimal("300"),
+                entry_date=date(2026, 3, 3),
+            ),
+            FinancialTransaction(
+                organization_id=org_id,
+                account_id=account.id,
+                partner_id=partner_id,
+                direction="IN",
+                amount=Decimal("450"),
+                transaction_date=_at(4),
+                method="EFT",
+            ),
+            FinancialTransaction(
+                organization_id=org_id,
+                account_id=account.id,
+                partner_id=partner_id,
+                direction="OUT",
+                amount=Decimal("20"),
+                transaction_date=_at(5),
+                method="CASH",
+                description="iade",
+            ),
+        ]
+    )
+    db.commit()
+    db.close()
+    return partner_id
+
+
+def test_ledger_streams_running_balance(client, admin_token, seed_catalog):
+    partner_id = _seed(seed_catalog)
+
+    resp = client.get(f"/partners/{partner_id}/ledger", headers=_auth(admin_token))
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["partner_id"] == str(partner_id)
+    assert [
+        (row["date"], row["source"], row["reference"], row["debit"], row["credit"], row["balance"])
+        for row in body["items"]
+    ] == [
+        ("2026-03-01", "ORDER", "2026-001", "500.00", "0.00", "500.00"),
+        ("2026-03-03", "INVOICE", "FTR-1", "300.00", "0.00", "800.00"),
+        ("2026-03-04", "TRANSACTION", "EFT", "0.00", "450.00", "350.00"),
+        ("2026-03-05", "TRANSACTION", "CASH", "20.00", "0.00", "370.00"),
+    ]
+
+    resp = client.get(
+        f"/partners/{partner_id}/ledger",
+        headers=_auth(admin_token),
+        params={"format": "csv", "date_from": "2026-03-04"},
+    )
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    # The opening balance still counts the entries before date_from.
+    assert [(row["date"], row["balance"]) for row in rows] == [
+        ("2026-03-04", "350.00"),
+        ("2026-03-05", "370.00"),
+    ]
+
+
+def test_ledger_of_unknown_partner_is_404(client, admin_token, seed_catalog):
+    resp = client.get(f"/partners/{uuid4()}/ledger", headers=_auth(admin_token))
+    assert resp.status_code == 404
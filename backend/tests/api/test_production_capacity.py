@@ -0,0 +1,118 @@
+from decimal import Decimal
+
+from app.models.production_line import ProductionLoad
+from app.services.capacity_service import rebuild_production_load
+from tests.conftest import TestingSessionLocal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _confirmed_order(client, token, seed_catalog, delivery_date, width, height, quantity):
+    resp = client.post(
+        "/orders",
+        headers=_auth(token),
+        json={
+            "partner_id": str(seed_catalog["partner"].id),
+            "delivery_date": delivery_date,
+            "items": [
+                {
+                    "product_id": str(seed_catalog["product"].id),
+                    "quantity": quantity,
+                    "unit_price": 100,
+                    "width": width,
+                    "height": height,
+                }
+            ],
+        },
+    )
+    assert resp.status_code == 201
+    order_id = resp.json()["id"]
+    resp = client.post(
+        f"/orders/{order_id}/status", headers=_auth(token), json={"status": "SIPARIS"}
+    )
+    assert resp.status_code == 200
+    return order_id
+
+
+def _load(org_id):
+    db = TestingSessionLocal()
+    try:
+        return {
+            row.load_date.isoformat(): (row.order_count, Decimal(row.area))
+            for row in db.query(ProductionLoad).filter_by(organization_id=org_id)
+            if row.order_count
+        }
+    finally:
+        db.close()
+
+
+def _earliest(client, token, **params):
+    return client.get("/production/capacity/earliest", headers=_auth(token), params=params)
+
+
+def test_capacity_plan_tracks_order_writes(client, admin_token, seed_catalog):
+    org_id = seed_catalog["org"].id
+    for name, capacity in (("Kesim", 10), ("Temper", 5)):
+        resp = client.post(
+            "/production/lines",
+            headers=_auth(admin_token),
+            json={"name": name, "capacity_sqm_per_day": capacity},
+        )
+        assert resp.status_code == 201
+    resp = client.post(
+        "/production/lines",
+        headers=_auth(admin_token),
+        json={"name": "Kesim", "capacity_sqm_per_day": 1},
+    )
+    assert resp.status_code == 409
+
+    # Monday 2 Nov: 12 m² + 4 m² against 15 m² a day.
+    first = _confirmed_order(client, admin_token, seed_catalog, "2026-11-02", 2000, 2000, 3)
+    second = _confirmed_order(client, admin_token, seed_catalog, "2026-11-02", 2000, 1000, 2)
+    assert _load(org_id) == {"2026-11-02": (2, Decimal("16"))}
+
+    resp = client.get(
+        "/production/capacity",
+        headers=_auth(admin_token),
+        params={"date_from": "2026-11-02", "date_to": "2026-11-08"},
+    )
+    assert resp.status_code == 200
+    plan = resp.json()
+    assert Decimal(plan["daily_capacity"]) == 15
+    assert plan["overbooked_days"] == ["2026-11-02"]
+    monday, sunday = plan["days"][0], plan["days"][-1]
+    assert Decimal(monday["free"]) == -1
+    assert Decimal(sunday["capacity"]) == 0
+
+    resp = _earliest(client, admin_token, area="5", not_before="2026-11-02")
+    assert resp.json()["earliest_date"] == "2026-11-03"
+    # The second order's own 4 m² is not counted against it.
+    resp = _earliest(client, admin_token, order_id=second, not_before="2026-11-02")
+    assert resp.json() == {"area": "4.000", "earliest_date": "2026-11-03"}
+    resp = _earliest(client, admin_token, area="20")
+    assert resp.status_code == 409
+    assert resp.json()["detail"] == "exceeds_daily_capacity"
+
+    resp = client.put(
+        f"/orders/{second}", headers=_auth(admin_token), json={"delivery_date": "2026-11-03"}
+    )
+    assert resp.status_code == 200
+    assert _load(org_id) == {
+        "2026-11-02": (1, Decimal("12")),
+        "2026-11-03": (1, Decimal("4")),
+    }
+
+    resp = client.post(
+        f"/orders/{first}/status", headers=_auth(admin_token), json={"status": "IPTAL"}
+    )
+    assert resp.status_code == 200
+    assert _load(org_id) == {"2026-11-03": (1, Decimal("4"))}
+
+    db = TestingSessionLocal()
+    try:
+        assert rebuild_production_load(db, org_id) == 1
+    finally:
+        db.close()
+    assert _load(org_id) == {"2026-11-03": (1, Decimal("4"))}
@@ -0,0 +1,36 @@
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _confirmed_order(client, token, seed_catalog, item_count):
+    item = {
+        "product_id": str(seed_catalog["product"].id),
+        "quantity": 2,
+        "unit_price": 100,
+        "width": 1000,
+        "height": 500,
+    }
+    response = client.post(
+        "/orders",
+        headers=_auth(token),
+        json={"partner_id": str(seed_catalog["partner"].id), "items": [item] * item_count},
+    )
+    assert response.status_code == 201
+    order_id = response.json()["id"]
+    response = client.post(
+        f"/orders/{order_id}/status", headers=_auth(token), json={"status": "SIPARIS"}
+    )
+    assert response.status_code == 200
+    return order_id
+
+
+def test_cutting_plan_covers_confirmed_panes(client, admin_token, seed_catalog):
+    _confirmed_order(client, admin_token, seed_catalog, item_count=2)
+
+    response = client.post("/production/cutting-plan", headers=_auth(admin_token), json={})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["piece_count"] == 4
+    assert data["sheet_count"] == 1
+    assert data["unplaced"] == []
+    assert 0 < data["yield_pct"] < 100
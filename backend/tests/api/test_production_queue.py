@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from app.core.config import settings
+from app.models.production_job import ProductionJob
+from app.services.order_service import update_order_status
+from app.services.production_service import requeue_stale_jobs
+from app.workers.production import ProductionWorkerPool
+from tests.conftest import TestingSessionLocal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _confirmed_order(client, token, seed_catalog, delivery_date, items=1, priority=0):
+    item = {
+        "product_id": str(seed_catalog["product"].id),
+        "quantity": 1,
+        "unit_price": 100,
+        "width": 1000,
+        "height": 500,
+    }
+    response = client.post(
+        "/orders",
+        headers=_auth(token),
+        json={
+            "partner_id": str(seed_catalog["partner"].id),
+            "delivery_date": delivery_date,
+            "priority": priority,
+            "items": [item] * items,
+        },
+    )
+    order_id = response.json()["id"]
+    client.post(f"/orders/{order_id}/status", headers=_auth(token), json={"status": "SIPARIS"})
+    return response.json()
+
+
+def test_claim_orders_by_due_date_and_completes(client, admin_token, seed_catalog):
+    _confirmed_order(client, admin_token, seed_catalog, "2030-02-01")
+    urgent = _confirmed_order(client, admin_token, seed_catalog, "2030-01-01")
+
+    response = client.post(
+        "/production/jobs/claim", headers=_auth(admin_token), json={"station": "cutter-1"}
+    )
+    assert response.status_code == 200
+    (job,) = response.json()
+    assert job["order_item_id"] == urgent["items"][0]["id"]
+    assert job["status"] == "CLAIMED"
+    assert job["due_date"] == "2030-01-01"
+
+    response = client.post(
+        f"/production/jobs/{job['id']}/complete",
+        headers=_auth(admin_token),
+        json={"station": "cutter-2"},
+    )
+    assert response.status_code == 409
+
+    response = client.post(
+        f"/production/jobs/{job['id']}/complete",
+        headers=_auth(admin_token),
+        json={"station": "cutter-1"},
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "DONE"
+
+    stats = client.get("/production/jobs/stats", headers=_auth(admin_token)).json()
+    assert stats["depth"]["PENDING"] == 1
+    assert stats["depth"]["DONE"] == 1
+    assert stats["completed"] == 1
+
+
+def test_worker_pool_drains_queue(client, admin_token, seed_catalog):
+    _confirmed_order(client, admin_token, seed_catalog, "2030-01-01", items=5)
+    seen = []
+
+    pool = ProductionWorkerPool(
+        seed_catalog["org"].id,
+        "cutter-1",
+        handler=seen.append,
+        mode="thread",
+        concurrency=1,
+        poll_interval=0.01,
+    )
+    stats = pool.run(drain=True)
+    assert stats["completed"] == 5
+    assert len(seen) == 5
+
+    stats = client.get("/production/jobs/stats", headers=_auth(admin_token)).json()
+    assert stats["depth"]["DONE"] == 5
+
+
+def _claim(client, token, station="cutter-1"):
+    response = client.post(
+        "/production/jobs/claim", headers=_auth(token), json={"station": station}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_jobs_follow_order_priority_schedule_and_cancellation(
+    client, admin_token, seed_catalog
+):
+    early = _confirmed_order(client, admin_token, seed_catalog, "2030-01-01")
+    rush = _confirmed_order(client, admin_token, seed_catalog, "2030-03-01", priority=5)
+
+    # Priority beats the earlier due date; the claimed job is then cancelled.
+    (job,) = _claim(client, admin_token)
+    assert job["order_item_id"] == rush["items"][0]["id"]
+    assert job["priority"] == 5
+    response = client.post(
+        f"/orders/{rush['id']}/status", headers=_auth(admin_token), json={"status": "IPTAL"}
+    )
+    assert response.status_code == 200
+    response = client.post(
+        f"/production/jobs/{job['id']}/complete",
+        headers=_auth(admin_token),
+        json={"station": "cutter-1"},
+    )
+    assert response.status_code == 409
+
+    # Rescheduling the remaining order moves its pending job.
+    response = client.put(
+        f"/orders/{early['id']}",
+        headers=_auth(admin_token),
+        json={"delivery_date": "2030-02-01", "priority": 2},
+    )
+    assert response.status_code == 200
+    (job,) = _claim(client, admin_token)
+    assert job["order_item_id"] == early["items"][0]["id"]
+    assert (job["due_date"], job["priority"]) == ("2030-02-01", 2)
+    assert _claim(client, admin_token) == []
+
+    stats = client.get("/production/jobs/stats", headers=_auth(admin_token)).json()
+    assert stats["depth"]["CANCELLED"] == 1
+    assert stats["depth"]["CLAIMED"] == 1
+
+
+def test_stale_claims_fail_once_attempts_run_out(client, admin_token, seed_catalog):
+    _confirmed_order(client, admin_token, seed_catalog, "2030-01-01", items=2)
+    first, second = _claim(client, admin_token) + _claim(client, admin_token)
+
+    db = TestingSessionLocal()
+    try:
+        stale = datetime.now(timezone.utc) - timedelta(hours=1)
+        for job, attempts in ((first, 1), (second, settings.PRODUCTION_JOB_MAX_ATTEMPTS)):
+            row = db.get(ProductionJob, UUID(job["id"]))
+            row.attempts = attempts
+            row.claimed_at_utc = stale
+        db.commit()
+        assert requeue_stale_jobs(db, timeout_seconds=60) == 2
+        db.expire_all()
+        assert db.get(ProductionJob, UUID(first["id"])).status == "PENDING"
+        failed = db.get(ProductionJob, UUID(second["id"]))
+        assert (failed.status, failed.last_error) == ("FAILED", "claim_timeout")
+    finally:
+        db.close()
+
+
+def test_worker_pool_survives_jobs_cancelled_mid_flight(client, admin_token, seed_catalog):
+    order = _confirmed_order(client, admin_token, seed_catalog, "2030-01-01")
+
+    def cancel(job):
+        db = TestingSessionLocal()
+        try:
+            update_order_status(db, seed_catalog["org"].id, UUID(order["id"]), "IPTAL")
+        finally:
+            db.close()
+
+    pool = ProductionWorkerPool(
+        seed_catalog["org"].id,
+        "cutter-1",
+        handler=cancel,
+        mode="thread",
+        concurrency=1,
+        poll_interval=0.01,
+    )
+    stats = pool.run(drain=True)
+    assert stats["completed"] == 1
+
+    stats = client.get("/production/jobs/stats", headers=_auth(admin_token)).json()
+    assert stats["depth"]["CANCELLED"] == 1
@@ -0,0 +1,79 @@
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.quote import Quote, QuoteItem
+from tests.conftest import TestingSessionLocal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _seed_quote(seed_catalog, status="SENT"):
+    db = TestingSessionLocal()
+    quote = Quote(
+        id=uuid4(),
+        organization_id=seed_catalog["org"].id,
+        number=f"TKL-{uuid4().hex[:6]}",
+        partner_id=seed_catalog["partner"].id,
+        status=status,
+        discount_rate=Decimal("5"),
+        notes="Cephe camları",
+        items=[
+            QuoteItem(
+                product_id=seed_catalog["product"].id,
+                description="Float 4mm",
+                quantity=Decimal("3"),
+                unit_price=Decimal("100.00"),
+                width=Decimal("1200"),
+                height=Decimal("500"),
+            ),
+            QuoteItem(
+                product_id=seed_catalog["product"].id,
+                quantity=Decimal("1"),
+                unit_price=Decimal("80.50"),
+                width=Decimal("1000"),
+                height=Decimal("1000"),
+                # Stale stored total: conversion reprices.
+                line_total=Decimal("1.00"),
+            ),
+        ],
+    )
+    db.add(quote)
+    db.commit()
+    db.close()
+    return quote.id
+
+
+def test_convert_copies_and_reprices_items(client, admin_token, seed_catalog):
+    quote_id = _seed_quote(seed_catalog)
+
+    resp = client.post(f"/quotes/{quote_id}/convert", headers=_auth(admin_token))
+    assert resp.status_code == 201
+    order = resp.json()
+    assert order["status"] == "TEKLIF"
+    assert order["quote_id"] == str(quote_id)
+    assert order["partner_id"] == str(seed_catalog["partner"].id)
+    assert order["notes"] == "Cephe camları"
+    assert Decimal(order["discount_rate"]) == Decimal("5")
+    totals = sorted(Decimal(item["line_total"]) for item in order["items"])
+    assert totals == [Decimal("80.50"), Decimal("180.00")]
+    assert Decimal(order["grand_total"]) == Decimal("260.50")
+
+    db = TestingSessionLocal()
+    assert db.get(Quote, quote_id).status == "APPROVED"
+    db.close()
+
+    again = client.post(f"/quotes/{quote_id}/convert", headers=_auth(admin_token))
+    assert again.status_code == 409
+    assert again.json()["detail"] == "quote_already_converted"
+
+
+def test_convert_rejects_draft_and_unknown_quotes(client, admin_token, seed_catalog):
+    draft_id = _seed_quote(seed_catalog, status="DRAFT")
+    resp = client.post(f"/quotes/{draft_id}/convert", headers=_auth(admin_token))
+    assert resp.status_code == 409
+    assert resp.json()["detail"] == "quote_not_convertible"
+
+    resp = client.post(f"/quotes/{uuid4()}/convert", headers=_auth(admin_token))
+    assert resp.status_code == 404
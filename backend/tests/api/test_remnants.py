@@ -0,0 +1,180 @@
+from uuid import uuid4
+
+import pytest
+
+from app.models.organization import Organization
+from app.models.warehouse import Warehouse
+from tests.conftest import TestingSessionLocal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def warehouse(seed_catalog):
+    db = TestingSessionLocal()
+    wh = Warehouse(
+        id=uuid4(), organization_id=seed_catalog["org"].id, name="Main", code="MAIN"
+    )
+    db.add(wh)
+    db.commit()
+    db.close()
+    return wh
+
+
+def _remnant(client, token, product_id, warehouse_id, width, height):
+    response = client.post(
+        "/remnants",
+        headers=_auth(token),
+        json={
+            "product_id": str(product_id),
+            "warehouse_id": str(warehouse_id),
+            "width": width,
+            "height": height,
+        },
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_fit_returns_smallest_remnant(client, admin_token, seed_catalog, warehouse):
+    product_id = seed_catalog["product"].id
+    _remnant(client, admin_token, product_id, warehouse.id, 2000, 1500)
+    small = _remnant(client, admin_token, product_id, warehouse.id, 600, 1100)
+    _remnant(client, admin_token, product_id, warehouse.id, 900, 400)
+
+    assert small["width"] == "1100.00" and small["height"] == "600.00"
+    response = client.get(
+        "/remnants/fit",
+        headers=_auth(admin_token),
+        params={"product_id": str(product_id), "width": 500, "height": 1000},
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == small["id"]
+
+    response = client.get(
+        "/remnants/fit",
+        headers=_auth(admin_token),
+        params={"product_id": str(product_id), "width": 2100, "height": 100},
+    )
+    assert response.status_code == 404
+
+
+def test_create_refuses_another_orgs_warehouse(client, admin_token, seed_catalog, warehouse):
+    db = TestingSessionLocal()
+    other = Organization(id=uuid4(), name="Other", slug="other")
+    db.add(other)
+    db.flush()
+    foreign = Warehouse(id=uuid4(), organization_id=other.id, name="Theirs", code="THEIRS")
+    db.add(foreign)
+    db.commit()
+    db.close()
+
+    body = {"product_id": str(seed_catalog["product"].id), "width": 900, "height": 400}
+    response = client.post(
+        "/remnants", headers=_auth(admin_token), json={**body, "warehouse_id": str(foreign.id)}
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "warehouse_not_found"
+
+    response = client.post(
+        "/remnants",
+        headers=_auth(admin_token),
+        json={**body, "product_id": str(uuid4()), "warehouse_id": str(warehouse.id)},
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "product_not_found"
+
+
+def test_confirming_order_reserves_remnants(client, admin_token, seed_catalog, warehouse):
+    product_id = seed_catalog["product"].id
+    fitting = _remnant(client, admin_token, product_id, warehouse.id, 1200, 700)
+    _remnant(client, admin_token, product_id, warehouse.id, 800, 400)
+    response = client.post(
+        "/orders",
+        headers=_auth(admin_token),
+        json={
+            "partner_id": str(seed_catalog["partner"].id),
+            "items": [
+                {
+                    "product_id": str(product_id),
+                    "quantity": 3,
+                    "unit_price": 100,
+                    "width": 1000,
+                    "height": 500,
+                }
+            ],
+        },
+    )
+    order_id = response.json()["id"]
+    client.post(f"/orders/{order_id}/status", headers=_auth(admin_token), json={"status": "SIPARIS"})
+
+    reserved = client.get(
+        "/remnants", headers=_auth(admin_token), params={"status": "RESERVED"}
+    ).json()
+    assert [r["id"] for r in reserved["items"]] == [fitting["id"]]
+    assert reserved["items"][0]["production_job_id"] is not None
+
+    plan = client.post("/production/cutting-plan", headers=_auth(admin_token), json={}).json()
+    assert plan["piece_count"] == 2
+
+
+def _confirmed_pane(client, token, seed_catalog, delivery_date):
+    response = client.post(
+        "/orders",
+        headers=_auth(token),
+        json={
+            "partner_id": str(seed_catalog["partner"].id),
+            "delivery_date": delivery_date,
+            "items": [
+                {
+                    "product_id": str(seed_catalog["product"].id),
+                    "quantity": 1,
+                    "unit_price": 100,
+                    "width": 1000,
+                    "height": 500,
+                }
+            ],
+        },
+    )
+    order_id = response.json()["id"]
+    client.post(f"/orders/{order_id}/status", headers=_auth(token), json={"status": "SIPARIS"})
+    return order_id
+
+
+def _remnant_statuses(client, token):
+    items = client.get("/remnants", headers=_auth(token)).json()["items"]
+    return {r["id"]: r["status"] for r in items}
+
+
+def test_remnants_are_consumed_or_released_with_their_jobs(
+    client, admin_token, seed_catalog, warehouse
+):
+    product_id = seed_catalog["product"].id
+    large = _remnant(client, admin_token, product_id, warehouse.id, 1200, 700)
+    small = _remnant(client, admin_token, product_id, warehouse.id, 1100, 600)
+    _confirmed_pane(client, admin_token, seed_catalog, "2030-01-01")
+    later = _confirmed_pane(client, admin_token, seed_catalog, "2030-02-01")
+    assert _remnant_statuses(client, admin_token) == {
+        large["id"]: "RESERVED",
+        small["id"]: "RESERVED",
+    }
+
+    (job,) = client.post(
+        "/production/jobs/claim", headers=_auth(admin_token), json={"station": "cutter-1"}
+    ).json()
+    response = client.post(
+        f"/production/jobs/{job['id']}/complete",
+        headers=_auth(admin_token),
+        json={"station": "cutter-1"},
+    )
+    assert response.status_code == 200
+    client.post(f"/orders/{later}/status", headers=_auth(admin_token), json={"status": "IPTAL"})
+
+    # The first confirmed order got the smallest offcut and cut it; the
+    # cancelled one hands its offcut back.
+    assert _remnant_statuses(client, admin_token) == {
+        large["id"]: "AVAILABLE",
+        small["id"]: "CONSUMED",
+    }
@@ -0,0 +1,153 @@
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.finance import Account, FinancialTransaction
+from app.models.order import Order
+from app.models.partner import Partner
+from app.services.statement_parser import parse_statement
+from tests.conftest import TestingSessionLocal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _seed(org_id, customer_id):
+    db = TestingSessionLocal()
+    supplier = Partner(
+        id=uuid4(),
+        organization_id=org_id,
+        type="SUPPLIER",
+        name="Şişecam Düzcam",
+        tax_number="1234567890",
+    )
+    db.get(Partner, customer_id).iban = "TR33 0006 1005 1978 6457 8413 26"
+    account = Account(
+        id=uuid4(), organization_id=org_id, name="Banka", type="BANK", current_balance=1000
+    )
+    order = Order(
+        id=uuid4(),
+        organization_id=org_id,
+        number="2026-007",
+        partner_id=customer_id,
+        status="SIPARIS",
+        grand_total=Decimal("240.00"),
+    )
+    db.add_all([supplier, account, order])
+    db.commit()
+    db.close()
+    return supplier.id, account.id, order.id
+
+
+STATEMENT_CSV = (
+    "Tarih;Tutar;Açıklama;Unvan;IBAN\n"
+    "01.10.2026;240,00;Sipariş 2026-007 ödemesi;;TR330006100519786457841326\n"
+    "02.10.2026;-1.500,50;Cam alımı VKN: 1234567890;;\n"
+    "03.10.2026;75,00;Havale;acme  cam;\n"
+    "04.10.2026;10,00;Bilinmeyen gönderen;Kimse;\n"
+)
+
+
+def test_csv_statement_is_booked_and_matched(client, admin_token, seed_catalog):
+    org_id, customer_id = seed_catalog["org"].id, seed_catalog["partner"].id
+    supplier_id, account_id, order_id = _seed(org_id, customer_id)
+
+    resp = client.post(
+        "/finance/statements/import",
+        headers=_auth(admin_token),
+        data={"account_id": str(account_id)},
+        files={"file": ("ekstre.csv", STATEMENT_CSV.encode(), "text/csv")},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["imported"] == 3
+    assert body["matched_orders"] == 1
+    assert Decimal(body["net_amount"]) == Decimal("-1185.50")
+    assert Decimal(body["balance"]) == Decimal("-185.50")
+    assert [line["line"] for line in body["unmatched"]] == [5]
+
+    db = TestingSessionLocal()
+    rows = {
+        tx.description: tx
+        for tx in db.query(FinancialTransaction).filter_by(account_id=account_id)
+    }
+    db.close()
+    assert rows["Sipariş 2026-007 ödemesi"].order_id == order_id
+    assert rows["Sipariş 2026-007 ödemesi"].partner_id == customer_id
+    assert rows["Cam alımı VKN: 1234567890"].partner_id == supplier_id
+    assert rows["Cam alımı VKN: 1234567890"].direction == "OUT"
+    assert rows["Havale"].partner_id == customer_id
+    assert all(tx.method == "STATEMENT" for tx in rows.values())
+
+
+def test_import_rejects_unknown_account_and_bad_rows(client, admin_token, seed_catalog):
+    resp = client.post(
+        "/finance/statements/import",
+        headers=_auth(admin_token),
+        data={"account_id": str(uuid4())},
+        files={"file": ("ekstre.csv", STATEMENT_CSV.encode(), "text/csv")},
+    )
+    assert resp.status_code == 404
+
+    resp = client.post(
+        "/finance/statements/import",
+        headers=_auth(admin_token),
+        data={"account_id": str(uuid4())},
+        files={"file": ("ekstre.csv", b"Tarih;Tutar\nyarin;10\n", "text/csv")},
+    )
+    assert resp.status_code == 400
+    assert resp.json()["detail"].startswith("invalid_statement: line 2")
+
+
+def test_parse_mt940():
+    text = "\n".join(
+        [
+            ":20:STMT",
+            ":25:TR330006100519786457841326",
+            ":61:2610010901C240,00NTRFNONREF",
+            ":86:?20Siparis 2026-007",
+            "?32ACME CAM",
+            ":61:2610020902D1500,50NTRFINV-9//B42",
+            ":86:?20VKN 1234567890",
+            ":62F:C261002TRY1000,00",
+            "-",
+        ]
+    )
+    lines = parse_statement(text, "mt940")
+    assert [(line.line, line.amount, line.reference) for line in lines] == [
+        (3, Decimal("240.00"), None),
+        (6, Decimal("-1500.50"), "B42"),
+    ]
+    assert lines[0].counterparty_name == "ACME CAM"
+    assert "2026-007" in lines[0].description
+    assert lines[1].counterparty_tax_number == "1234567890"
+
+
+def test_reimported_lines_are_reported_not_booked_twice(client, admin_token, seed_catalog):
+    org_id, customer_id = seed_catalog["org"].id, seed_catalog["partner"].id
+    _, account_id, _ = _seed(org_id, customer_id)
+
+    def upload(text):
+        resp = client.post(
+            "/finance/statements/import",
+            headers=_auth(admin_token),
+            data={"account_id": str(account_id)},
+            files={"file": ("ekstre.csv", text.encode(), "text/csv")},
+        )
+        assert resp.status_code == 200
+        return resp.json()
+
+    assert upload(STATEMENT_CSV)["imported"] == 3
+    # The same lines again plus an identical transfer on the same day, which
+    # is a second payment rather than a repeat.
+    body = upload(STATEMENT_CSV + "03.10.2026;75,00;Havale;acme  cam;\n")
+    assert body["imported"] == 1
+    assert [line["line"] for line in body["duplicates"]] == [2, 3, 4]
+    assert Decimal(body["net_amount"]) == Decimal("75.00")
+    assert Decimal(body["balance"]) == Decimal("-110.50")
+
+    db = TestingSessionLocal()
+    try:
+        assert db.query(FinancialTransaction).filter_by(account_id=account_id).count() == 4
+    finally:
+        db.close()
@@ -0,0 +1,141 @@
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.stock import StockMovement
+from tests.conftest import TestingSessionLocal
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _warehouse(client, token, name, code):
+    resp = client.post("/warehouses", headers=_auth(token), json={"name": name, "code": code})
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _move(product_id, warehouse_id, direction, quantity):
+    return {
+        "product_id": str(product_id),
+        "warehouse_id": warehouse_id,
+        "direction": direction,
+        "quantity": quantity,
+    }
+
+
+def _movement_count():
+    db = TestingSessionLocal()
+    try:
+        return db.query(StockMovement).count()
+    finally:
+        db.close()
+
+
+def test_batch_posts_movements_and_balances(client, admin_token, seed_catalog):
+    product_id = seed_catalog["product"].id
+    main = _warehouse(client, admin_token, "Ana Depo", "MAIN")
+    side = _warehouse(client, admin_token, "Şube", "SUBE")
+
+    listed = client.get("/warehouses", headers=_auth(admin_token)).json()
+    assert [w["code"] for w in listed["items"]] == ["MAIN", "SUBE"]
+
+    batch = [_move(product_id, main, "IN", 1) for _ in range(300)]
+    batch += [_move(product_id, main, "OUT", 40), _move(product_id, side, "IN", 7)]
+    resp = client.post(
+        "/stock-movements", headers=_auth(admin_token), json={"movements": batch}
+    )
+    assert resp.status_code == 201
+    body = resp.json()
+    assert body["recorded"] == 302
+    assert {b["warehouse_id"]: Decimal(b["quantity"]) for b in body["balances"]} == {
+        main: Decimal("260"),
+        side: Decimal("7"),
+    }
+    assert _movement_count() == 302
+
+    # A single movement may be posted without the batch wrapper.
+    resp = client.post(
+        "/stock-movements", headers=_auth(admin_token), json=_move(product_id, side, "OUT", 2)
+    )
+    assert resp.status_code == 201
+
+    stock = client.get(f"/stock/product/{product_id}", headers=_auth(admin_token)).json()
+    assert Decimal(stock["total"]) == Decimal("265")
+    assert len(stock["warehouses"]) == 2
+
+
+def test_batch_rejected_when_any_pair_goes_negative(client, admin_token, seed_catalog):
+    product_id = seed_catalog["product"].id
+    main = _warehouse(client, admin_token, "Ana Depo", "MAIN")
+    client.post("/stock-movements", headers=_auth(admin_token), json=_move(product_id, main, "IN", 5))
+
+    resp = client.post(
+        "/stock-movements",
+        headers=_auth(admin_token),
+        json={
+            "movements": [
+                _move(product_id, main, "OUT", 4),
+                _move(product_id, main, "OUT", 3),
+            ]
+        },
+    )
+    assert resp.status_code == 409
+    detail = resp.json()["detail"]
+    assert detail["code"] == "insufficient_stock"
+    assert [Decimal(s["quantity"]) for s in detail["shortages"]] == [Decimal("-2")]
+    assert _movement_count() == 1
+
+    stock = client.get(f"/stock/product/{product_id}", headers=_auth(admin_token)).json()
+    assert Decimal(stock["total"]) == Decimal("5")
+
+    resp = client.post(
+        "/stock-movements",
+        headers=_auth(admin_token),
+        json=_move(product_id, str(uuid4()), "IN", 1),
+    )
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == "warehouse_not_found"
+
+
+def test_batch_rejected_when_it_draws_on_reserved_stock(client, admin_token, seed_catalog):
+    product_id = seed_catalog["product"].id
+    main = _warehouse(client, admin_token, "Ana Depo", "MAIN")
+    client.post("/stock-movements", headers=_auth(admin_token), json=_move(product_id, main, "IN", 10))
+    # A confirmed 2000 x 2000 x 1 order reserves 4 m².
+    order = client.post(
+        "/orders",
+        headers=_auth(admin_token),
+        json={
+            "partner_id": str(seed_catalog["partner"].id),
+            "items": [
+                {
+                    "product_id": str(product_id),
+                    "quantity": 1,
+                    "unit_price": 100,
+                    "width": 2000,
+                    "height": 2000,
+                }
+            ],
+        },
+    ).json()
+    resp = client.post(
+        f"/orders/{order['id']}/status", headers=_auth(admin_token), json={"status": "SIPARIS"}
+    )
+    assert resp.status_code == 200
+
+    resp = client.post(
+        "/stock-movements", headers=_auth(admin_token), json=_move(product_id, main, "OUT", 7)
+    )
+    assert resp.status_code == 409
+    detail = resp.json()["detail"]
+    assert detail["code"] == "stock_reserved"
+    assert [
+        (Decimal(s["quantity"]), Decimal(s["reserved_quantity"])) for s in detail["shortages"]
+    ] == [(Decimal("3"), Decimal("4"))]
+    assert _movement_count() == 1
+
+    resp = client.post(
+        "/stock-movements", headers=_auth(admin_token), json=_move(product_id, main, "OUT", 6)
+    )
+    assert resp.status_code == 201
@@ -53,7 +53,7 @@ engine = create_engine(
 
 @event.listens_for(engine, "connect")
 def connect(dbapi_connection, connection_record):
-    dbapi_connection.create_function("gen_random_uuid", 0, lambda: str(uuid.uuid4()))
+    dbapi_connection.create_function("gen_random_uuid", 0, lambda: uuid.uuid4().hex)
 TestingSessionLocal = sessionmaker(
     autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
 )
@@ -66,7 +66,7 @@ for table in Base.metadata.tables.values():
     for col in table.columns:
         default = getattr(col.server_default, "arg", None)
         if default is not None and "gen_random_uuid" in str(default):
-            col.server_default = sa.text("(gen_random_uuid())")
+            col.server_default = sa.DefaultClause(sa.text("(gen_random_uuid())"))
 
 
 def override_get_db():
@@ -170,3 +170,29 @@ def admin_token(seed_users):
 @pytest.fixture
 def user_token(seed_users):
     return create_access_token(str(seed_users["alice"].id))
+
+
+@pytest.fixture
+def seed_catalog(seed_users):
+    from app.models.category import Category
+    from app.models.partner import Partner
+    from app.models.product import Product
+
+    db = TestingSessionLocal()
+    org = db.query(Organization).filter(Organization.slug == "default").one()
+    category = Category(id=uuid4(), organization_id=org.id, name="Float", code="FLT")
+    db.add(category)
+    db.flush()
+    partner = Partner(id=uuid4(), organization_id=org.id, type="CUSTOMER", name="Acme Cam")
+    product = Product(
+        id=uuid4(),
+        organization_id=org.id,
+        name="Float 4mm",
+        sku="FLT-4",
+        category_id=category.id,
+        base_price_sqm=100,
+    )
+    db.add_all([partner, product])
+    db.commit()
+    db.close()
+    return {"org": org, "partner": partner, "product": product}
@@ -0,0 +1,114 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.finance import Account, AccountBalanceSnapshot
+from app.schemas.finance import FinancialTransactionCreate
+from app.services.account_balance_service import (
+    balances_as_of,
+    find_snapshot_drift,
+    rebuild_snapshots,
+    take_snapshots,
+)
+from app.services.finance_service import record_transaction
+from tests.conftest import TestingSessionLocal
+
+
+def _post(db, seed_catalog, account_id, day, direction, amount):
+    record_transaction(
+        db,
+        seed_catalog["org"].id,
+        FinancialTransactionCreate(
+            account_id=account_id,
+            partner_id=seed_catalog["partner"].id,
+            direction=direction,
+            amount=Decimal(amount),
+            transaction_date=datetime.combine(day, datetime.min.time(), timezone.utc)
+            + timedelta(hours=15),
+            method="EFT",
+        ),
+    )
+
+
+def _seed(db, seed_catalog):
+    account = Account(id=uuid4(), organization_id=seed_catalog["org"].id, name="Banka", type="BANK")
+    db.add(account)
+    db.commit()
+    day = date(2026, 1, 5)
+    expected = {}
+    balance = Decimal("0")
+    for i in range(40):
+        direction = "OUT" if i % 4 == 3 else "IN"
+        amount = Decimal(10 + i)
+        _post(db, seed_catalog, account.id, day, direction, amount)
+        balance += amount if direction == "IN" else -amount
+        expected[day] = balance
+        day += timedelta(days=3)
+    return account.id, expected
+
+
+def _brute_force(expected, day):
+    return max(
+        ((d, b) for d, b in expected.items() if d <= day), default=(None, Decimal("0"))
+    )[1]
+
+
+def test_as_of_matches_transaction_history(seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        account_id, expected = _seed(db, seed_catalog)
+        assert take_snapshots(db, through=date(2026, 3, 15)) == 2
+        assert take_snapshots(db, through=date(2026, 4, 30)) == 2
+        snapshots = db.query(AccountBalanceSnapshot).order_by("snapshot_date").all()
+        assert [s.snapshot_date for s in snapshots] == [
+            date(2026, 1, 31),
+            date(2026, 2, 28),
+            date(2026, 3, 31),
+            date(2026, 4, 30),
+        ]
+
+        org_id = seed_catalog["org"].id
+        for day in (date(2025, 12, 31), date(2026, 1, 31), date(2026, 3, 17), date(2026, 6, 1)):
+            assert balances_as_of(db, org_id, day)[account_id] == _brute_force(expected, day)
+        assert find_snapshot_drift(db) == []
+    finally:
+        db.close()
+
+
+def test_backdated_posting_shifts_later_snapshots(seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        account_id, expected = _seed(db, seed_catalog)
+        take_snapshots(db, through=date(2026, 3, 31))
+
+        _post(db, seed_catalog, account_id, date(2026, 2, 10), "IN", "1000")
+        org_id = seed_catalog["org"].id
+        assert balances_as_of(db, org_id, date(2026, 1, 31))[account_id] == _brute_force(
+            expected, date(2026, 1, 31)
+        )
+        assert balances_as_of(db, org_id, date(2026, 3, 31))[account_id] == _brute_force(
+            expected, date(2026, 3, 31)
+        ) + Decimal("1000")
+        assert find_snapshot_drift(db) == []
+    finally:
+        db.close()
+
+
+def test_drift_is_found_and_rebuilt(seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        account_id, expected = _seed(db, seed_catalog)
+        take_snapshots(db, through=date(2026, 3, 31))
+        db.get(AccountBalanceSnapshot, (account_id, date(2026, 2, 28))).balance = 1
+        db.commit()
+
+        drift = find_snapshot_drift(db, seed_catalog["org"].id)
+        assert [(d["snapshot_date"], d["stored"]) for d in drift] == [
+            (date(2026, 2, 28), Decimal("1.00"))
+        ]
+        assert drift[0]["expected"] == _brute_force(expected, date(2026, 2, 28))
+
+        assert rebuild_snapshots(db, seed_catalog["org"].id, date(2026, 3, 31)) == 3
+        assert find_snapshot_drift(db) == []
+    finally:
+        db.close()
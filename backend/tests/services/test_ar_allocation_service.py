@@ -0,0 +1,140 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.ar import ArAllocation, ArAllocationPending, ArEntry
+from app.models.invoice import SalesInvoice
+from app.models.partner import Partner
+from app.services import ar_allocation_service
+from app.services.ar_allocation_service import (
+    allocate_partners,
+    mark_partners_pending,
+    run_allocation,
+)
+from tests.conftest import TestingSessionLocal
+
+
+def _invoice(db, org_id, partner_id, number, amount, day, status="ISSUED", **kwargs):
+    invoice = SalesInvoice(
+        id=uuid4(),
+        organization_id=org_id,
+        number=number,
+        partner_id=partner_id,
+        status=status,
+        issue_date=day,
+    )
+    db.add(invoice)
+    db.flush()
+    db.add(
+        ArEntry(
+            organization_id=org_id,
+            partner_id=partner_id,
+            invoice_id=invoice.id,
+            type="INVOICE",
+            amount=Decimal(amount),
+            entry_date=day,
+            **kwargs,
+        )
+    )
+    return invoice.id
+
+
+def _payment(db, org_id, partner_id, amount, day, **kwargs):
+    entry = ArEntry(
+        id=uuid4(),
+        organization_id=org_id,
+        partner_id=partner_id,
+        type="PAYMENT",
+        amount=Decimal(amount),
+        entry_date=day,
+        **kwargs,
+    )
+    db.add(entry)
+    return entry.id
+
+
+def _allocations(db):
+    return sorted(
+        (a.entry_id, a.invoice_id, a.amount) for a in db.query(ArAllocation).all()
+    )
+
+
+def test_payments_settle_oldest_invoices_first(seed_catalog):
+    org_id, partner_id = seed_catalog["org"].id, seed_catalog["partner"].id
+    db = TestingSessionLocal()
+    try:
+        a = _invoice(db, org_id, partner_id, "F-1", "100", date(2026, 3, 1))
+        b = _invoice(db, org_id, partner_id, "F-2", "200", date(2026, 3, 5))
+        _invoice(db, org_id, partner_id, "F-0", "75", date(2026, 2, 1), status="CANCELLED")
+        p1 = _payment(db, org_id, partner_id, "150", date(2026, 3, 10))
+        p2 = _payment(db, org_id, partner_id, "100", date(2026, 3, 20))
+        db.commit()
+
+        result = run_allocation(db, org_id)
+        assert result == {"partners": 1, "allocations": 3, "amount": Decimal("250.00")}
+        assert _allocations(db) == sorted(
+            [
+                (p1, a, Decimal("100.00")),
+                (p1, b, Decimal("50.00")),
+                (p2, b, Decimal("100.00")),
+            ]
+        )
+
+        # Re-running finds nothing left to allocate.
+        assert run_allocation(db, org_id, full=True)["allocations"] == 0
+
+        p3 = _payment(db, org_id, partner_id, "80", date(2026, 4, 1))
+        db.commit()
+        assert run_allocation(db, org_id)["allocations"] == 1
+        c = _invoice(db, org_id, partner_id, "F-3", "40", date(2026, 4, 2))
+        db.commit()
+        run_allocation(db, org_id)
+        allocated = [x for x in _allocations(db) if x[0] == p3]
+        assert sorted(allocated) == sorted([(p3, b, Decimal("50.00")), (p3, c, Decimal("30.00"))])
+    finally:
+        db.close()
+
+
+def test_incremental_run_revisits_only_partners_with_new_entries(seed_catalog):
+    org_id, partner_id = seed_catalog["org"].id, seed_catalog["partner"].id
+    db = TestingSessionLocal()
+    try:
+        other = Partner(id=uuid4(), organization_id=org_id, type="CUSTOMER", name="Eski Cam")
+        db.add(other)
+        long_ago = datetime(2020, 2, 1, tzinfo=timezone.utc)
+        _invoice(db, org_id, other.id, "F-9", "100", date(2020, 1, 1), created_at_utc=long_ago)
+        db.commit()
+        assert run_allocation(db, org_id)["partners"] == 1
+        assert run_allocation(db, org_id)["partners"] == 0
+
+        # A payment stamped before the last run (its transaction committed
+        # late) is still picked up, because writing it marked the partner.
+        _payment(db, org_id, other.id, "100", date(2020, 2, 1), created_at_utc=long_ago)
+        _invoice(db, org_id, partner_id, "F-10", "10", date(2026, 3, 1))
+        db.commit()
+        result = run_allocation(db, org_id)
+        assert (result["partners"], result["allocations"]) == (2, 1)
+        assert run_allocation(db, org_id, full=True)["allocations"] == 0
+    finally:
+        db.close()
+
+
+def test_marks_written_during_a_run_survive_it(seed_catalog, monkeypatch):
+    org_id, partner_id = seed_catalog["org"].id, seed_catalog["partner"].id
+    db = TestingSessionLocal()
+    try:
+        _invoice(db, org_id, partner_id, "F-1", "100", date(2026, 3, 1))
+        db.commit()
+
+        def allocate_then_write(db, org_id, partner_ids):
+            result = allocate_partners(db, org_id, partner_ids)
+            # Another transaction adds an entry after the run read the marks.
+            mark_partners_pending(db, org_id, [partner_id])
+            return result
+
+        monkeypatch.setattr(ar_allocation_service, "allocate_partners", allocate_then_write)
+        assert run_allocation(db, org_id)["partners"] == 1
+        mark = db.get(ArAllocationPending, (org_id, partner_id))
+        assert mark is not None and mark.version == 2
+    finally:
+        db.close()
@@ -0,0 +1,88 @@
+from datetime import date
+from decimal import Decimal
+
+from app.models.ar import ArEntry
+from app.models.partner import Partner
+from app.services.ar_service import ar_summary_cache, get_ar_summary
+from tests.conftest import TestingSessionLocal
+
+TODAY = date(2024, 6, 30)
+
+
+def _entry(seed_catalog, type_, amount, entry_date, partner_id=None):
+    return ArEntry(
+        organization_id=seed_catalog["org"].id,
+        partner_id=partner_id or seed_catalog["partner"].id,
+        type=type_,
+        amount=Decimal(amount),
+        entry_date=entry_date,
+    )
+
+
+def test_aging_settles_oldest_debits_first(seed_catalog):
+    ar_summary_cache.clear()
+    db = TestingSessionLocal()
+    try:
+        db.add_all(
+            [
+                _entry(seed_catalog, "INVOICE", "100", date(2024, 6, 20)),
+                _entry(seed_catalog, "INVOICE", "200", date(2024, 5, 15)),
+                _entry(seed_catalog, "INVOICE", "300", date(2024, 3, 1)),
+                _entry(seed_catalog, "PAYMENT", "350", date(2024, 6, 25)),
+            ]
+        )
+        db.commit()
+
+        summary = get_ar_summary(db, seed_catalog["org"].id, TODAY)
+        assert summary["open_total"] == Decimal("250.00")
+        assert summary["aging"] == {
+            "0_30": Decimal("100.00"),
+            "31_60": Decimal("150.00"),
+            "61_90": Decimal("0.00"),
+            "90_plus": Decimal("0.00"),
+        }
+    finally:
+        db.close()
+
+
+def test_partner_credit_is_kept_out_of_open_total(seed_catalog):
+    ar_summary_cache.clear()
+    db = TestingSessionLocal()
+    try:
+        overpaid = Partner(organization_id=seed_catalog["org"].id, type="CUSTOMER", name="Peşin")
+        db.add(overpaid)
+        db.flush()
+        db.add_all(
+            [
+                _entry(seed_catalog, "INVOICE", "120", date(2024, 6, 10)),
+                _entry(seed_catalog, "INVOICE", "50", date(2024, 6, 1), overpaid.id),
+                _entry(seed_catalog, "PAYMENT", "90", date(2024, 6, 5), overpaid.id),
+            ]
+        )
+        db.commit()
+
+        summary = get_ar_summary(db, seed_catalog["org"].id, TODAY)
+        assert summary["open_total"] == sum(summary["aging"].values()) == Decimal("120.00")
+        assert summary["credit_total"] == Decimal("40.00")
+    finally:
+        db.close()
+
+
+def test_ar_write_invalidates_cached_summary(seed_catalog):
+    ar_summary_cache.clear()
+    org_id = seed_catalog["org"].id
+    db = TestingSessionLocal()
+    try:
+        db.add(_entry(seed_catalog, "INVOICE", "80", date(2024, 1, 10)))
+        db.commit()
+        assert get_ar_summary(db, org_id, TODAY)["aging"]["90_plus"] == Decimal("80.00")
+        assert ar_summary_cache.get(org_id) is not None
+
+        db.add(_entry(seed_catalog, "PAYMENT", "30", date(2024, 6, 1)))
+        db.commit()
+        assert ar_summary_cache.get(org_id) is None
+        summary = get_ar_summary(db, org_id, TODAY)
+        assert summary["open_total"] == Decimal("50.00")
+        assert summary["aging"]["90_plus"] == Decimal("50.00")
+    finally:
+        db.close()
@@ -0,0 +1,72 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from app.core.cache import TTLCache, apply_remote_change, notify_on_commit, subscribe
+from tests.conftest import TestingSessionLocal
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache(60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"value": 1}
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(lambda _: cache.get_or_set("org", loader), range(10)))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_invalidation_during_load_is_not_cached():
+    cache = TTLCache(60)
+    started = threading.Event()
+    release = threading.Event()
+
+    def loader():
+        started.set()
+        release.wait()
+        return "stale"
+
+    thread = threading.Thread(target=cache.get_or_set, args=("org", loader))
+    thread.start()
+    started.wait()
+    cache.invalidate("org")
+    release.set()
+    thread.join()
+    assert cache.get("org") is None
+
+
+def test_changes_dispatch_only_after_commit():
+    org_id, rolled_back = uuid4(), uuid4()
+    seen = []
+    subscribe("test-topic", seen.append)
+
+    db = TestingSessionLocal()
+    try:
+        notify_on_commit(db, "test-topic", rolled_back)
+        db.rollback()
+        assert seen == []
+
+        notify_on_commit(db, "test-topic", org_id)
+        assert seen == []
+        db.commit()
+        assert seen == [org_id]
+    finally:
+        db.close()
+
+
+def test_remote_changes_reach_local_subscribers():
+    org_id = uuid4()
+    seen = []
+    subscribe("remote-topic", seen.append)
+
+    apply_remote_change(json.dumps({"topic": "remote-topic", "org_id": str(org_id)}))
+    apply_remote_change(json.dumps({"topic": "remote-topic", "org_id": None}))
+    apply_remote_change(json.dumps({"topic": "other-topic", "org_id": str(org_id)}))
+    assert seen == [org_id, None]
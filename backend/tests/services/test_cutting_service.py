@@ -0,0 +1,66 @@
+import random
+from uuid import uuid4
+
+from app.services.cutting_service import Piece, build_cutting_plan, pack_pieces
+
+
+def _pieces(count, product_id=None, seed=1):
+    rng = random.Random(seed)
+    product_id = product_id or uuid4()
+    return [
+        Piece(
+            job_id=uuid4(),
+            order_item_id=uuid4(),
+            product_id=product_id,
+            width=float(rng.randrange(200, 2000, 10)),
+            height=float(rng.randrange(200, 1500, 10)),
+        )
+        for _ in range(count)
+    ]
+
+
+def _overlap(a, b, kerf):
+    return not (
+        a.x + a.width + kerf <= b.x
+        or b.x + b.width + kerf <= a.x
+        or a.y + a.height + kerf <= b.y
+        or b.y + b.height + kerf <= a.y
+    )
+
+
+def test_pack_respects_trim_kerf_and_bounds():
+    kerf, trim = 4.0, 20.0
+    sheets, unplaced = pack_pieces(_pieces(300), 6000, 3210, kerf=kerf, edge_trim=trim)
+    assert not unplaced
+    assert sum(len(s.placements) for s in sheets) == 300
+    for sheet in sheets:
+        for p in sheet.placements:
+            assert p.x >= trim and p.y >= trim
+            assert p.x + p.width <= 6000 - trim
+            assert p.y + p.height <= 3210 - trim
+        for i, a in enumerate(sheet.placements):
+            for b in sheet.placements[i + 1 :]:
+                assert not _overlap(a, b, kerf)
+
+
+def test_rotation_and_oversized_pieces():
+    product_id = uuid4()
+    tall = Piece(uuid4(), uuid4(), product_id, 3000.0, 5000.0)
+    huge = Piece(uuid4(), uuid4(), product_id, 7000.0, 4000.0)
+    sheets, unplaced = pack_pieces([tall, huge], 6000, 3210)
+    assert unplaced == [huge]
+    assert sheets[0].placements[0].rotated
+
+    sheets, unplaced = pack_pieces([tall], 6000, 3210, allow_rotation=False)
+    assert unplaced == [tall]
+
+
+def test_plan_groups_by_product_and_reports_yield():
+    pieces = _pieces(50, seed=2) + _pieces(50, seed=3)
+    plan = build_cutting_plan(pieces, sheet_width=6000, sheet_height=3210, kerf=0, edge_trim=0)
+    assert {s.product_id for s in plan.sheets} == {p.product_id for p in pieces}
+    for sheet in plan.sheets:
+        assert {p.piece.product_id for p in sheet.placements} == {sheet.product_id}
+    used = sum(p.width * p.height for p in pieces)
+    assert plan.yield_pct == round(100 * used / (6000 * 3210 * len(plan.sheets)), 2)
+    assert 0 < plan.yield_pct <= 100
@@ -0,0 +1,84 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.finance import Account, FinancialTransaction
+from app.models.organization import Organization
+from app.schemas.finance import FinancialTransactionCreate
+from app.services.finance_service import FinanceServiceError, record_transaction
+
+
+@pytest.fixture
+def file_session(tmp_path):
+    # A file database so each thread gets its own connection and postings
+    # genuinely race; the shared in-memory test engine would serialize them.
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'finance.db'}", connect_args={"timeout": 30}
+    )
+
+    @event.listens_for(engine, "connect")
+    def connect(dbapi_connection, connection_record):
+        dbapi_connection.create_function("gen_random_uuid", 0, lambda: uuid.uuid4().hex)
+
+    Base.metadata.create_all(engine)
+    yield sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+    engine.dispose()
+
+
+def _posting(account_id, direction, amount):
+    return FinancialTransactionCreate(
+        account_id=account_id,
+        partner_id=uuid.uuid4(),
+        direction=direction,
+        amount=Decimal(amount),
+        transaction_date=datetime.now(timezone.utc),
+        method="EFT",
+    )
+
+
+def test_parallel_postings_keep_exact_balance(file_session):
+    with file_session() as db:
+        org = Organization(id=uuid.uuid4(), name="Org", slug="org")
+        account = Account(id=uuid.uuid4(), organization_id=org.id, name="Banka", type="BANK")
+        db.add_all([org, account])
+        db.commit()
+        org_id, account_id = org.id, account.id
+
+    postings = [
+        _posting(account_id, "IN" if i % 3 else "OUT", f"{i % 7 + 1}.25") for i in range(200)
+    ]
+    expected = sum(
+        (p.amount if p.direction == "IN" else -p.amount for p in postings), Decimal("0")
+    )
+
+    def post(data):
+        with file_session() as db:
+            record_transaction(db, org_id, data)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(post, postings))
+
+    with file_session() as db:
+        assert db.get(Account, account_id).current_balance == expected
+        assert db.query(FinancialTransaction).count() == 200
+
+
+def test_posting_to_another_orgs_account_is_rejected(file_session):
+    with file_session() as db:
+        org = Organization(id=uuid.uuid4(), name="Org", slug="org")
+        account = Account(id=uuid.uuid4(), organization_id=org.id, name="Kasa", type="CASH")
+        db.add_all([org, account])
+        db.commit()
+        account_id = account.id
+
+    with file_session() as db:
+        with pytest.raises(FinanceServiceError):
+            record_transaction(db, uuid.uuid4(), _posting(account_id, "IN", "10"))
+        assert db.get(Account, account_id).current_balance == 0
+        assert db.query(FinancialTransaction).count() == 0
@@ -0,0 +1,190 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.models.ar import ArEntry
+from app.models.invoice import InvoiceRun, SalesInvoice, SalesInvoiceItem
+from app.models.order import Order, OrderItem
+from app.models.partner import Partner
+from app.services import invoice_service
+from app.services.invoice_service import InvoiceServiceError, generate_invoices
+from tests.conftest import TestingSessionLocal
+
+SEPTEMBER = (date(2026, 9, 1), date(2026, 9, 30))
+
+
+def _order(db, seed_catalog, partner_id, number, day, status="SIPARIS", total="120"):
+    order = Order(
+        id=uuid4(),
+        organization_id=seed_catalog["org"].id,
+        number=number,
+        partner_id=partner_id,
+        status=status,
+        subtotal=Decimal(total) / Decimal("1.2"),
+        tax_total=Decimal(total) - Decimal(total) / Decimal("1.2"),
+        grand_total=Decimal(total),
+        created_at_utc=datetime(day.year, day.month, day.day, 12, tzinfo=timezone.utc),
+    )
+    db.add(order)
+    db.flush()
+    for width in (1000, 500):
+        db.add(
+            OrderItem(
+                order_id=order.id,
+                product_id=seed_catalog["product"].id,
+                quantity=1,
+                unit_price=60,
+                width=width,
+                height=1000,
+                line_total=60,
+            )
+        )
+    return order.id
+
+
+def _seed(db, seed_catalog):
+    other = Partner(
+        id=uuid4(), organization_id=seed_catalog["org"].id, type="CUSTOMER", name="Beta Cam"
+    )
+    db.add(other)
+    partner_id = seed_catalog["partner"].id
+    expected = [
+        _order(db, seed_catalog, partner_id, "2026-001", date(2026, 9, 1)),
+        _order(db, seed_catalog, partner_id, "2026-002", date(2026, 9, 30)),
+        _order(db, seed_catalog, other.id, "2026-003", date(2026, 9, 15), total="240"),
+    ]
+    _order(db, seed_catalog, partner_id, "2026-004", date(2026, 9, 10), status="TEKLIF")
+    _order(db, seed_catalog, partner_id, "2026-005", date(2026, 10, 1))
+    db.commit()
+    return expected
+
+
+def test_month_end_run_invoices_confirmed_orders_once(seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        expected = _seed(db, seed_catalog)
+        run = generate_invoices(db, seed_catalog["org"].id, *SEPTEMBER, workers=1)
+        assert (run.status, run.total_partners, run.done_partners, run.invoices_created) == (
+            "DONE",
+            2,
+            2,
+            3,
+        )
+
+        invoices = db.query(SalesInvoice).order_by(SalesInvoice.number).all()
+        assert sorted(i.order_id for i in invoices) == sorted(expected)
+        assert [i.number for i in invoices] == [
+            "FTR2026000000001",
+            "FTR2026000000002",
+            "FTR2026000000003",
+        ]
+        assert {i.issue_date for i in invoices} == {date(2026, 9, 30)}
+        assert {i.status for i in invoices} == {"ISSUED"}
+        assert db.query(SalesInvoiceItem).count() == 6
+        entries = db.query(ArEntry).all()
+        assert sorted(e.amount for e in entries) == [Decimal("120"), Decimal("120"), Decimal("240")]
+
+        run = generate_invoices(db, seed_catalog["org"].id, *SEPTEMBER, workers=1)
+        assert run.invoices_created == 3
+        assert db.query(SalesInvoice).count() == 3
+    finally:
+        db.close()
+
+
+def test_failed_run_resumes_where_it_stopped(seed_catalog, monkeypatch):
+    db = TestingSessionLocal()
+    try:
+        _seed(db, seed_catalog)
+        real = invoice_service.invoice_partner
+        calls = []
+
+        def crash_on_second(db, run, partner_id):
+            calls.append(partner_id)
+            if len(calls) == 2:
+                raise RuntimeError("worker died")
+            return real(db, run, partner_id)
+
+        monkeypatch.setattr(invoice_service, "invoice_partner", crash_on_second)
+        with pytest.raises(RuntimeError):
+            generate_invoices(db, seed_catalog["org"].id, *SEPTEMBER, workers=1)
+        run = db.query(InvoiceRun).one()
+        db.refresh(run)
+        assert (run.status, run.done_partners, run.total_partners) == ("FAILED", 1, 2)
+        assert "worker died" in run.error
+
+        monkeypatch.setattr(invoice_service, "invoice_partner", real)
+        run = generate_invoices(db, seed_catalog["org"].id, *SEPTEMBER, workers=1)
+        assert (run.status, run.done_partners, run.total_partners, run.invoices_created) == (
+            "DONE",
+            2,
+            2,
+            3,
+        )
+        assert db.query(SalesInvoice).count() == 3
+    finally:
+        db.close()
+
+
+def test_failed_partner_leaves_no_gap_in_numbers(seed_catalog, monkeypatch):
+    db = TestingSessionLocal()
+    try:
+        _seed(db, seed_catalog)
+        real = invoice_service.mark_partners_pending
+
+        def crash(*args):
+            raise RuntimeError("worker died")
+
+        monkeypatch.setattr(invoice_service, "mark_partners_pending", crash)
+        with pytest.raises(RuntimeError):
+            generate_invoices(db, seed_catalog["org"].id, *SEPTEMBER, workers=1)
+        assert db.query(SalesInvoice).count() == 0
+
+        monkeypatch.setattr(invoice_service, "mark_partners_pending", real)
+        generate_invoices(db, seed_catalog["org"].id, *SEPTEMBER, workers=1)
+        numbers = [i.number for i in db.query(SalesInvoice).order_by(SalesInvoice.number)]
+        assert numbers == ["FTR2026000000001", "FTR2026000000002", "FTR2026000000003"]
+    finally:
+        db.close()
+
+
+def test_rerun_counts_each_partner_once(seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        _seed(db, seed_catalog)
+        generate_invoices(db, seed_catalog["org"].id, *SEPTEMBER, workers=1)
+        # A late order for an already invoiced partner.
+        _order(db, seed_catalog, seed_catalog["partner"].id, "2026-006", date(2026, 9, 20))
+        db.commit()
+
+        run = generate_invoices(db, seed_catalog["org"].id, *SEPTEMBER, workers=1)
+        assert (run.total_partners, run.done_partners, run.invoices_created) == (2, 2, 4)
+    finally:
+        db.close()
+
+
+def test_second_run_for_a_running_period_is_refused(seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        _seed(db, seed_catalog)
+        db.add(
+            InvoiceRun(
+                id=uuid4(),
+                organization_id=seed_catalog["org"].id,
+                period_start=SEPTEMBER[0],
+                period_end=SEPTEMBER[1],
+                issue_date=SEPTEMBER[1],
+                status="RUNNING",
+            )
+        )
+        db.commit()
+        with pytest.raises(InvoiceServiceError, match="run_in_progress"):
+            generate_invoices(db, seed_catalog["org"].id, *SEPTEMBER, workers=1)
+        assert db.query(SalesInvoice).count() == 0
+
+        run = generate_invoices(db, seed_catalog["org"].id, *SEPTEMBER, workers=1, force=True)
+        assert (run.status, run.invoices_created) == ("DONE", 3)
+        assert db.query(InvoiceRun).count() == 1
+    finally:
+        db.close()
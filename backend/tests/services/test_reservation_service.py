@@ -0,0 +1,220 @@
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, update
+
+from app.core.config import settings
+from app.models.order import Order, OrderItem
+from app.models.stock import StockBalance, StockReservation
+from app.models.warehouse import Warehouse
+from app.services import reservation_service
+from app.schemas.order import OrderUpdate
+from app.services.order_service import bulk_update_order_status, delete_order, update_order
+from app.services.reservation_service import available_to_promise, reserve_for_orders
+from app.services.stock_service import StockServiceError, post_movements
+from tests.conftest import TestingSessionLocal
+
+
+def _seed(db, seed_catalog, stock):
+    org_id = seed_catalog["org"].id
+    product_id = seed_catalog["product"].id
+    warehouses = []
+    for i, quantity in enumerate(stock):
+        warehouse = Warehouse(id=uuid4(), organization_id=org_id, name=f"Depo {i}", code=f"D{i}")
+        db.add(warehouse)
+        db.commit()
+        post_movements(
+            db,
+            org_id,
+            [
+                {
+                    "product_id": product_id,
+                    "warehouse_id": warehouse.id,
+                    "direction": "IN",
+                    "quantity": Decimal(quantity),
+                }
+            ],
+        )
+        warehouses.append(warehouse.id)
+    return warehouses
+
+
+def _order(db, seed_catalog, number, *lines, delivery_date=None):
+    order = Order(
+        id=uuid4(),
+        organization_id=seed_catalog["org"].id,
+        number=number,
+        partner_id=seed_catalog["partner"].id,
+        status="TEKLIF",
+        delivery_date=delivery_date,
+        items=[
+            OrderItem(
+                product_id=seed_catalog["product"].id,
+                quantity=Decimal(quantity),
+                unit_price=Decimal("100"),
+                width=Decimal(width),
+                height=Decimal(height),
+            )
+            for width, height, quantity in lines
+        ],
+    )
+    db.add(order)
+    db.commit()
+    return order.id
+
+
+def _atp(db, seed_catalog):
+    return {
+        row.warehouse_id: (Decimal(row.reserved_quantity), Decimal(row.available))
+        for row in available_to_promise(db, seed_catalog["org"].id)
+    }
+
+
+def test_confirmation_reserves_and_cancellation_releases(seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        big, small = _seed(db, seed_catalog, ["10", "3"])
+        # 2 × 2000×1500 = 6 m², then 3 × 1000×2000 = 6 m²: the second order
+        # gets the 4 m² left in the big warehouse and 2 m² from the small one.
+        first = _order(db, seed_catalog, "2026-101", ("2000", "1500", "2"))
+        second = _order(db, seed_catalog, "2026-102", ("1000", "2000", "3"))
+        org_id = seed_catalog["org"].id
+
+        bulk_update_order_status(db, org_id, [first], "SIPARIS")
+        assert _atp(db, seed_catalog) == {
+            big: (Decimal("6"), Decimal("4")),
+            small: (Decimal("0"), Decimal("3")),
+        }
+        bulk_update_order_status(db, org_id, [second], "SIPARIS")
+        assert _atp(db, seed_catalog) == {
+            big: (Decimal("10"), Decimal("0")),
+            small: (Decimal("2"), Decimal("1")),
+        }
+
+        # A third order can only get what is left; it never oversells.
+        third = _order(db, seed_catalog, "2026-103", ("1000", "1000", "5"))
+        shortages = reserve_for_orders(db, org_id, [third])
+        db.commit()
+        assert [s["missing"] for s in shortages] == [Decimal("4")]
+        assert _atp(db, seed_catalog)[small] == (Decimal("3"), Decimal("0"))
+
+        bulk_update_order_status(db, org_id, [first], "IPTAL")
+        assert _atp(db, seed_catalog)[big] == (Decimal("4"), Decimal("6"))
+        delete_order(db, org_id, second)
+        assert _atp(db, seed_catalog) == {
+            big: (Decimal("0"), Decimal("10")),
+            small: (Decimal("1"), Decimal("2")),
+        }
+        assert db.query(StockReservation).count() == 1
+    finally:
+        db.close()
+
+
+def test_short_stock_goes_to_the_earliest_delivery(seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        _seed(db, seed_catalog, ["5"])
+        org_id = seed_catalog["org"].id
+        # Created first but due last, then due first, then undated: 4 m² each.
+        late = _order(
+            db, seed_catalog, "2026-301", ("2000", "2000", "1"), delivery_date=date(2026, 11, 20)
+        )
+        early = _order(
+            db, seed_catalog, "2026-302", ("2000", "2000", "1"), delivery_date=date(2026, 11, 5)
+        )
+        undated = _order(db, seed_catalog, "2026-303", ("2000", "2000", "1"))
+
+        _, _, shortages = bulk_update_order_status(
+            db, org_id, [undated, late, early], "SIPARIS"
+        )
+        lines = {row.id: row.order_id for row in db.query(OrderItem.id, OrderItem.order_id)}
+        assert sorted((lines[s["order_item_id"]] == late, s["missing"]) for s in shortages) == [
+            (False, Decimal("4")),
+            (True, Decimal("3")),
+        ]
+        held = dict(
+            db.query(StockReservation.order_id, func.sum(StockReservation.quantity))
+            .group_by(StockReservation.order_id)
+            .all()
+        )
+        assert {k: Decimal(v) for k, v in held.items()} == {
+            early: Decimal("4"),
+            late: Decimal("1"),
+        }
+    finally:
+        db.close()
+
+
+def test_editing_a_confirmed_order_moves_its_reservations(seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        (warehouse,) = _seed(db, seed_catalog, ["10"])
+        org_id = seed_catalog["org"].id
+        product_id = seed_catalog["product"].id
+        order_id = _order(
+            db, seed_catalog, "2026-401", ("1000", "1000", "4"), ("1000", "1000", "2")
+        )
+        bulk_update_order_status(db, org_id, [order_id], "SIPARIS")
+        assert _atp(db, seed_catalog)[warehouse] == (Decimal("6"), Decimal("4"))
+
+        db.expire_all()
+        kept = db.query(OrderItem).filter_by(order_id=order_id, quantity=Decimal("4")).one()
+        line = {"product_id": product_id, "unit_price": 100, "width": 1000, "height": 1000}
+        # Grow one line to 5 m², drop the 2 m² line and add a 3 m² one.
+        update_order(
+            db,
+            org_id,
+            order_id,
+            OrderUpdate(items=[{**line, "id": kept.id, "quantity": 5}, {**line, "quantity": 3}]),
+        )
+        assert _atp(db, seed_catalog)[warehouse] == (Decimal("8"), Decimal("2"))
+        held = db.query(func.sum(StockReservation.quantity)).scalar()
+        assert Decimal(held) == Decimal("8")
+
+        # Changing only the price leaves the reservations alone.
+        update_order(
+            db,
+            org_id,
+            order_id,
+            OrderUpdate(
+                items=[
+                    {**line, "id": item.id, "quantity": item.quantity, "unit_price": 90}
+                    for item in db.query(OrderItem).filter_by(order_id=order_id)
+                ]
+            ),
+        )
+        assert _atp(db, seed_catalog)[warehouse] == (Decimal("8"), Decimal("2"))
+    finally:
+        db.close()
+
+
+def test_stale_version_replans_then_gives_up(seed_catalog, monkeypatch):
+    db = TestingSessionLocal()
+    try:
+        (warehouse,) = _seed(db, seed_catalog, ["10"])
+        order_id = _order(db, seed_catalog, "2026-201", ("1000", "1000", "4"))
+        org_id = seed_catalog["org"].id
+        plan = reservation_service._plan
+        bumps = {"left": 2}
+
+        def racing_plan(lines, balances):
+            # Another writer moves the balance after every read.
+            if bumps["left"]:
+                bumps["left"] -= 1
+                db.execute(update(StockBalance).values(version=StockBalance.version + 1))
+            return plan(lines, balances)
+
+        monkeypatch.setattr(reservation_service, "_plan", racing_plan)
+        assert reserve_for_orders(db, org_id, [order_id]) == []
+        db.commit()
+        assert _atp(db, seed_catalog)[warehouse] == (Decimal("4"), Decimal("6"))
+
+        db.execute(StockReservation.__table__.delete())
+        bumps["left"] = settings.STOCK_RESERVATION_MAX_ATTEMPTS
+        with pytest.raises(StockServiceError, match="reservation_conflict"):
+            reserve_for_orders(db, org_id, [order_id])
+    finally:
+        db.rollback()
+        db.close()
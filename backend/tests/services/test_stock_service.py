@@ -0,0 +1,91 @@
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import update
+
+from app.models.stock import StockBalance
+from app.models.warehouse import Warehouse
+from app.services.stock_service import (
+    find_balance_drift,
+    get_low_stock,
+    post_movements,
+    rebuild_stock_balances,
+)
+from tests.conftest import TestingSessionLocal
+
+
+def _warehouse(db, org_id):
+    warehouse = Warehouse(id=uuid4(), organization_id=org_id, name="Ana Depo", code="WH1")
+    db.add(warehouse)
+    db.commit()
+    return warehouse
+
+
+def _move(product_id, warehouse_id, direction, quantity):
+    return {
+        "product_id": product_id,
+        "warehouse_id": warehouse_id,
+        "direction": direction,
+        "quantity": Decimal(quantity),
+    }
+
+
+def test_movements_maintain_balance_and_low_stock(client, admin_token, seed_catalog):
+    org_id = seed_catalog["org"].id
+    product_id = seed_catalog["product"].id
+    db = TestingSessionLocal()
+    try:
+        warehouse = _warehouse(db, org_id)
+        post_movements(
+            db,
+            org_id,
+            [
+                _move(product_id, warehouse.id, "IN", "10"),
+                _move(product_id, warehouse.id, "OUT", "7"),
+            ],
+        )
+        balance = db.get(StockBalance, (product_id, warehouse.id))
+        assert balance.quantity == Decimal("3")
+        assert get_low_stock(db, org_id) == []
+
+        response = client.put(
+            f"/products/{product_id}",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"restock_level": 5},
+        )
+        assert response.status_code == 204
+        low = get_low_stock(db, org_id)
+        assert [(row["sku"], row["quantity"], row["restock_level"]) for row in low] == [
+            ("FLT-4", Decimal("3"), Decimal("5"))
+        ]
+    finally:
+        db.close()
+
+
+def test_reconciliation_rebuilds_drifted_balance(seed_catalog):
+    org_id = seed_catalog["org"].id
+    product_id = seed_catalog["product"].id
+    db = TestingSessionLocal()
+    try:
+        warehouse = _warehouse(db, org_id)
+        post_movements(
+            db, org_id, [{**_move(product_id, warehouse.id, "IN", "4"), "unit_cost": Decimal("5")}]
+        )
+        version = db.get(StockBalance, (product_id, warehouse.id)).version
+        db.execute(update(StockBalance).values(quantity=Decimal("9")))
+        db.commit()
+
+        drift = find_balance_drift(db, org_id)
+        assert [(row["stored"], row["expected"]) for row in drift] == [
+            (Decimal("9"), Decimal("4"))
+        ]
+        assert rebuild_stock_balances(db, org_id) == 1
+        assert find_balance_drift(db, org_id) == []
+        # Corrected in place: valuation survives and the version only moves forward.
+        db.expire_all()
+        balance = db.get(StockBalance, (product_id, warehouse.id))
+        assert balance.quantity == Decimal("4")
+        assert balance.fifo_value == balance.average_value == Decimal("20")
+        assert balance.version > version
+    finally:
+        db.close()
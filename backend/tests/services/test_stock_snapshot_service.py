@@ -0,0 +1,136 @@
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.stock import StockMovement, StockSnapshot
+from app.models.warehouse import Warehouse
+from app.services.stock_snapshot_service import (
+    compact_stock_snapshots,
+    stock_as_of,
+    take_stock_snapshots,
+)
+from tests.conftest import TestingSessionLocal
+
+
+def _seed(db, seed_catalog):
+    org_id = seed_catalog["org"].id
+    product_id = seed_catalog["product"].id
+    warehouses = [
+        Warehouse(id=uuid4(), organization_id=org_id, name=name, code=code)
+        for name, code in (("Ana Depo", "MAIN"), ("Şube", "SUBE"))
+    ]
+    db.add_all(warehouses)
+    db.commit()
+    # Per day, the quantity on hand of each warehouse after that day's movements.
+    history: dict[date, dict] = {}
+    on_hand = {w.id: Decimal("0") for w in warehouses}
+    day = date(2026, 1, 3)
+    for i in range(60):
+        warehouse_id = warehouses[i % 2].id
+        direction = "OUT" if i % 3 == 2 and on_hand[warehouse_id] >= 5 else "IN"
+        quantity = Decimal(5 if direction == "OUT" else 2 + i % 4)
+        db.add(
+            StockMovement(
+                product_id=product_id,
+                warehouse_id=warehouse_id,
+                direction=direction,
+                quantity=quantity,
+                created_at_utc=datetime.combine(day, time(10, 30), tzinfo=timezone.utc),
+            )
+        )
+        on_hand[warehouse_id] += quantity if direction == "IN" else -quantity
+        history[day] = dict(on_hand)
+        day += timedelta(days=2)
+    db.commit()
+    return [w.id for w in warehouses], history
+
+
+def _expected(history, day):
+    last = max((d for d in history if d <= day), default=None)
+    return {w: q for w, q in history[last].items() if q} if last else {}
+
+
+def _as_of(db, seed_catalog, day):
+    rows = stock_as_of(db, seed_catalog["org"].id, day)
+    return {row["warehouse_id"]: row["quantity"] for row in rows}
+
+
+def test_as_of_matches_movement_history(seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        _, history = _seed(db, seed_catalog)
+        probe_days = [date(2026, 1, 1) + timedelta(days=n) for n in range(0, 130, 3)]
+        for day in probe_days[:5]:
+            assert _as_of(db, seed_catalog, day) == _expected(history, day)
+
+        written = take_stock_snapshots(db, through=date(2026, 3, 31))
+        assert written == len([d for d in history if d <= date(2026, 3, 31)])
+        # A second run has nothing new to read.
+        assert take_stock_snapshots(db, through=date(2026, 3, 31)) == 0
+        for day in probe_days:
+            assert _as_of(db, seed_catalog, day) == _expected(history, day), day
+
+        removed = compact_stock_snapshots(db, keep_daily_days=30, today=date(2026, 4, 15))
+        remaining = db.query(StockSnapshot).all()
+        assert removed > 0
+        # One snapshot per warehouse and month before the cutoff, daily after it.
+        old = [s for s in remaining if s.snapshot_date < date(2026, 3, 16)]
+        assert len(old) == len({(s.warehouse_id, s.snapshot_date.month) for s in old})
+        for day in probe_days:
+            assert _as_of(db, seed_catalog, day) == _expected(history, day), day
+
+        take_stock_snapshots(db, through=date(2026, 6, 30))
+        for day in probe_days:
+            assert _as_of(db, seed_catalog, day) == _expected(history, day), day
+    finally:
+        db.close()
+
+
+def test_snapshots_stop_before_unsettled_days(seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        warehouse = Warehouse(
+            id=uuid4(), organization_id=seed_catalog["org"].id, name="Ana Depo", code="MAIN"
+        )
+        db.add(warehouse)
+        db.commit()
+        now = datetime.now(timezone.utc)
+        for created in (now - timedelta(days=3), now):
+            db.add(
+                StockMovement(
+                    product_id=seed_catalog["product"].id,
+                    warehouse_id=warehouse.id,
+                    direction="IN",
+                    quantity=Decimal("4"),
+                    created_at_utc=created,
+                )
+            )
+        db.commit()
+
+        # Today may still have postings in flight, so asking for it snapshots
+        # only the settled days.
+        assert take_stock_snapshots(db, through=now.date()) == 1
+        snapshot = db.query(StockSnapshot).one()
+        assert snapshot.snapshot_date == (now - timedelta(days=3)).date()
+        assert _as_of(db, seed_catalog, now.date()) == {warehouse.id: Decimal("8")}
+    finally:
+        db.close()
+
+
+def test_as_of_endpoint_filters_by_warehouse(client, admin_token, seed_catalog):
+    db = TestingSessionLocal()
+    try:
+        warehouse_ids, history = _seed(db, seed_catalog)
+        take_stock_snapshots(db, through=date(2026, 2, 28))
+    finally:
+        db.close()
+
+    resp = client.get(
+        "/stock/as-of",
+        params={"as_of": "2026-03-10", "warehouse_id": str(warehouse_ids[1])},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert len(items) == 1
+    assert Decimal(items[0]["quantity"]) == _expected(history, date(2026, 3, 10))[warehouse_ids[1]]
@@ -0,0 +1,95 @@
+from decimal import Decimal
+from uuid import uuid4
+
+from app.models.stock import StockBalance, StockCostLayer
+from app.models.warehouse import Warehouse
+from app.services.stock_service import post_movements
+from app.services.valuation_service import recompute_valuation, valuation_report
+from tests.conftest import TestingSessionLocal
+
+
+def _move(product_id, warehouse_id, direction, quantity, unit_cost=None):
+    return {
+        "product_id": product_id,
+        "warehouse_id": warehouse_id,
+        "direction": direction,
+        "quantity": Decimal(quantity),
+        "unit_cost": Decimal(unit_cost) if unit_cost is not None else None,
+    }
+
+
+def _values(db, product_id, warehouse_id):
+    db.expire_all()
+    balance = db.get(StockBalance, (product_id, warehouse_id))
+    return Decimal(balance.fifo_value), Decimal(balance.average_value)
+
+
+def test_fifo_and_average_values_follow_movements(seed_catalog):
+    org_id = seed_catalog["org"].id
+    product_id = seed_catalog["product"].id
+    db = TestingSessionLocal()
+    try:
+        warehouse = Warehouse(id=uuid4(), organization_id=org_id, name="Ana Depo", code="MAIN")
+        db.add(warehouse)
+        db.commit()
+        wh = warehouse.id
+
+        post_movements(
+            db,
+            org_id,
+            [
+                _move(product_id, wh, "IN", "10", "5"),
+                _move(product_id, wh, "IN", "10", "8"),
+                _move(product_id, wh, "OUT", "15"),
+            ],
+        )
+        # FIFO keeps 5 of the 8.00 layer; average keeps 5/20 of 130.
+        assert _values(db, product_id, wh) == (Decimal("40"), Decimal("32.5"))
+
+        # Without a cost, a receipt comes in at the current average (6.50).
+        post_movements(db, org_id, [_move(product_id, wh, "IN", "4")])
+        assert _values(db, product_id, wh) == (Decimal("66"), Decimal("58.5"))
+        post_movements(db, org_id, [_move(product_id, wh, "OUT", "6")])
+        assert _values(db, product_id, wh) == (Decimal("19.5"), Decimal("19.5"))
+        open_layers = db.query(StockCostLayer).filter(StockCostLayer.remaining_quantity > 0).all()
+        assert [(layer.remaining_quantity, layer.unit_cost) for layer in open_layers] == [
+            (Decimal("3"), Decimal("6.5"))
+        ]
+
+        (line,) = valuation_report(db, org_id, "fifo")
+        assert line.warehouse_id == wh
+        assert line.category_id == seed_catalog["product"].category_id
+        assert (Decimal(line.quantity), Decimal(line.value)) == (Decimal("3"), Decimal("19.5"))
+
+        # The chunked replay lands on the same layers and values.
+        db.query(StockBalance).update({"fifo_value": 0, "average_value": 0})
+        db.commit()
+        assert recompute_valuation(db, org_id, chunk_size=2) == 5
+        assert _values(db, product_id, wh) == (Decimal("19.5"), Decimal("19.5"))
+        assert db.query(StockCostLayer).count() == 3
+    finally:
+        db.close()
+
+
+def test_valuation_endpoint(client, admin_token, seed_catalog):
+    product_id = str(seed_catalog["product"].id)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    wh = client.post("/warehouses", headers=headers, json={"name": "Ana Depo"}).json()["id"]
+    movement = {"product_id": product_id, "warehouse_id": wh, "direction": "IN"}
+    client.post(
+        "/stock-movements",
+        headers=headers,
+        json={
+            "movements": [
+                {**movement, "quantity": 2, "unit_cost": 10},
+                {**movement, "quantity": 2, "unit_cost": 20},
+                {**movement, "direction": "OUT", "quantity": 1},
+            ]
+        },
+    )
+
+    fifo = client.get("/stock/valuation", headers=headers).json()
+    assert Decimal(fifo["total"]) == Decimal("50")
+    average = client.get("/stock/valuation?method=average", headers=headers).json()
+    assert Decimal(average["total"]) == Decimal("45")
+    assert client.get("/stock/valuation?method=lifo", headers=headers).status_code == 422
@@ -0,0 +1,28 @@
+import { useEffect } from 'react'
+import { useQueryClient } from '@tanstack/react-query'
+
+// Query keys to refetch for each server event type.
+const invalidations: Record<string, string[][]> = {
+  dashboard: [['dashboardSummary']],
+  'order.status': [['orders']],
+  'finance.transaction': [['dashboardSummary']],
+}
+
+export const useLiveEvents = () => {
+  const queryClient = useQueryClient()
+
+  useEffect(() => {
+    const token = localStorage.getItem('token')
+    if (!token) return
+    const url = new URL(`${import.meta.env.VITE_API_BASE ?? ''}/events`, window.location.origin)
+    url.searchParams.set('token', token)
+    const source = new EventSource(url.toString())
+
+    Object.entries(invalidations).forEach(([type, keys]) => {
+      source.addEventListener(type, () => {
+        keys.forEach((queryKey) => queryClient.invalidateQueries({ queryKey }))
+      })
+    })
+    return () => source.close()
+  }, [queryClient])
+}
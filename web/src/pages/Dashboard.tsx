@@ -1,14 +1,19 @@
 import { useQuery } from '@tanstack/react-query'
 import api from '../lib/api'
+import { useLiveEvents } from '../lib/events'
 import { dashboardSummarySchema, DashboardSummary } from '../types/dashboard'
 
 const Dashboard = () => {
+  useLiveEvents()
   const { data, isLoading, error } = useQuery<DashboardSummary>({
     queryKey: ['dashboardSummary'],
     queryFn: async () => {
       const res = await api.get('/dashboard/summary')
       return dashboardSummarySchema.parse(res.data)
     },
+    // Server-sent events invalidate this query when the data changes.
+    staleTime: Infinity,
+    refetchOnWindowFocus: false,
   })
 
   if (isLoading) return <p>Loading...</p>